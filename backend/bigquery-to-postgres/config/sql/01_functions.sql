@@ -192,6 +192,662 @@ END;
 $function$;
 
 
+-- search_procedures_v3: same parameters, rows and ordering as search_procedures_v2,
+-- computed in one pass over the pricing rows.
+--   * Text matching runs first, on the procedure table alone, so only pricing
+--     rows of matched procedures are read (idx_procedure_pricing_procedure).
+--     v2's ILIKE fallback is dropped: it could only add rows scored 0, which
+--     v2 then filtered out.
+--   * Nearest provider and distance come from the same GROUP BY as the price
+--     aggregates (ordered ARRAY_AGG / MIN) instead of two correlated
+--     subqueries that re-sorted every procedure's pricing rows.
+--   * Ties on distance (e.g. every row without a ZIP) pick the first provider
+--     by name; v2 picked an arbitrary one.
+-- Benchmark against v2: scripts/benchmarks/bench_search_sql.py (mario-health-api).
+
+CREATE OR REPLACE FUNCTION search_procedures_v3(
+    search_query TEXT,
+    zip_code_input TEXT DEFAULT NULL,
+    radius_miles INT DEFAULT 25
+)
+RETURNS TABLE (
+    procedure_id TEXT,
+    procedure_name TEXT,
+    procedure_slug TEXT,
+    family_name TEXT,
+    family_slug TEXT,
+    category_name TEXT,
+    category_slug TEXT,
+    best_price NUMERIC,
+    avg_price NUMERIC,
+    max_price NUMERIC,
+    provider_count BIGINT,
+    nearest_provider TEXT,
+    nearest_distance_miles NUMERIC,
+    match_score NUMERIC
+)
+LANGUAGE plpgsql
+STABLE
+AS $function$
+DECLARE
+    search_location GEOGRAPHY;
+    radius_meters NUMERIC;
+    search_tsquery tsquery;
+BEGIN
+    radius_meters := radius_miles * 1609.34;
+    search_tsquery := plainto_tsquery('english', search_query);
+
+    IF zip_code_input IS NOT NULL THEN
+        SELECT location
+        INTO search_location
+        FROM zip_codes
+        WHERE zip_code = zip_code_input
+        LIMIT 1;
+
+        IF search_location IS NULL THEN
+            RETURN;
+        END IF;
+    END IF;
+
+    RETURN QUERY
+    WITH matched AS (
+        SELECT
+            p.id,
+            p.name,
+            p.slug,
+            p.family_id,
+            -- Same relevance buckets as search_procedures_v2
+            CASE
+                WHEN LOWER(p.name) = LOWER(search_query) THEN 1.0
+                WHEN LOWER(COALESCE(p.common_name, '')) = LOWER(search_query) THEN 0.95
+                WHEN p.search_vector @@ search_tsquery THEN
+                    0.5 + (ts_rank(p.search_vector, search_tsquery) * 0.4)
+                WHEN similarity(p.name, search_query) > 0.3 THEN
+                    similarity(p.name, search_query) * 0.4
+                WHEN similarity(COALESCE(p.common_name, ''), search_query) > 0.3 THEN
+                    similarity(COALESCE(p.common_name, ''), search_query) * 0.35
+                ELSE 0
+            END AS relevance_score
+        FROM procedure p
+        WHERE
+            p.search_vector @@ search_tsquery
+            OR similarity(p.name, search_query) > 0.3
+            OR similarity(COALESCE(p.common_name, ''), search_query) > 0.3
+    ),
+    pricing AS (
+        SELECT
+            pp.procedure_id AS proc_id,
+            pp.price,
+            pl.provider_name,
+            CASE
+                WHEN search_location IS NOT NULL THEN
+                    ST_Distance(search_location, pl.location) * 0.000621371
+                ELSE 0
+            END AS distance_miles
+        FROM procedure_pricing pp
+        JOIN provider_location pl ON pp.provider_location_id = pl.id
+        WHERE
+            pp.procedure_id IN (SELECT m.id FROM matched m WHERE m.relevance_score > 0)
+            AND (
+                search_location IS NULL OR
+                ST_DWithin(search_location, pl.location, radius_meters)
+            )
+    ),
+    price_stats AS (
+        SELECT
+            pr.proc_id,
+            MIN(pr.price) AS min_price,
+            AVG(pr.price) AS avg_price,
+            MAX(pr.price) AS max_price,
+            COUNT(DISTINCT pr.provider_name) AS prov_count,
+            (ARRAY_AGG(pr.provider_name ORDER BY pr.distance_miles ASC, pr.provider_name ASC))[1]
+                AS nearest_prov,
+            CAST(MIN(pr.distance_miles) AS NUMERIC) AS nearest_dist
+        FROM pricing pr
+        GROUP BY pr.proc_id
+    )
+    SELECT
+        m.id AS procedure_id,
+        m.name AS procedure_name,
+        m.slug AS procedure_slug,
+        pf.name AS family_name,
+        pf.slug AS family_slug,
+        pc.name AS category_name,
+        pc.slug AS category_slug,
+        ps.min_price AS best_price,
+        ps.avg_price AS avg_price,
+        ps.max_price AS max_price,
+        ps.prov_count AS provider_count,
+        ps.nearest_prov AS nearest_provider,
+        ps.nearest_dist AS nearest_distance_miles,
+        CAST(m.relevance_score AS NUMERIC) AS match_score
+    FROM matched m
+    JOIN price_stats ps ON ps.proc_id = m.id
+    JOIN procedure_family pf ON m.family_id = pf.id
+    JOIN procedure_category pc ON pf.category_id = pc.id
+    WHERE m.relevance_score > 0
+    ORDER BY
+        m.relevance_score DESC,
+        ps.min_price ASC,
+        COALESCE(ps.nearest_dist, 999999) ASC
+    LIMIT 50;
+END;
+$function$;
+
+
+-- Catalog rows for the API's in-memory procedure search index
+-- (app/services/procedure_index.py). Loaded once per instance and again
+-- when data_version changes.
+
+CREATE OR REPLACE FUNCTION get_procedure_search_corpus()
+RETURNS TABLE (
+    procedure_id TEXT,
+    procedure_name TEXT,
+    procedure_slug TEXT,
+    common_name TEXT,
+    description TEXT,
+    search_terms TEXT,
+    family_name TEXT,
+    family_slug TEXT,
+    category_name TEXT,
+    category_slug TEXT,
+    billing_codes TEXT[]
+)
+LANGUAGE sql
+STABLE
+AS $function$
+    SELECT
+        p.id,
+        p.name,
+        p.slug,
+        p.common_name,
+        p.description,
+        p.search_terms,
+        pf.name,
+        pf.slug,
+        pc.name,
+        pc.slug,
+        ARRAY(
+            SELECT DISTINCT pbc.code
+            FROM procedure_billing_code pbc
+            WHERE pbc.procedure_id = p.id
+        )
+    FROM procedure p
+    JOIN procedure_family pf ON p.family_id = pf.id
+    JOIN procedure_category pc ON pf.category_id = pc.id;
+$function$;
+
+
+-- Price aggregates for procedures already matched by the API's search index.
+-- Same pricing/radius rules as search_procedures_v2, without the text matching.
+--
+-- With a ZIP, the radius is answered from the geo price summary built by
+-- refresh_geo_price_summary(): cells wholly inside the radius contribute their
+-- precomputed summaries, and only rows in cells crossing the radius are
+-- distance-checked. The nearest provider is exact: only cells that can be
+-- closer than the best cell's farthest corner are read. Until the summary has
+-- been built this falls back to aggregating procedure_pricing directly.
+
+CREATE OR REPLACE FUNCTION get_procedure_price_summaries(
+    procedure_ids TEXT[],
+    zip_code_input TEXT DEFAULT NULL,
+    radius_miles INT DEFAULT 25
+)
+RETURNS TABLE (
+    procedure_id TEXT,
+    best_price NUMERIC,
+    avg_price NUMERIC,
+    max_price NUMERIC,
+    provider_count BIGINT,
+    nearest_provider TEXT,
+    nearest_distance_miles NUMERIC
+)
+LANGUAGE plpgsql
+STABLE
+AS $function$
+DECLARE
+    search_location GEOGRAPHY;
+    radius_meters NUMERIC;
+    -- Slack for cell edges following parallels rather than great circles
+    cell_margin_meters CONSTANT NUMERIC := 10;
+BEGIN
+    radius_meters := radius_miles * 1609.34;
+
+    IF zip_code_input IS NOT NULL THEN
+        SELECT location
+        INTO search_location
+        FROM zip_codes
+        WHERE zip_code = zip_code_input
+        LIMIT 1;
+
+        IF search_location IS NULL THEN
+            RETURN;
+        END IF;
+    END IF;
+
+    IF search_location IS NOT NULL AND EXISTS (SELECT 1 FROM price_geo_cell) THEN
+        RETURN QUERY
+        WITH cells AS (
+            SELECT
+                gc.geohash,
+                ST_Distance(search_location, gc.bounds) AS near_m,
+                GREATEST(
+                    ST_Distance(search_location, gc.sw),
+                    ST_Distance(search_location, gc.se),
+                    ST_Distance(search_location, gc.ne),
+                    ST_Distance(search_location, gc.nw)
+                ) + cell_margin_meters AS far_m
+            FROM price_geo_cell gc
+            WHERE ST_DWithin(search_location, gc.bounds, radius_meters)
+        ),
+        proc_cells AS (
+            SELECT
+                pc.procedure_id AS proc_id,
+                pc.geohash,
+                pc.price_count,
+                pc.price_sum,
+                pc.min_price,
+                pc.max_price,
+                pc.provider_names,
+                c.near_m,
+                c.far_m <= radius_meters AS inside,
+                -- Every row in the closest cell is at most this far away
+                MIN(c.far_m) OVER (PARTITION BY pc.procedure_id) AS nearest_bound
+            FROM cells c
+            JOIN procedure_price_cell pc ON pc.geohash = c.geohash
+            WHERE pc.procedure_id = ANY(procedure_ids)
+        ),
+        points AS (
+            -- Boundary cells for the exact radius check, and any cell that
+            -- could hold the nearest provider
+            SELECT
+                pcl.proc_id,
+                pt.provider_name,
+                pt.price,
+                pcl.inside,
+                ST_Distance(search_location, pt.location) * 0.000621371 AS distance_miles
+            FROM proc_cells pcl
+            JOIN procedure_price_point pt
+                ON pt.procedure_id = pcl.proc_id AND pt.geohash = pcl.geohash
+            WHERE
+                (NOT pcl.inside OR pcl.near_m <= pcl.nearest_bound)
+                AND ST_DWithin(search_location, pt.location, radius_meters)
+        ),
+        merged AS (
+            SELECT
+                pcl.proc_id,
+                pcl.price_count,
+                pcl.price_sum,
+                pcl.min_price,
+                pcl.max_price,
+                pcl.provider_names
+            FROM proc_cells pcl
+            WHERE pcl.inside
+            UNION ALL
+            SELECT
+                p.proc_id,
+                COUNT(p.price),
+                SUM(p.price),
+                MIN(p.price),
+                MAX(p.price),
+                COALESCE(ARRAY_AGG(DISTINCT p.provider_name) FILTER (WHERE p.provider_name IS NOT NULL), '{}')
+            FROM points p
+            WHERE NOT p.inside
+            GROUP BY p.proc_id
+        ),
+        totals AS (
+            SELECT
+                m.proc_id,
+                SUM(m.price_count) AS price_count,
+                MIN(m.min_price) AS min_price,
+                SUM(m.price_sum) / NULLIF(SUM(m.price_count), 0) AS mean_price,
+                MAX(m.max_price) AS top_price
+            FROM merged m
+            GROUP BY m.proc_id
+        ),
+        providers AS (
+            SELECT m.proc_id, COUNT(DISTINCT u.provider_name) AS provider_total
+            FROM merged m
+            CROSS JOIN LATERAL unnest(m.provider_names) AS u(provider_name)
+            GROUP BY m.proc_id
+        ),
+        nearest AS (
+            SELECT
+                p.proc_id,
+                (ARRAY_AGG(p.provider_name ORDER BY p.distance_miles ASC))[1] AS provider_name,
+                MIN(p.distance_miles) AS distance_miles
+            FROM points p
+            GROUP BY p.proc_id
+        )
+        SELECT
+            t.proc_id,
+            t.min_price,
+            t.mean_price,
+            t.top_price,
+            COALESCE(pr.provider_total, 0),
+            n.provider_name,
+            CAST(n.distance_miles AS NUMERIC)
+        FROM totals t
+        LEFT JOIN providers pr ON pr.proc_id = t.proc_id
+        LEFT JOIN nearest n ON n.proc_id = t.proc_id
+        WHERE t.price_count > 0;
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    WITH filtered_pricing AS (
+        SELECT
+            pp.procedure_id AS proc_id,
+            pp.price,
+            pl.provider_name,
+            CASE
+                WHEN search_location IS NOT NULL THEN
+                    ST_Distance(search_location, pl.location) * 0.000621371
+                ELSE 0
+            END as distance_miles
+        FROM procedure_pricing pp
+        JOIN provider_location pl ON pp.provider_location_id = pl.id
+        WHERE
+            pp.procedure_id = ANY(procedure_ids)
+            AND (
+                search_location IS NULL OR
+                ST_DWithin(search_location, pl.location, radius_meters)
+            )
+    )
+    SELECT
+        fp.proc_id,
+        MIN(fp.price),
+        AVG(fp.price),
+        MAX(fp.price),
+        COUNT(DISTINCT fp.provider_name),
+        (ARRAY_AGG(fp.provider_name ORDER BY fp.distance_miles ASC))[1],
+        CAST(MIN(fp.distance_miles) AS NUMERIC)
+    FROM filtered_pricing fp
+    GROUP BY fp.proc_id
+    HAVING COUNT(fp.price) > 0;
+END;
+$function$;
+
+
+-- ZIP centroids for the API's in-memory geocoder (app/services/zip_geocoder.py),
+-- as one JSON document of parallel arrays so PostgREST's max-rows limit
+-- doesn't truncate it.
+
+CREATE OR REPLACE FUNCTION get_zip_centroids()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $function$
+    SELECT jsonb_build_object(
+        'zip', COALESCE(jsonb_agg(z.zip_code ORDER BY z.zip_code), '[]'::jsonb),
+        'lat', COALESCE(jsonb_agg(z.latitude ORDER BY z.zip_code), '[]'::jsonb),
+        'lon', COALESCE(jsonb_agg(z.longitude ORDER BY z.zip_code), '[]'::jsonb)
+    )
+    FROM zip_codes z;
+$function$;
+
+
+-- One page of the provider location corpus for the API's in-memory spatial
+-- index (app/services/provider_geo_index.py): locations after ``after_id`` in
+-- id order, with the specialty (taxonomy) codes of their provider, as parallel
+-- arrays. The API pages until it gets fewer than ``page_size`` locations.
+
+CREATE OR REPLACE FUNCTION get_provider_geo_corpus(
+    after_id TEXT DEFAULT NULL,
+    page_size INT DEFAULT 50000
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $function$
+    WITH page AS (
+        SELECT
+            pl.id,
+            pl.org_id,
+            pl.latitude,
+            pl.longitude,
+            ARRAY(
+                SELECT DISTINCT p.specialty_id
+                FROM provider p
+                WHERE p.provider_id = pl.provider_id
+                  AND p.specialty_id IS NOT NULL
+            ) AS taxonomies
+        FROM provider_location pl
+        WHERE after_id IS NULL OR pl.id > after_id
+        ORDER BY pl.id
+        LIMIT page_size
+    )
+    SELECT jsonb_build_object(
+        'id', COALESCE(jsonb_agg(page.id ORDER BY page.id), '[]'::jsonb),
+        'org_id', COALESCE(jsonb_agg(page.org_id ORDER BY page.id), '[]'::jsonb),
+        'lat', COALESCE(jsonb_agg(page.latitude ORDER BY page.id), '[]'::jsonb),
+        'lon', COALESCE(jsonb_agg(page.longitude ORDER BY page.id), '[]'::jsonb),
+        'taxonomies', COALESCE(jsonb_agg(to_jsonb(page.taxonomies) ORDER BY page.id), '[]'::jsonb)
+    )
+    FROM page;
+$function$;
+
+
+-- Specialty provider search in one round-trip: the nearest ``result_limit``
+-- locations of providers with one of the specialty's taxonomies
+-- (specialty_map -> provider -> provider_location) within the radius, with the
+-- price range of ``procedure_id_input`` (the specialty's representative
+-- procedure) at each location's organization. total_within_radius repeats the
+-- count of all matching locations on every row.
+--
+-- Written as a single SQL statement so the planner inlines it: the search
+-- point is then a constant, and the nearest locations come from a KNN scan
+-- (<->) of idx_provider_location_geo bounded by ST_DWithin, instead of the API
+-- fetching providers and their locations and measuring distances itself.
+-- Plan regression test: tests/sql/test_find_specialty_providers.py
+-- (mario-health-api).
+
+CREATE OR REPLACE FUNCTION find_specialty_providers(
+    specialty_id_input TEXT,
+    search_lat DOUBLE PRECISION,
+    search_lon DOUBLE PRECISION,
+    radius_miles INT DEFAULT 25,
+    result_limit INT DEFAULT 50,
+    procedure_id_input TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    provider_id TEXT,
+    provider_name TEXT,
+    org_id TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    zip_code TEXT,
+    distance_miles DOUBLE PRECISION,
+    min_price NUMERIC,
+    max_price NUMERIC,
+    avg_price NUMERIC,
+    total_within_radius BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $function$
+    WITH nearest AS (
+        SELECT
+            pl.provider_id,
+            pl.provider_name,
+            pl.org_id,
+            pl.address,
+            pl.city,
+            pl.state,
+            pl.zip_code,
+            ST_Distance(
+                pl.location,
+                ST_SetSRID(ST_MakePoint(search_lon, search_lat), 4326)::geography
+            ) * 0.000621371 AS distance_miles
+        FROM provider_location pl
+        WHERE
+            ST_DWithin(
+                pl.location,
+                ST_SetSRID(ST_MakePoint(search_lon, search_lat), 4326)::geography,
+                radius_miles * 1609.34
+            )
+            AND EXISTS (
+                SELECT 1
+                FROM provider p
+                JOIN specialty_map sm ON sm.taxonomy_id = p.specialty_id
+                WHERE p.provider_id = pl.provider_id
+                  AND sm.specialty_id = specialty_id_input
+            )
+        ORDER BY pl.location <-> ST_SetSRID(ST_MakePoint(search_lon, search_lat), 4326)::geography
+        LIMIT result_limit
+    ),
+    org_prices AS (
+        SELECT
+            pp.org_id,
+            MIN(pp.price) AS min_price,
+            MAX(pp.price) AS max_price,
+            AVG(pp.price) AS avg_price
+        FROM procedure_pricing pp
+        WHERE pp.procedure_id = procedure_id_input
+          AND pp.org_id IN (SELECT n.org_id FROM nearest n)
+        GROUP BY pp.org_id
+    )
+    SELECT
+        n.provider_id,
+        n.provider_name,
+        n.org_id,
+        n.address,
+        n.city,
+        n.state,
+        n.zip_code,
+        n.distance_miles,
+        op.min_price,
+        op.max_price,
+        op.avg_price,
+        (
+            SELECT COUNT(*)
+            FROM provider_location pl
+            WHERE
+                ST_DWithin(
+                    pl.location,
+                    ST_SetSRID(ST_MakePoint(search_lon, search_lat), 4326)::geography,
+                    radius_miles * 1609.34
+                )
+                AND EXISTS (
+                    SELECT 1
+                    FROM provider p
+                    JOIN specialty_map sm ON sm.taxonomy_id = p.specialty_id
+                    WHERE p.provider_id = pl.provider_id
+                      AND sm.specialty_id = specialty_id_input
+                )
+        ) AS total_within_radius
+    FROM nearest n
+    LEFT JOIN org_prices op ON op.org_id = n.org_id
+    ORDER BY n.distance_miles, n.provider_id;
+$function$;
+
+
+-- Rebuilds the geo price summary read by get_procedure_price_summaries:
+-- price_geo_cell (geohash cells with priced providers), procedure_price_cell
+-- (per-procedure summary per cell) and procedure_price_point (the pricing
+-- rows keyed by cell). Called by scripts/sync_all.py after each sync. Rows
+-- are deleted rather than truncated so searches keep reading the previous
+-- summary until the rebuild commits. Returns the number of summary rows.
+
+CREATE OR REPLACE FUNCTION refresh_geo_price_summary(cell_precision INT DEFAULT 5)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+    summary_rows BIGINT;
+BEGIN
+    DELETE FROM procedure_price_point;
+    DELETE FROM procedure_price_cell;
+    DELETE FROM price_geo_cell;
+
+    INSERT INTO procedure_price_point (procedure_id, geohash, provider_name, price, location)
+    SELECT
+        pp.procedure_id,
+        ST_GeoHash(pl.location::geometry, cell_precision),
+        pl.provider_name,
+        pp.price,
+        pl.location
+    FROM procedure_pricing pp
+    JOIN provider_location pl ON pp.provider_location_id = pl.id
+    WHERE pp.procedure_id IS NOT NULL AND pl.location IS NOT NULL;
+
+    INSERT INTO procedure_price_cell (
+        procedure_id, geohash, price_count, price_sum, min_price, max_price, provider_names
+    )
+    SELECT
+        pt.procedure_id,
+        pt.geohash,
+        COUNT(pt.price),
+        SUM(pt.price),
+        MIN(pt.price),
+        MAX(pt.price),
+        COALESCE(ARRAY_AGG(DISTINCT pt.provider_name) FILTER (WHERE pt.provider_name IS NOT NULL), '{}')
+    FROM procedure_price_point pt
+    GROUP BY pt.procedure_id, pt.geohash;
+    GET DIAGNOSTICS summary_rows = ROW_COUNT;
+
+    INSERT INTO price_geo_cell (geohash, bounds, sw, se, ne, nw)
+    SELECT
+        cell.geohash,
+        cell.box::geography,
+        ST_SetSRID(ST_MakePoint(ST_XMin(cell.box), ST_YMin(cell.box)), 4326)::geography,
+        ST_SetSRID(ST_MakePoint(ST_XMax(cell.box), ST_YMin(cell.box)), 4326)::geography,
+        ST_SetSRID(ST_MakePoint(ST_XMax(cell.box), ST_YMax(cell.box)), 4326)::geography,
+        ST_SetSRID(ST_MakePoint(ST_XMin(cell.box), ST_YMax(cell.box)), 4326)::geography
+    FROM (
+        SELECT g.geohash, ST_SetSRID(ST_GeomFromGeoHash(g.geohash), 4326) AS box
+        FROM (SELECT DISTINCT pc.geohash FROM procedure_price_cell pc) g
+    ) cell;
+
+    ANALYZE price_geo_cell;
+    ANALYZE procedure_price_cell;
+    ANALYZE procedure_price_point;
+
+    RETURN summary_rows;
+END;
+$function$;
+
+
+-- Labels for the API's in-memory typeahead index (app/services/suggest_index.py):
+-- procedure names and common names, billing codes, specialties and hospitals
+-- with their aliases. Returned as one JSON array so PostgREST's max-rows
+-- limit doesn't truncate it.
+
+CREATE OR REPLACE FUNCTION get_suggestion_corpus()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $function$
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+        'kind', s.kind, 'label', s.label, 'slug', s.slug, 'name', s.name
+    )), '[]'::jsonb)
+    FROM (
+        SELECT 'procedure' AS kind, p.name AS label, p.slug, p.name
+        FROM procedure p
+        UNION ALL
+        SELECT 'procedure', p.common_name, p.slug, p.name
+        FROM procedure p
+        WHERE COALESCE(p.common_name, '') <> ''
+        UNION ALL
+        SELECT 'billing_code', pbc.code, p.slug, p.name
+        FROM procedure_billing_code pbc
+        JOIN procedure p ON p.id = pbc.procedure_id
+        UNION ALL
+        SELECT 'specialty', sp.name, sp.slug, sp.name
+        FROM specialty sp
+        WHERE sp.is_used
+        UNION ALL
+        SELECT 'hospital', h.hospital_name, h.hospital_id, h.hospital_name
+        FROM hospitals h
+        UNION ALL
+        SELECT 'hospital', ha.alias, h.hospital_id, h.hospital_name
+        FROM hospital_aliases ha
+        JOIN hospitals h ON h.hospital_id = ha.hospital_id
+    ) s;
+$function$;
+
+
 CREATE OR REPLACE FUNCTION get_specialty_details(specialty_slug_input TEXT)
 RETURNS TABLE (
 id TEXT,
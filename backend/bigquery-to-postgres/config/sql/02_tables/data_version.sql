@@ -0,0 +1,16 @@
+-- Single-row counter bumped by scripts/sync_all.py after every sync.
+-- API instances poll it and drop their in-process catalog cache when it changes.
+CREATE TABLE IF NOT EXISTS data_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+-- Row-level security (if using Supabase RLS)
+ALTER TABLE data_version ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read access" ON data_version;
+CREATE POLICY "Public read access" ON data_version
+    FOR SELECT USING (true);
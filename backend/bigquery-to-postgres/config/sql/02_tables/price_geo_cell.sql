@@ -0,0 +1,19 @@
+-- Geohash cells (precision 5, about 4.9km x 4.9km) that hold at least one priced
+-- provider. Rebuilt by refresh_geo_price_summary() after each sync; the corners
+-- let get_procedure_price_summaries tell cells wholly inside a search radius
+-- from the ones on its boundary without touching procedure_pricing.
+CREATE TABLE IF NOT EXISTS price_geo_cell (
+    geohash TEXT PRIMARY KEY,
+    bounds GEOGRAPHY(POLYGON, 4326) NOT NULL,
+    sw GEOGRAPHY(POINT, 4326) NOT NULL,
+    se GEOGRAPHY(POINT, 4326) NOT NULL,
+    ne GEOGRAPHY(POINT, 4326) NOT NULL,
+    nw GEOGRAPHY(POINT, 4326) NOT NULL
+);
+
+-- Row-level security (if using Supabase RLS)
+ALTER TABLE price_geo_cell ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read access" ON price_geo_cell;
+CREATE POLICY "Public read access" ON price_geo_cell
+    FOR SELECT USING (true);
@@ -0,0 +1,20 @@
+-- Per-procedure price summary for each geohash cell in price_geo_cell, so a
+-- radius search merges a few hundred summary rows instead of aggregating the
+-- national procedure_pricing table. Rebuilt by refresh_geo_price_summary().
+CREATE TABLE IF NOT EXISTS procedure_price_cell (
+    procedure_id TEXT NOT NULL,
+    geohash TEXT NOT NULL,
+    price_count BIGINT NOT NULL,
+    price_sum NUMERIC,
+    min_price NUMERIC,
+    max_price NUMERIC,
+    provider_names TEXT[] NOT NULL,
+    PRIMARY KEY (geohash, procedure_id)
+);
+
+-- Row-level security (if using Supabase RLS)
+ALTER TABLE procedure_price_cell ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read access" ON procedure_price_cell;
+CREATE POLICY "Public read access" ON procedure_price_cell
+    FOR SELECT USING (true);
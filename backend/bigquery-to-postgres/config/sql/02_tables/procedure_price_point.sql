@@ -0,0 +1,18 @@
+-- procedure_pricing rows with their provider's location, keyed by geohash cell.
+-- Only read for the cells on a search radius's boundary (exact distance check)
+-- and the cells that can hold the nearest provider. Rebuilt by
+-- refresh_geo_price_summary().
+CREATE TABLE IF NOT EXISTS procedure_price_point (
+    procedure_id TEXT NOT NULL,
+    geohash TEXT NOT NULL,
+    provider_name TEXT,
+    price NUMERIC,
+    location GEOGRAPHY(POINT, 4326) NOT NULL
+);
+
+-- Row-level security (if using Supabase RLS)
+ALTER TABLE procedure_price_point ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read access" ON procedure_price_point;
+CREATE POLICY "Public read access" ON procedure_price_point
+    FOR SELECT USING (true);
@@ -10,9 +10,18 @@ CREATE INDEX IF NOT EXISTS idx_zip_state ON zip_codes(state_code);
 CREATE INDEX IF NOT EXISTS idx_provider_location_geo ON provider_location USING GIST (location);
 CREATE INDEX IF NOT EXISTS idx_provider_location_zip ON provider_location (zip_code);
 
+-- Provider taxonomies by provider_id (get_provider_geo_corpus, find_specialty_providers)
+CREATE INDEX IF NOT EXISTS idx_provider_provider_id ON provider (provider_id);
+CREATE INDEX IF NOT EXISTS idx_specialty_map_specialty ON specialty_map (specialty_id, taxonomy_id);
+
 -- Procedure pricing
 CREATE INDEX IF NOT EXISTS idx_procedure_pricing_provider ON procedure_pricing (provider_id);
 CREATE INDEX IF NOT EXISTS idx_procedure_pricing_procedure ON procedure_pricing (procedure_id);
+CREATE INDEX IF NOT EXISTS idx_procedure_pricing_procedure_org ON procedure_pricing (procedure_id, org_id);
+
+-- Geo price summary (refreshed by refresh_geo_price_summary())
+CREATE INDEX IF NOT EXISTS idx_price_geo_cell_bounds ON price_geo_cell USING GIST (bounds);
+CREATE INDEX IF NOT EXISTS idx_procedure_price_point_cell ON procedure_price_point (procedure_id, geohash);
 
 -- Procedure
 CREATE INDEX idx_procedure_family ON procedure(family_id);
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Export zip_codes as a ZIP geocoder snapshot
+Writes the packed file the API loads into memory when ZIP_SNAPSHOT_PATH is set
+(format documented in mario-health-api/app/services/zip_geocoder.py)
+
+Usage:
+    python scripts/export_zip_snapshot.py --output /path/to/zips.bin
+"""
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SNAPSHOT_MAGIC = b"MZIPGEO1"
+
+
+def export_zip_snapshot(path):
+    """Write all 5-digit ZIPs with coordinates to path; returns the ZIP count"""
+    engine = create_engine(os.getenv('POSTGRES_DB_URL'))
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT zip_code, latitude, longitude FROM zip_codes "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL "
+            "ORDER BY zip_code"
+        )).fetchall()
+
+    zips, latitudes, longitudes = array('I'), array('f'), array('f')
+    for zip_code, latitude, longitude in rows:
+        if len(zip_code) != 5 or not zip_code.isdigit():
+            continue
+        number = int(zip_code)
+        if zips and zips[-1] == number:
+            continue
+        zips.append(number)
+        latitudes.append(float(latitude))
+        longitudes.append(float(longitude))
+
+    if sys.byteorder == 'big':
+        for column in (zips, latitudes, longitudes):
+            column.byteswap()
+
+    # Write then rename, so a running API never reads a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack('<I', len(zips)))
+        for column in (zips, latitudes, longitudes):
+            f.write(column.tobytes())
+    os.replace(tmp_path, path)
+    return len(zips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export zip_codes as a ZIP geocoder snapshot')
+    parser.add_argument(
+        '--output',
+        default=os.getenv('ZIP_SNAPSHOT_PATH'),
+        help='Snapshot file to write (default: $ZIP_SNAPSHOT_PATH)'
+    )
+    args = parser.parse_args()
+
+    if not args.output:
+        print("❌ --output or ZIP_SNAPSHOT_PATH is required")
+        sys.exit(1)
+
+    count = export_zip_snapshot(args.output)
+    print(f"✅ Wrote {count} ZIP codes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,10 @@ sys.path.insert(0, project_root)
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
 from config.tables import TABLES, DEFAULT_SYNC_TABLES
 from scripts.sync_data import DataSync
+from scripts.export_zip_snapshot import export_zip_snapshot
 
 load_dotenv()
 
@@ -29,6 +31,67 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tables refresh_geo_price_summary() reads
+GEO_SUMMARY_SOURCES = ('procedure_pricing', 'provider_location')
+
+# Tables refresh_geo_price_summary() writes; get_procedure_price_summaries
+# aggregates procedure_pricing directly while price_geo_cell is empty
+GEO_SUMMARY_TABLES = ('procedure_price_point', 'procedure_price_cell', 'price_geo_cell')
+
+
+def bump_data_version():
+    """Bump data_version so API instances drop their cached catalog responses"""
+    try:
+        engine = create_engine(os.getenv('POSTGRES_DB_URL'))
+        with engine.begin() as conn:
+            version = conn.execute(text(
+                "UPDATE data_version SET version = version + 1, updated_at = NOW() "
+                "WHERE id = 1 RETURNING version"
+            )).scalar()
+        logger.info(f"Data version bumped to {version}")
+    except Exception as e:
+        logger.warning(f"Could not bump data_version: {e}")
+
+
+def refresh_geo_price_summary():
+    """Rebuild the geohash price summary that location searches read.
+
+    If the rebuild fails, the summary is cleared so location searches
+    aggregate the synced rows directly instead of serving the old prices.
+    Returns 'rebuilt', 'cleared' or 'stale' (the old summary is still read).
+    """
+    engine = create_engine(os.getenv('POSTGRES_DB_URL'))
+    try:
+        with engine.begin() as conn:
+            rows = conn.execute(text("SELECT refresh_geo_price_summary()")).scalar()
+        logger.info(f"Geo price summary rebuilt: {rows} cell summaries")
+        return 'rebuilt'
+    except Exception as e:
+        logger.error(f"Could not rebuild geo price summary: {e}")
+
+    try:
+        with engine.begin() as conn:
+            for table in GEO_SUMMARY_TABLES:
+                conn.execute(text(f"DELETE FROM {table}"))
+        logger.warning("Geo price summary cleared: location searches aggregate procedure_pricing directly")
+        return 'cleared'
+    except Exception as e:
+        logger.error(f"Could not clear geo price summary: {e}")
+        return 'stale'
+
+
+def write_zip_snapshot(zip_codes_synced):
+    """Export zip_codes for the API's in-memory geocoder, if ZIP_SNAPSHOT_PATH is set"""
+    path = os.getenv('ZIP_SNAPSHOT_PATH')
+    # zip_codes is rarely synced; still write the first snapshot
+    if not path or (not zip_codes_synced and os.path.exists(path)):
+        return
+    try:
+        count = export_zip_snapshot(path)
+        logger.info(f"ZIP snapshot written: {count} ZIP codes to {path}")
+    except Exception as e:
+        logger.warning(f"Could not write ZIP snapshot: {e}")
+
 
 def sync_all_tables(tables_to_sync=None, force_full_refresh=False):
     """Sync multiple tables in sequence"""
@@ -75,8 +138,20 @@ def sync_all_tables(tables_to_sync=None, force_full_refresh=False):
     logger.info(f"Duration: {duration:.2f} seconds")
     logger.info("=" * 70)
 
-    # Exit with error if any table failed
-    if success_count < len(tables_to_sync):
+    # Searches with a ZIP read prices from the summary, so rebuild it first
+    geo_summary = 'rebuilt'
+    if any(results.get(t) == 'SUCCESS' for t in GEO_SUMMARY_SOURCES):
+        geo_summary = refresh_geo_price_summary()
+
+    write_zip_snapshot(results.get('zip_codes') == 'SUCCESS')
+
+    # Any loaded table can change catalog responses, even on partial success,
+    # but not while ZIP searches still read a summary of the old prices
+    if success_count and geo_summary != 'stale':
+        bump_data_version()
+
+    # Exit with error if any table or the summary rebuild failed
+    if success_count < len(tables_to_sync) or geo_summary != 'rebuilt':
         sys.exit(1)
 
 
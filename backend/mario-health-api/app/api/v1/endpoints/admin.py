@@ -0,0 +1,96 @@
+"""
+Admin API endpoints.
+
+Operational endpoints guarded by the ADMIN_API_KEY shared secret (sent as
+the X-Admin-Key header). They return 404 when ADMIN_API_KEY is unset.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from app.core.auth import require_admin_key
+from app.core.cache import catalog_cache, data_version
+from app.core.circuit_breaker import upstream_breakers
+from app.core.concurrency import upstream_limiters
+from app.core.result_cache import search_cache
+from app.core.singleflight import upstream_calls
+from app.middleware.logging import log_structured
+from app.services.procedure_index import procedure_index
+from app.services.provider_geo_index import provider_geo_index
+from app.services.suggest_index import suggest_index
+from app.services.zip_geocoder import zip_geocoder
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_key)],
+    include_in_schema=False,
+)
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Cache statistics: the catalog cache of this instance, the search
+    result cache (whose hits are shared when it uses the redis backend) and
+    this instance's procedure search and typeahead indexes, ZIP geocoder
+    and provider spatial index.
+    """
+    return {
+        "catalog": {**catalog_cache.stats(), "data_version": data_version.version},
+        "search": search_cache.stats(),
+        "search_index": procedure_index.stats(),
+        "suggest_index": suggest_index.stats(),
+        "zip_geocoder": zip_geocoder.stats(),
+        "provider_geo_index": provider_geo_index.stats(),
+    }
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    request: Request,
+    prefix: Optional[str] = Query(
+        None, description="Only drop catalog keys starting with this, e.g. 'families:'"
+    ),
+    search: bool = Query(False, description="Also clear the search result cache"),
+):
+    """
+    Clear the catalog cache on the instance that serves this request.
+
+    To invalidate every instance after a data load, bump data_version
+    instead (scripts/sync_all.py does this after each sync). With
+    ``search=true`` the search result cache is cleared too; with the redis
+    backend that applies to every instance.
+    """
+    cleared = catalog_cache.invalidate(prefix)
+    if search:
+        await search_cache.clear()
+
+    log_structured(
+        severity="INFO",
+        message="Catalog cache invalidated",
+        event_type="admin_cache_invalidate",
+        request_id=request.state.request_id,
+        prefix=prefix,
+        cleared_entries=cleared,
+        search=search,
+    )
+
+    return {"cleared": cleared, "prefix": prefix, "search_cleared": search}
+
+
+@router.get("/singleflight")
+async def get_singleflight_stats():
+    """Upstream call coalescing: calls made, calls merged into in-flight ones."""
+    return upstream_calls.stats()
+
+
+@router.get("/limits")
+async def get_limiter_stats():
+    """Adaptive upstream concurrency limits per class, queue depth and shed calls."""
+    return {name: limiter.stats() for name, limiter in upstream_limiters.items()}
+
+
+@router.get("/circuits")
+async def get_circuit_stats():
+    """Circuit breaker state and retry budget per upstream read class."""
+    return {name: breaker.stats() for name, breaker in upstream_breakers.items()}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Query, Request
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
 from app.models import BillingCodeDetail, CodeType
 from app.services.billing_code_service import BillingCodeService
@@ -21,7 +21,7 @@ async def get_billing_code_detail(
             None,
             description="Optional: Filter by specific code type"
         ),
-        supabase: Client = Depends(get_supabase)
+        supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get detailed information about a medical billing code.
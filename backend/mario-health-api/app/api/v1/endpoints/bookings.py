@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Path
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
@@ -45,7 +45,7 @@ class BookingResponse(BaseModel):
 @router.post("", response_model=BookingResponse)
 async def create_booking(
     booking_data: BookingData,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Create a new appointment booking.
@@ -69,7 +69,7 @@ async def create_booking(
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking_details(
     booking_id: str = Path(..., description="Booking ID"),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get details of a specific booking.
@@ -93,7 +93,7 @@ async def get_booking_details(
 @router.delete("/{booking_id}/cancel")
 async def cancel_booking(
     booking_id: str = Path(..., description="Booking ID"),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Cancel an existing booking.
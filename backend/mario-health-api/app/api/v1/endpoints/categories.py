@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
 from app.models import CategoriesResponse, CategoryFamiliesResponse
 from app.services.category_service import CategoryService
+from app.core.cache import cached_response
 from app.middleware.logging import log_structured
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 @router.get("", response_model=CategoriesResponse)
 async def get_categories(
     request: Request,  # Add this to access request context
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get all procedure categories with family counts."""
     service = CategoryService(supabase)
@@ -23,13 +24,15 @@ async def get_categories(
         request_id=request.state.request_id,
     )
 
-    return await service.get_all_categories()
+    return await cached_response(
+        request, "categories", service.get_all_categories, supabase=supabase
+    )
 
 @router.get("/{slug}/families", response_model=CategoryFamiliesResponse)
 async def get_category_families(
     request: Request,  # Add this to access request context
     slug: str,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get all procedure families within a category."""
     service = CategoryService(supabase)
@@ -43,4 +46,9 @@ async def get_category_families(
         slug=slug,
     )
 
-    return await service.get_families_by_category(slug)
+    return await cached_response(
+        request,
+        f"categories:{slug}:families",
+        lambda: service.get_families_by_category(slug),
+        supabase=supabase,
+    )
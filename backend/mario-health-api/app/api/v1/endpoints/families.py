@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
 from app.models import FamilyProceduresResponse
 from app.services.family_service import FamilyService
+from app.core.cache import cached_response
 from app.middleware.logging import log_structured
 
 router = APIRouter(prefix="/families", tags=["families"])
@@ -12,7 +13,7 @@ router = APIRouter(prefix="/families", tags=["families"])
 async def get_family_procedures(
         request: Request,
         slug: str,
-        supabase: Client = Depends(get_supabase)
+        supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get all procedures within a family with pricing information.
@@ -34,4 +35,9 @@ async def get_family_procedures(
         slug=slug,
     )
 
-    return await service.get_procedures_by_family(slug)
+    return await cached_response(
+        request,
+        f"families:{slug}:procedures",
+        lambda: service.get_procedures_by_family(slug),
+        supabase=supabase,
+    )
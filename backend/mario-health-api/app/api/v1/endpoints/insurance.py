@@ -5,11 +5,12 @@ Provides insurance verification and provider listing.
 TODO: Implement logic to match frontend requirements.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from typing import List, Optional
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
+from app.core.cache import cached_response
 
 router = APIRouter(prefix="/insurance", tags=["insurance"])
 
@@ -49,7 +50,7 @@ class InsuranceProvidersResponse(BaseModel):
 @router.post("/verify", response_model=InsuranceVerificationResponse)
 async def verify_insurance(
     request: InsuranceVerificationRequest,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Verify insurance coverage for a patient/provider combination.
@@ -70,7 +71,8 @@ async def verify_insurance(
 
 @router.get("/providers", response_model=InsuranceProvidersResponse)
 async def get_insurance_providers(
-    supabase: Client = Depends(get_supabase)
+    request: Request,
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get list of all major insurance providers.
@@ -78,6 +80,10 @@ async def get_insurance_providers(
     Shows all carriers, with 'available' flag indicating which ones have pricing data.
     Currently only Cigna and UnitedHealthcare have pricing data loaded.
     """
+    return await cached_response(request, "insurance:providers", _insurance_providers)
+
+
+async def _insurance_providers() -> InsuranceProvidersResponse:
     # IMPORTANT: Carriers with available=True must match carrier_id values in
     # the procedure_pricing table:
     # - cigna_national_oap (from cigna/national_oap_plan data pipeline)
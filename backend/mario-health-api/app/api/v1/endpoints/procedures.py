@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import RedirectResponse
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
+from app.core.responses import ORJSONResponse
 from app.models import ProcedureDetail, ProcedureProvidersResponse, ProcedureOrgsResponse
 from app.services.procedure_service import ProcedureService
 from app.middleware.logging import log_structured
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/procedures", tags=["procedures"])
 async def search_procedures_alias(
     request: Request,
     q: str = Query(..., description="Search query"),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """
     Alias route for procedure search.
@@ -33,7 +34,7 @@ async def search_procedures_alias(
 
 @router.get("/{slug}", response_model=ProcedureDetail)
 async def get_procedure_detail(
-    request: Request, slug: str, supabase: Client = Depends(get_supabase)
+    request: Request, slug: str, supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get detailed information about a specific procedure.
@@ -63,7 +64,7 @@ async def get_procedure_detail(
 
 @router.get("/{slug}/providers", response_model=ProcedureProvidersResponse)
 async def get_procedure_providers(
-    request: Request, slug: str, supabase: Client = Depends(get_supabase)
+    request: Request, slug: str, supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get all providers offering a specific procedure with pricing information.
@@ -85,11 +86,11 @@ async def get_procedure_providers(
         slug=slug,
     )
 
-    return await service.get_procedure_providers(slug)
+    return ORJSONResponse(await service.get_procedure_providers(slug))
 
 @router.get("/{slug}/orgs", response_model=ProcedureOrgsResponse)
 async def get_procedure_orgs(
-    request: Request, slug: str, supabase: Client = Depends(get_supabase)
+    request: Request, slug: str, supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     Get all orgs offering a specific procedure with pricing information.
@@ -111,4 +112,4 @@ async def get_procedure_orgs(
         slug=slug,
     )
 
-    return await service.get_procedure_orgs(slug)
+    return ORJSONResponse(await service.get_procedure_orgs(slug))
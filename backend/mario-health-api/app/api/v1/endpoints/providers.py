@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Path, Query, Request
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
+from app.core.responses import ORJSONResponse
 from app.models import Provider, ProviderDetail, ProviderProcedureDetail
 from app.services.provider_service import ProviderService
 from app.middleware.logging import log_structured
@@ -17,7 +18,7 @@ async def get_provider(
     provider_id: str = Path(
         ..., description="Provider ID (also accepts 'id' parameter)"
     ),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """
     Get  information about a healthcare provider.
@@ -48,7 +49,7 @@ async def get_provider_detail(
     provider_id: str = Path(
         ..., description="Provider ID (also accepts 'id' parameter)"
     ),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """
     Get detailed information about a healthcare provider.
@@ -74,7 +75,7 @@ async def get_provider_detail(
         provider_id=provider_id,
     )
 
-    return await service.get_provider_detail(provider_id)
+    return ORJSONResponse(await service.get_provider_detail(provider_id))
 
 
 @router.get(
@@ -84,7 +85,7 @@ async def get_provider_procedure_detail(
     request: Request,
     provider_id: str = Path(..., description="Provider ID"),
     procedure_slug: str = Path(..., description="Procedure slug"),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """
     Get detailed provider-procedure information with cost breakdown.
@@ -130,7 +131,7 @@ async def get_available_time_slots(
     date: Optional[str] = Query(
         None, description="Optional specific date (YYYY-MM-DD)"
     ),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """
     Get available time slots for a provider.
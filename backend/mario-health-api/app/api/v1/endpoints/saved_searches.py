@@ -36,7 +36,7 @@ async def get_saved_searches(
     Requires authentication via Firebase ID token.
     """
     try:
-        response = (
+        response = await (
             supabase.table("saved_searches")
             .select("*")
             .eq("user_id", user_id)
@@ -92,7 +92,7 @@ async def create_saved_search(
             "created_at": search.created_at.isoformat(),
         }
 
-        insert_response = supabase.table("saved_searches").insert(search_dict).execute()
+        insert_response = await supabase.table("saved_searches").insert(search_dict).execute()
 
         if not insert_response.data:
             raise HTTPException(
@@ -129,7 +129,7 @@ async def delete_saved_search(
     """
     try:
         # Verify the search belongs to the user
-        check_response = (
+        check_response = await (
             supabase.table("saved_searches")
             .select("*")
             .eq("id", search_id)
@@ -143,7 +143,7 @@ async def delete_saved_search(
             )
 
         # Delete the search
-        delete_response = (
+        delete_response = await (
             supabase.table("saved_searches")
             .delete()
             .eq("id", search_id)
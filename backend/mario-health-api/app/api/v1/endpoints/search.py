@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Query, Depends, Request
-from supabase import Client
+from supabase import AsyncClient
+from app.core.cache import CATALOG_CACHE_MAX_AGE
 from app.core.dependencies import get_supabase
-from app.models import SearchResponse
+from app.core.responses import ORJSONResponse
+from app.models import SearchResponse, SuggestResponse
 from app.services.search_service import SearchService
 from app.middleware.logging import log_structured
 
@@ -15,7 +17,13 @@ async def search_procedures(
         zip_code: str | None = Query(None, pattern=r"^\d{5}$", description="5-digit ZIP code"),
         zip: str | None = Query(None, pattern=r"^\d{5}$", description="5-digit ZIP code (alias)"),
         radius: int = Query(25, ge=1, le=100, description="Search radius in miles"),
-        supabase: Client = Depends(get_supabase)
+        max_radius: int | None = Query(
+            None,
+            ge=1,
+            le=100,
+            description="With a ZIP, widen the radius (doubling) up to this many miles until there are results",
+        ),
+        supabase: AsyncClient = Depends(get_supabase)
 ):
     """Search for procedures by name with intelligent matching.
 
@@ -24,6 +32,8 @@ async def search_procedures(
     - Fuzzy matching (handles typos)
     - Relevance ranking (match_score)
     - Location filtering (ZIP + radius)
+    - Expanding radius for sparse areas (`max_radius`); `radius_miles` in the
+      response is the radius used
     
     Supports both `zip_code` and `zip` query parameters for compatibility.
     """
@@ -40,6 +50,31 @@ async def search_procedures(
         search_query=q,
         zip_code=effective_zip,
         radius_miles=radius,
+        max_radius_miles=max_radius,
     )
 
-    return await service.search(query=q, zip_code=effective_zip, radius_miles=radius)
+    # Trusted DB rows: render with orjson and skip response_model revalidation
+    return ORJSONResponse(
+        await service.search(
+            query=q, zip_code=effective_zip, radius_miles=radius, max_radius_miles=max_radius
+        )
+    )
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+        q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+        limit: int = Query(8, ge=1, le=20, description="Maximum suggestions"),
+        supabase: AsyncClient = Depends(get_supabase)
+):
+    """Typeahead suggestions for the search box.
+
+    Matches the start of any word in procedure names, common names, billing
+    codes (CPT/HCPCS), specialty names and hospital names or aliases. Served
+    from memory, so it is cheap enough to call on every keystroke.
+    """
+    service = SearchService(supabase)
+    return ORJSONResponse(
+        await service.suggest(query=q, limit=limit),
+        headers={"Cache-Control": f"public, max-age={CATALOG_CACHE_MAX_AGE}"},
+    )
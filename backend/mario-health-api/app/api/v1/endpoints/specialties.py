@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
-from supabase import Client
+from supabase import AsyncClient
 from app.core.dependencies import get_supabase
 from app.models import SpecialtiesResponse, SpecialtyDetailsResponse, SpecialtyProvidersResponse
 from app.services.specialty_service import SpecialtyService
+from app.core.cache import cached_response
 from app.middleware.logging import log_structured
 
 router = APIRouter(prefix="/specialties", tags=["specialties"])
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/specialties", tags=["specialties"])
 @router.get("", response_model=SpecialtiesResponse)
 async def get_specialties(
     request: Request,  # Add this to access request context
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get all medical specialties."""
     service = SpecialtyService(supabase)
@@ -23,13 +24,15 @@ async def get_specialties(
         request_id=request.state.request_id,
     )
 
-    return await service.get_all_specialties()
+    return await cached_response(
+        request, "specialties", service.get_all_specialties, supabase=supabase
+    )
 
 @router.get("/{specialty_slug}", response_model=SpecialtyDetailsResponse)
 async def get_specialty_details(
         request: Request,
         specialty_slug: str,
-        supabase: Client = Depends(get_supabase),
+        supabase: AsyncClient = Depends(get_supabase),
 ):
     """Get all NUCC specialties for a specific specialty."""
     service = SpecialtyService(supabase)
@@ -43,7 +46,12 @@ async def get_specialty_details(
         specialty_slug=specialty_slug,
     )
 
-    return await service.get_specialties_details(specialty_slug)
+    return await cached_response(
+        request,
+        f"specialties:{specialty_slug}",
+        lambda: service.get_specialties_details(specialty_slug),
+        supabase=supabase,
+    )
 
 
 @router.get("/{specialty_slug}/providers", response_model=SpecialtyProvidersResponse)
@@ -53,7 +61,13 @@ async def get_specialty_providers(
         zip_code: str = Query(..., description="ZIP code for location-based search"),
         radius_miles: int = Query(25, ge=1, le=100, description="Search radius in miles"),
         limit: int = Query(20, ge=1, le=100, description="Maximum number of providers to return"),
-        supabase: Client = Depends(get_supabase),
+        max_radius_miles: int | None = Query(
+            None,
+            ge=1,
+            le=100,
+            description="Widen the radius (doubling) up to this many miles until `limit` providers are found",
+        ),
+        supabase: AsyncClient = Depends(get_supabase),
 ):
     """Get providers offering services in a specific specialty with pricing.
     
@@ -62,6 +76,8 @@ async def get_specialty_providers(
         zip_code: ZIP code for location-based search (required)
         radius_miles: Search radius in miles (default: 25, max: 100)
         limit: Maximum number of providers (default: 20, max: 100)
+        max_radius_miles: Optional maximum for an expanding search in sparse
+            areas; metadata.search_radius is the radius used
     
     Returns:
         List of providers with location, distance, and representative pricing
@@ -78,12 +94,14 @@ async def get_specialty_providers(
         zip_code=zip_code,
         radius_miles=radius_miles,
         limit=limit,
+        max_radius_miles=max_radius_miles,
     )
 
     return await service.get_specialty_providers(
         specialty_slug=specialty_slug,
         zip_code=zip_code,
         radius_miles=radius_miles,
-        limit=limit
+        limit=limit,
+        max_radius_miles=max_radius_miles,
     )
 
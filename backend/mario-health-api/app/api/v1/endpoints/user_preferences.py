@@ -19,6 +19,7 @@ from app.models.user_preferences import (
 )
 from app.core.dependencies import get_supabase
 from app.core.auth import get_current_user_id
+from app.core.concurrency import is_overload_error
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ async def get_user_preferences(
     """
     try:
         # Query the database for user preferences
-        response = supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
+        response = await supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
 
         if response.data and len(response.data) > 0:
             # Return preferences from database
@@ -70,7 +71,18 @@ async def get_user_preferences(
 
             return UserPreferencesResponse(preferences=default_prefs)
 
+    except HTTPException:
+        raise
     except Exception as e:
+        if is_overload_error(e):
+            # Don't hand out defaults during an outage: a client saving them
+            # back would overwrite the user's real preferences
+            logger.error(f"Upstream unavailable fetching preferences for user {user_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Preferences temporarily unavailable",
+            )
+
         # Log error but don't fail the request
         logger.error(f"Error fetching user preferences for user {user_id}: {e}")
 
@@ -109,11 +121,11 @@ async def update_user_preferences(
         update_data['updated_at'] = datetime.utcnow().isoformat()
 
         # Check if preferences already exist
-        response = supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
+        response = await supabase.table("user_preferences").select("*").eq("user_id", user_id).execute()
 
         if response.data and len(response.data) > 0:
             # Update existing preferences
-            update_response = supabase.table("user_preferences").update(update_data).eq("user_id", user_id).execute()
+            update_response = await supabase.table("user_preferences").update(update_data).eq("user_id", user_id).execute()
 
             if not update_response.data:
                 raise HTTPException(
@@ -124,7 +136,7 @@ async def update_user_preferences(
             result_data = update_response.data[0]
         else:
             # Insert new preferences
-            insert_response = supabase.table("user_preferences").insert(update_data).execute()
+            insert_response = await supabase.table("user_preferences").insert(update_data).execute()
 
             if not insert_response.data:
                 raise HTTPException(
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, Optional
 from app.core.auth import require_auth
+from app.auth.token_cache import token_cache
 
 router = APIRouter(prefix="/whoami", tags=["auth"])
 
@@ -71,3 +72,13 @@ async def whoami_test():
             "expected_response": "Returns token claims if valid, 401 if invalid or missing",
         },
     }
+
+
+@router.get("/token-cache")
+async def whoami_token_cache():
+    """
+    Verified-token cache counters (size, hits, misses, hit rate).
+
+    Contains no token or user data.
+    """
+    return token_cache.stats()
@@ -6,14 +6,33 @@ This module initializes Firebase Admin SDK using ADC, which works:
 - On Cloud Run: Automatically uses the attached IAM service account
 
 No service account key file is required.
+
+firebase_admin (and google-auth/requests/jwt behind it) is imported on first
+use rather than at module import: only authenticated routes need it, and it
+is one of the larger contributors to container cold start. For the same
+reason the signing key refresher starts with the first token verification
+(see require_auth), not with the app.
 """
 
-import firebase_admin
-from firebase_admin import credentials, auth
 import logging
+import os
+import threading
+from typing import Optional
+
+from app.auth.token_cache import token_cache
 
 logger = logging.getLogger(__name__)
 
+# How often the background refresher re-downloads Google's token signing
+# certificates. They are valid for hours, so verification never has to
+# fetch them on the request path.
+FIREBASE_KEY_REFRESH_INTERVAL = float(os.getenv("FIREBASE_KEY_REFRESH_INTERVAL", "300"))
+
+_key_refresh_thread: Optional[threading.Thread] = None
+_key_refresh_stop = threading.Event()
+_key_refresh_lock = threading.Lock()
+_init_lock = threading.Lock()
+
 
 def initialize_firebase_admin():
     """
@@ -29,30 +48,33 @@ def initialize_firebase_admin():
     Raises:
         Exception: If Firebase Admin SDK initialization fails
     """
-    import os
-
-    if not firebase_admin._apps:
-        try:
-            project_id = os.getenv("FIREBASE_PROJECT_ID")
-
-            if not project_id:
-                raise ValueError(
-                    "FIREBASE_PROJECT_ID environment variable is required. "
-                    "Set it to your Firebase project ID (e.g., 'mario-mrf-data')"
-                )
-
-            # Use Application Default Credentials with explicit project ID
-            cred = credentials.ApplicationDefault()
-            firebase_admin.initialize_app(cred, {
-                'projectId': project_id
-            })
-
-            logger.info(f"✅ Firebase Admin SDK initialized for project: {project_id}")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Firebase Admin SDK: {str(e)}")
-            raise
-    else:
-        logger.debug("Firebase Admin SDK already initialized")
+    import firebase_admin
+    from firebase_admin import credentials
+
+    # The key refresher and request threads may initialize at the same time
+    with _init_lock:
+        if not firebase_admin._apps:
+            try:
+                project_id = os.getenv("FIREBASE_PROJECT_ID")
+
+                if not project_id:
+                    raise ValueError(
+                        "FIREBASE_PROJECT_ID environment variable is required. "
+                        "Set it to your Firebase project ID (e.g., 'mario-mrf-data')"
+                    )
+
+                # Use Application Default Credentials with explicit project ID
+                cred = credentials.ApplicationDefault()
+                firebase_admin.initialize_app(cred, {
+                    'projectId': project_id
+                })
+
+                logger.info(f"✅ Firebase Admin SDK initialized for project: {project_id}")
+            except Exception as e:
+                logger.error(f"❌ Failed to initialize Firebase Admin SDK: {str(e)}")
+                raise
+        else:
+            logger.debug("Firebase Admin SDK already initialized")
 
 
 def get_firebase_auth():
@@ -64,6 +86,8 @@ def get_firebase_auth():
     Returns:
         firebase_admin.auth: Firebase Auth instance
     """
+    from firebase_admin import auth
+
     initialize_firebase_admin()
     return auth
 
@@ -72,16 +96,97 @@ def verify_token(id_token: str):
     """
     Verify a Firebase ID token.
 
+    Verified claims are cached until the token expires (see
+    app/auth/token_cache.py), so repeat calls with the same token skip the
+    signature check.
+
     Args:
         id_token: Firebase ID token string
 
+    Returns:
+        dict: Decoded token claims if valid, None if invalid
+    """
+    cached = token_cache.get(id_token)
+    if cached is not None:
+        return cached
+    return verify_and_cache_token(id_token)
+
+
+def verify_and_cache_token(id_token: str):
+    """
+    Verify a Firebase ID token with the Admin SDK and cache the claims.
+
+    Does not consult the cache; callers that already checked it (e.g.
+    require_auth) use this for the miss path.
+
     Returns:
         dict: Decoded token claims if valid, None if invalid
     """
     try:
-        initialize_firebase_admin()
-        decoded_token = auth.verify_id_token(id_token)
-        return decoded_token
+        decoded_token = get_firebase_auth().verify_id_token(id_token)
     except Exception as e:
         logger.error(f"Firebase auth error: {e}")
         return None
+
+    token_cache.put(id_token, decoded_token)
+    return decoded_token
+
+
+def refresh_signing_keys() -> bool:
+    """
+    Re-download the ID token signing certificates into the SDK's cache.
+
+    firebase_admin fetches the certificates through a cache-control aware
+    session and only refetches once they go stale, which lands on whichever
+    request verifies a token next. Forcing a refetch here keeps that cache
+    fresh.
+
+    Returns:
+        bool: True if the certificates were fetched
+    """
+    try:
+        import firebase_admin
+
+        auth = get_firebase_auth()
+        # The SDK doesn't expose its verifier publicly
+        verifier = auth._get_client(firebase_admin.get_app())._token_verifier
+        response = verifier.request(
+            verifier.id_token_verifier.cert_url,
+            headers={"Cache-Control": "no-cache"},
+        )
+        return response.status == 200
+    except Exception as e:
+        logger.warning(f"⚠️  Could not refresh Firebase signing keys: {e}")
+        return False
+
+
+def _refresh_signing_keys_loop():
+    while True:
+        refresh_signing_keys()
+        if _key_refresh_stop.wait(FIREBASE_KEY_REFRESH_INTERVAL):
+            return
+
+
+def start_signing_key_refresh():
+    """Fetch signing keys now and keep them fresh in a daemon thread; no-op once running."""
+    global _key_refresh_thread
+
+    if not os.getenv("FIREBASE_PROJECT_ID"):
+        return
+    with _key_refresh_lock:
+        if _key_refresh_thread is not None and _key_refresh_thread.is_alive():
+            return
+
+        _key_refresh_stop.clear()
+        _key_refresh_thread = threading.Thread(
+            target=_refresh_signing_keys_loop, name="firebase-key-refresh", daemon=True
+        )
+        _key_refresh_thread.start()
+
+
+def stop_signing_key_refresh():
+    """Stop the background signing key refresher."""
+    global _key_refresh_thread
+
+    _key_refresh_stop.set()
+    _key_refresh_thread = None
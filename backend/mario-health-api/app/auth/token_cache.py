@@ -0,0 +1,94 @@
+"""
+Cache of verified Firebase ID token claims.
+
+Verifying an ID token means fetching/parsing Google's signing certificates
+and checking an RS256 signature. A session sends the same token with every
+request until it expires (1 hour), so verified claims are cached:
+
+- keyed by the SHA-256 digest of the token (raw tokens are never stored),
+- expiring at the token's own ``exp`` claim,
+- bounded LRU (TOKEN_CACHE_SIZE entries, default 10000).
+
+Only successful verifications are cached. ``stats()`` exposes hit/miss
+counters.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of verified token claims with per-entry expiry."""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for ``token``, or None on miss/expiry."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers get their own copy so cached claims can't be mutated
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache verified claims until the token's ``exp``."""
+        try:
+            expires_at = float(claims["exp"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if expires_at <= time.time():
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+token_cache = VerifiedTokenCache()
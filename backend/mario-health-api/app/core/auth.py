@@ -4,9 +4,14 @@ Authentication utilities for Firebase ID tokens.
 Uses Firebase Admin SDK to verify tokens from Firebase Authentication.
 """
 
+import hmac
 import logging
+import os
 from typing import Dict, Any
 from fastapi import HTTPException, status, Header, Depends
+from fastapi.concurrency import run_in_threadpool
+
+from app.auth.token_cache import token_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +31,7 @@ async def require_auth(authorization: str = Header(None)) -> Dict[str, Any]:
     Raises:
         HTTPException: If no token or invalid token
     """
-    from app.auth.firebase_auth import verify_token
+    from app.auth.firebase_auth import start_signing_key_refresh, verify_and_cache_token
 
     if not authorization:
         raise HTTPException(
@@ -48,8 +53,14 @@ async def require_auth(authorization: str = Header(None)) -> Dict[str, Any]:
             detail="Token is missing"
         )
 
-    # Verify token using Firebase Admin SDK
-    decoded = verify_token(token)
+    # Tokens verified earlier in the session are served from the cache;
+    # otherwise verify with the Firebase Admin SDK off the event loop. The
+    # first verification also starts the signing key refresher, so cold
+    # starts that serve no authenticated request never load firebase_admin
+    decoded = token_cache.get(token)
+    if decoded is None:
+        start_signing_key_refresh()
+        decoded = await run_in_threadpool(verify_and_cache_token, token)
 
     if not decoded:
         logger.error("Token verification failed")
@@ -117,3 +128,22 @@ async def get_current_user_email(user: Dict[str, Any] = Depends(require_auth)) -
         )
 
     return email
+
+
+async def require_admin_key(x_admin_key: str = Header(None)) -> None:
+    """
+    Dependency for operational endpoints, guarded by a shared ADMIN_API_KEY.
+
+    Raises:
+        HTTPException: 404 if ADMIN_API_KEY is not configured, 403 if the
+            X-Admin-Key header doesn't match
+    """
+    admin_key = os.getenv("ADMIN_API_KEY", "")
+    if not admin_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, admin_key):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
@@ -0,0 +1,197 @@
+"""
+In-process response cache for catalog endpoints.
+
+Categories, families, specialties and the insurance carrier list only change
+when the BigQuery -> Postgres sync runs, so their rendered JSON bodies are
+cached per instance:
+
+- ``TTLCache``: bounded LRU with a per-entry TTL (CATALOG_CACHE_SIZE entries,
+  CATALOG_CACHE_TTL seconds).
+- ``cached_response(request, key, loader)``: serves a cached body, or awaits
+  ``loader()`` and renders it once. Every response carries a strong ETag
+  (SHA-256 of the body) and ``Cache-Control: public, max-age=...``; a request
+  whose ``If-None-Match`` matches gets an empty 304. Errors raised by the
+  loader (e.g. 404) are not cached.
+
+Invalidation:
+
+- The sync job bumps ``data_version.version`` when it finishes. Each
+  instance reads it at most every DATA_VERSION_CHECK_INTERVAL seconds and
+  clears the cache when it changes.
+- ``POST /api/v1/admin/cache/invalidate`` clears the instance that serves it.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.responses import render_json
+from app.middleware.logging import log_structured
+
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "1024"))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "3600"))
+# How long browsers/CDNs may reuse a catalog response without revalidating
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+DATA_VERSION_CHECK_INTERVAL = float(os.getenv("DATA_VERSION_CHECK_INTERVAL", "30"))
+
+
+class TTLCache:
+    """LRU cache with a fixed time-to-live per entry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drop every entry (or those whose string key starts with ``prefix``)."""
+        if prefix is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+        keys = [k for k in self._entries if isinstance(k, str) and k.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+
+
+class DataVersionWatcher:
+    """Clears a cache when the ``data_version`` row written by the sync job changes."""
+
+    def __init__(self, cache: TTLCache, interval: float = DATA_VERSION_CHECK_INTERVAL):
+        self.cache = cache
+        self.interval = interval
+        self.version: Optional[int] = None
+        self._next_check = 0.0
+
+    async def check(self, supabase) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        # Claim the check before awaiting so concurrent requests don't repeat it
+        self._next_check = now + self.interval
+
+        try:
+            result = await (
+                supabase.table("data_version").select("version").eq("id", 1).limit(1).execute()
+            )
+        except Exception as e:
+            log_structured(
+                "WARNING", "Could not read data_version", error=str(e), event_type="data_version"
+            )
+            return
+        if not result.data:
+            return
+
+        version = result.data[0]["version"]
+        if self.version is not None and version != self.version:
+            cleared = self.cache.invalidate()
+            log_structured(
+                "INFO",
+                "Data version changed, catalog cache cleared",
+                event_type="data_version",
+                previous_version=self.version,
+                version=version,
+                cleared_entries=cleared,
+            )
+        self.version = version
+
+
+catalog_cache = TTLCache(max_size=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL)
+data_version = DataVersionWatcher(catalog_cache)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    supabase=None,
+    max_age: int = CATALOG_CACHE_MAX_AGE,
+) -> Response:
+    """
+    Serve ``key`` from the catalog cache with ETag/Cache-Control headers.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        key: Cache key, e.g. ``"categories"`` or ``"families:x-ray"``
+        loader: Coroutine function returning the response model on a miss
+        supabase: Client used to poll data_version; None skips the check
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        200 JSON response, or 304 if the client's copy is current
+    """
+    if supabase is not None:
+        await data_version.check(supabase)
+
+    cached = catalog_cache.get(key)
+    if cached is None:
+        body = render_json(await loader())
+        cached = CachedBody(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        catalog_cache.set(key, cached)
+
+    headers = {"ETag": cached.etag, "Cache-Control": f"public, max-age={max_age}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,152 @@
+"""
+Loading for in-process indexes over the catalog.
+
+Search and typeahead match text against small catalog tables (procedures,
+billing codes, specialties, hospitals) that only change when the sync job
+runs. Each index is built from one corpus RPC and kept in memory:
+
+- built on first use, by whichever request needs it first (or warm-up);
+- the ``data_version`` row is polled like the catalog cache does, and the
+  index is rebuilt once the version changes or ``SEARCH_INDEX_TTL`` passes;
+- concurrent builds share one upstream call (single-flight);
+- a failed build keeps serving the previous index, and the next attempt
+  waits ``SEARCH_INDEX_RETRY`` seconds;
+- indexes that serve location requests (ZIP geocoder, provider locations)
+  are also built at startup by ``preload_indexes``;
+- with ``build_in_thread``, the build itself runs in a worker thread so a
+  large corpus does not stall the event loop.
+
+Environment:
+    SEARCH_INDEX_TTL    seconds before an index is rebuilt regardless (default 3600)
+    SEARCH_INDEX_RETRY  seconds between build attempts after a failure (default 60)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Generic, Optional, Sized, TypeVar
+
+from app.core import cache
+from app.core.dependencies import get_supabase
+from app.core.singleflight import upstream_calls
+from app.middleware.logging import log_structured
+
+SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", "3600"))
+SEARCH_INDEX_RETRY = float(os.getenv("SEARCH_INDEX_RETRY", "60"))
+
+I = TypeVar("I", bound=Sized)
+
+
+class CatalogIndexLoader(Generic[I]):
+    """Builds an index from a corpus RPC and rebuilds it when the catalog changes."""
+
+    def __init__(
+        self,
+        name: str,
+        rpc: str,
+        build: Callable[[Any], I],
+        ttl: float = SEARCH_INDEX_TTL,
+        retry: float = SEARCH_INDEX_RETRY,
+        build_in_thread: bool = False,
+    ):
+        self.name = name
+        self.rpc = rpc
+        self.build = build
+        self.ttl = ttl
+        self.retry = retry
+        self.build_in_thread = build_in_thread
+        self.index: Optional[I] = None
+        self.version: Optional[int] = None
+        self.built_at: Optional[float] = None
+        self.build_ms: Optional[float] = None
+        self.builds = 0
+        self.failures = 0
+        self._retry_at = 0.0
+
+    def stale(self, now: float) -> bool:
+        if self.index is None or self.built_at is None:
+            return True
+        if now - self.built_at > self.ttl:
+            return True
+        version = cache.data_version.version
+        return version is not None and version != self.version
+
+    async def get(self, supabase) -> Optional[I]:
+        """Current index, (re)building it first when needed; None if never built."""
+        await cache.data_version.check(supabase)
+        now = time.monotonic()
+        if self.stale(now) and now >= self._retry_at:
+            try:
+                await upstream_calls.do((self.rpc,), lambda: self._build(supabase))
+            except Exception as e:
+                self.failures += 1
+                self._retry_at = time.monotonic() + self.retry
+                log_structured(
+                    "WARNING",
+                    "Could not build catalog index",
+                    event_type="catalog_index",
+                    index=self.name,
+                    error_type=type(e).__name__,
+                    error=str(e),
+                    serving_previous=self.index is not None,
+                )
+        return self.index
+
+    async def _load(self, supabase) -> Any:
+        """The corpus the index is built from."""
+        result = await supabase.rpc(self.rpc, {}).execute()
+        return result.data
+
+    async def _build(self, supabase) -> None:
+        version = cache.data_version.version
+        data = await self._load(supabase)
+        if not data:
+            raise ValueError(f"{self.rpc} returned no rows")
+
+        start = time.perf_counter()
+        if self.build_in_thread:
+            index = await asyncio.to_thread(self.build, data)
+        else:
+            index = self.build(data)
+        self.build_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.index = index
+        self.version = version
+        self.built_at = time.monotonic()
+        self.builds += 1
+        log_structured(
+            "INFO",
+            "Catalog index built",
+            event_type="catalog_index",
+            index=self.name,
+            entries=len(index),
+            build_ms=self.build_ms,
+            data_version=version,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.index) if self.index is not None else 0,
+            "data_version": self.version,
+            "age_seconds": (
+                round(time.monotonic() - self.built_at, 1) if self.built_at is not None else None
+            ),
+            "build_ms": self.build_ms,
+            "builds": self.builds,
+            "failures": self.failures,
+        }
+
+
+async def preload_indexes(*loaders: CatalogIndexLoader) -> None:
+    """Build indexes at startup so the first requests don't wait for them."""
+    try:
+        supabase = await get_supabase()
+        for loader in loaders:
+            await loader.get(supabase)
+    except Exception as e:
+        log_structured(
+            "WARNING",
+            "Could not preload catalog indexes",
+            event_type="catalog_index",
+            error_type=type(e).__name__,
+            error=str(e),
+        )
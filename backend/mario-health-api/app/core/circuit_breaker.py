@@ -0,0 +1,271 @@
+"""
+Circuit breakers and retry budgets for upstream (Supabase) reads.
+
+Reads of each class (``search`` and ``detail``, see app/core/concurrency.py)
+go through a ``CircuitBreaker``:
+
+- closed: calls go through. Outcomes are counted in a rolling window of
+  ``CIRCUIT_WINDOW`` seconds. When at least ``CIRCUIT_MIN_CALLS`` calls were
+  made and the share of failures reaches ``CIRCUIT_FAILURE_RATE``, the
+  circuit opens.
+- open: calls fail immediately with ``CircuitOpen``, a 503 with
+  Retry-After, instead of each waiting out a timeout. Read endpoints then
+  serve their last good response (app/middleware/stale.py).
+- half-open: after ``CIRCUIT_OPEN_SECONDS``, up to ``CIRCUIT_HALF_OPEN_PROBES``
+  calls are let through as probes. If they all succeed the circuit closes;
+  one failure opens it again.
+
+Only congestion-type errors count as failures (timeouts, connection errors,
+pooler and statement-timeout errors; see ``is_overload_error``); a bad query
+is the caller's problem, not the upstream's. Load shed locally by the
+concurrency limiter doesn't count either.
+
+A failed read is retried once while the circuit is closed, if the class's
+retry budget allows it. Each call deposits ``RETRY_BUDGET_RATIO`` of a token
+and each retry spends one. Retries therefore add at most about 10% load,
+even when every call is failing, which keeps them from amplifying a
+brownout. Writes are never retried or broken here.
+
+Environment:
+    CIRCUIT_BREAKER            true/false (default true)
+    CIRCUIT_FAILURE_RATE       failure share that opens the circuit (default 0.5)
+    CIRCUIT_MIN_CALLS          calls in the window before it can open (default 20)
+    CIRCUIT_WINDOW             rolling window in seconds (default 10)
+    CIRCUIT_OPEN_SECONDS       time open before probing (default 5)
+    CIRCUIT_HALF_OPEN_PROBES   probe calls in half-open state (default 3)
+    RETRY_BUDGET_RATIO         retry tokens earned per call (default 0.1)
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.concurrency import is_overload_error
+from app.middleware.logging import log_structured
+
+CIRCUIT_BREAKER = os.getenv("CIRCUIT_BREAKER", "true").lower() == "true"
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "20"))
+CIRCUIT_WINDOW = float(os.getenv("CIRCUIT_WINDOW", "10"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "5"))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "3"))
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))
+
+# Tokens a retry budget starts with and can save up
+RETRY_BUDGET_MAX = 10.0
+# Upper bound of the random delay before a retry
+RETRY_JITTER_SECONDS = 0.05
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+class CircuitOpen(HTTPException):
+    """Raised instead of calling upstream while a circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail="Service temporarily unavailable",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        self.name = name
+
+
+class RetryBudget:
+    """Token bucket: each call earns ``ratio`` of a retry, each retry spends one."""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens < 1:
+            self.exhausted += 1
+            return False
+        self.tokens -= 1
+        self.retries += 1
+        return True
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker with half-open probing and a retry budget."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = CIRCUIT_FAILURE_RATE,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window: float = CIRCUIT_WINDOW,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES,
+        retry_budget: RetryBudget | None = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.retry_budget = retry_budget or RetryBudget()
+        self.state = CLOSED
+        self._opened_at = 0.0
+        # Per-second buckets of [second, successes, failures]
+        self._buckets: Deque[List[int]] = deque()
+        self._probes_inflight = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.short_circuited = 0
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()`` through the breaker, retrying once within budget."""
+        probe = self._before_call()
+        self.retry_budget.deposit()
+        retried = False
+        while True:
+            try:
+                result = await fn()
+            except HTTPException:
+                # Shed or short-circuited locally: says nothing about upstream health
+                self._release_probe(probe)
+                raise
+            except Exception as e:
+                if not is_overload_error(e):
+                    self._on_success(probe)  # upstream answered; the query was bad
+                    raise
+                if not probe and not retried and self.state == CLOSED and self.retry_budget.try_withdraw():
+                    retried = True
+                    await asyncio.sleep(random.uniform(0, RETRY_JITTER_SECONDS))
+                    continue
+                self._on_failure(probe, e)
+                raise
+            except BaseException:
+                self._release_probe(probe)
+                raise
+            self._on_success(probe)
+            return result
+
+    def _before_call(self) -> bool:
+        """Raise CircuitOpen if calls are short-circuited; True for a probe call."""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self.short_circuited += 1
+                raise CircuitOpen(self.name, remaining)
+            self.state = HALF_OPEN
+            self._probes_inflight = 0
+            self._probe_successes = 0
+
+        if self.state == HALF_OPEN:
+            if self._probes_inflight + self._probe_successes >= self.half_open_probes:
+                self.short_circuited += 1
+                raise CircuitOpen(self.name, self.open_seconds)
+            self._probes_inflight += 1
+            return True
+        return False
+
+    def _release_probe(self, probe: bool) -> None:
+        if probe:
+            self._probes_inflight -= 1
+
+    def _on_success(self, probe: bool) -> None:
+        if probe:
+            self._probes_inflight -= 1
+            self._probe_successes += 1
+            if self.state == HALF_OPEN and self._probe_successes >= self.half_open_probes:
+                self._close()
+            return
+        self._record(ok=True)
+
+    def _on_failure(self, probe: bool, error: BaseException) -> None:
+        if probe:
+            self._probes_inflight -= 1
+            if self.state == HALF_OPEN:
+                self._open(error)
+            return
+        self._record(ok=False)
+        if self.state != CLOSED:
+            return
+        successes, failures = self._counts()
+        total = successes + failures
+        if total >= self.min_calls and failures / total >= self.failure_rate:
+            self._open(error)
+
+    def _record(self, ok: bool) -> None:
+        second = int(time.monotonic())
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        self._buckets[-1][1 if ok else 2] += 1
+
+    def _counts(self) -> tuple:
+        horizon = time.monotonic() - self.window
+        while self._buckets and self._buckets[0][0] < horizon:
+            self._buckets.popleft()
+        return (
+            sum(bucket[1] for bucket in self._buckets),
+            sum(bucket[2] for bucket in self._buckets),
+        )
+
+    def _open(self, error: BaseException) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+        log_structured(
+            severity="WARNING",
+            message=f"Circuit opened: {self.name}",
+            event_type="circuit_breaker",
+            circuit=self.name,
+            error_type=type(error).__name__,
+            error_message=str(error),
+        )
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._buckets.clear()
+        log_structured(
+            severity="INFO",
+            message=f"Circuit closed: {self.name}",
+            event_type="circuit_breaker",
+            circuit=self.name,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        successes, failures = self._counts()
+        return {
+            "state": self.state,
+            "window_calls": successes + failures,
+            "window_failures": failures,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+            "retries": self.retry_budget.retries,
+            "retry_budget_exhausted": self.retry_budget.exhausted,
+            "retry_tokens": round(self.retry_budget.tokens, 2),
+        }
+
+
+upstream_breakers: Dict[str, CircuitBreaker] = {
+    "search": CircuitBreaker("search"),
+    "detail": CircuitBreaker("detail"),
+}
+
+
+def breaker_for(call_class: str) -> CircuitBreaker | None:
+    """The breaker for reads of a class (None for writes, corpus loads or when disabled)."""
+    if not CIRCUIT_BREAKER:
+        return None
+    return upstream_breakers.get(call_class)
@@ -0,0 +1,257 @@
+"""
+Adaptive concurrency limits and load shedding in front of Supabase.
+
+Every instrumented upstream call (app/core/instrumentation.py) takes a slot
+from the limiter of its class before it is sent:
+
+- ``search``: search RPCs (``search_*``), the most expensive queries;
+- ``detail``: every other read (detail RPCs, catalog and table reads);
+- ``write``: user writes (insert/update/upsert/delete);
+- ``bulk``: the corpus RPCs in-memory indexes are built from
+  (``CORPUS_RPCS``), which are slow by design and must not shrink the
+  ``detail`` limit.
+
+Each limit adapts with AIMD. A call that completes within the class's
+latency target adds ``1/limit`` to the limit while the limit is in use,
+so the limit grows by about one per round trip. A call that fails with a
+timeout or connection error, or that is slower than the target while at
+least ``SATURATION`` of the limit was in use, multiplies the limit by
+``BACKOFF``. A slow call on an idle limiter says nothing about the
+pooler's capacity, so it leaves the limit alone. Decreases happen at most once per target-latency
+window, so one burst of slow calls counts as a single congestion signal.
+The limit therefore settles near the concurrency the pooler can serve at
+the target latency.
+
+Calls over the limit wait in a bounded FIFO queue. When the queue is full,
+or a call has waited ``UPSTREAM_LIMIT_QUEUE_TIMEOUT`` seconds, the call
+fails fast with ``UpstreamOverloaded``. That is an ``HTTPException`` (503
+with ``Retry-After``), so it passes through the services' HTTPException
+handlers unchanged.
+
+Environment:
+    UPSTREAM_LIMITER               true/false (default true)
+    UPSTREAM_LIMIT_SEARCH          max concurrent search RPCs (default 40)
+    UPSTREAM_LIMIT_DETAIL          max concurrent reads (default 80)
+    UPSTREAM_LIMIT_WRITE           max concurrent writes (default 20)
+    UPSTREAM_LIMIT_BULK            max concurrent corpus RPCs (default 4)
+    UPSTREAM_LIMIT_QUEUE_SIZE      max queued calls per class (default 100)
+    UPSTREAM_LIMIT_QUEUE_TIMEOUT   seconds a call may queue (default 0.5)
+    UPSTREAM_LIMIT_RETRY_AFTER     Retry-After seconds on 503 (default 1)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+import httpx
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+UPSTREAM_LIMITER = os.getenv("UPSTREAM_LIMITER", "true").lower() == "true"
+UPSTREAM_LIMIT_QUEUE_SIZE = int(os.getenv("UPSTREAM_LIMIT_QUEUE_SIZE", "100"))
+UPSTREAM_LIMIT_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_LIMIT_QUEUE_TIMEOUT", "0.5"))
+UPSTREAM_LIMIT_RETRY_AFTER = int(os.getenv("UPSTREAM_LIMIT_RETRY_AFTER", "1"))
+
+# Multiplicative decrease applied on a congestion signal
+BACKOFF = 0.9
+
+# Share of the limit in use at which a slow call counts as congestion
+SATURATION = 0.5
+
+# PostgREST/Postgres errors that mean "overloaded" rather than "bad query":
+# pooler connection errors, statement timeout, too many connections, plus
+# SQLSTATE classes 08 (connection exception) and 57P (server shutting down)
+OVERLOAD_ERROR_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003", "57014", "53300"}
+OVERLOAD_ERROR_CLASSES = ("08", "57P")
+
+
+class UpstreamOverloaded(HTTPException):
+    """Raised instead of queueing further when an upstream class is saturated."""
+
+    def __init__(self, upstream_class: str, reason: str, retry_after: int = UPSTREAM_LIMIT_RETRY_AFTER):
+        super().__init__(
+            status_code=503,
+            detail="Service is busy, please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.upstream_class = upstream_class
+        self.reason = reason
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether a failed call is a congestion signal (vs. a bad query or a bug)."""
+    if isinstance(error, APIError):
+        code = getattr(error, "code", None) or ""
+        return code in OVERLOAD_ERROR_CODES or code.startswith(OVERLOAD_ERROR_CLASSES)
+    return isinstance(error, (TimeoutError, OSError, httpx.TransportError))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        min_limit: int = 2,
+        initial_limit: int = 0,
+        latency_target: float = 0.5,
+        queue_size: int = UPSTREAM_LIMIT_QUEUE_SIZE,
+        queue_timeout: float = UPSTREAM_LIMIT_QUEUE_TIMEOUT,
+        retry_after: int = UPSTREAM_LIMIT_RETRY_AFTER,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(initial_limit or max(self.min_limit, max_limit // 2))
+        self.latency_target = latency_target
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.calls = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        self.decreases = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of an upstream call."""
+        await self.acquire()
+        loaded = self.inflight >= self.limit * SATURATION
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            elapsed = time.perf_counter() - start
+            slow = loaded and elapsed > self.latency_target
+            self.release(elapsed, congested=slow or is_overload_error(e))
+            raise
+        else:
+            elapsed = time.perf_counter() - start
+            self.release(elapsed, congested=loaded and elapsed > self.latency_target)
+
+    async def acquire(self) -> None:
+        self.calls += 1
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self._reject("queue_full")
+
+        self.queued += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # The slot is counted in inflight by _wake() before it resolves the waiter
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the caller went away: hand it on
+                self.inflight -= 1
+                self._wake()
+            else:
+                self._discard(waiter)
+            raise
+
+    def release(self, latency: float, congested: bool = False) -> None:
+        self.inflight -= 1
+        if congested:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(float(self.min_limit), self.limit * BACKOFF)
+                self._last_decrease = now
+                self.decreases += 1
+        elif latency <= self.latency_target and self.inflight + 1 >= int(self.limit):
+            # Only grow while the limit is actually what bounds concurrency
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _reject(self, reason: str) -> None:
+        self.rejected[reason] += 1
+        raise UpstreamOverloaded(self.name, reason, self.retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target_seconds": self.latency_target,
+            "inflight": self.inflight,
+            "queue_depth": len(self._waiters),
+            "calls": self.calls,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "decreases": self.decreases,
+        }
+
+
+upstream_limiters: Dict[str, AdaptiveLimiter] = {
+    "search": AdaptiveLimiter(
+        "search", int(os.getenv("UPSTREAM_LIMIT_SEARCH", "40")), latency_target=1.0
+    ),
+    "detail": AdaptiveLimiter(
+        "detail", int(os.getenv("UPSTREAM_LIMIT_DETAIL", "80")), latency_target=0.5
+    ),
+    "write": AdaptiveLimiter(
+        "write", int(os.getenv("UPSTREAM_LIMIT_WRITE", "20")), latency_target=0.5
+    ),
+    "bulk": AdaptiveLimiter(
+        "bulk", int(os.getenv("UPSTREAM_LIMIT_BULK", "4")), latency_target=30.0
+    ),
+}
+
+
+# Search-path RPCs whose names don't start with "search_"
+SEARCH_RPCS = frozenset({"get_procedure_price_summaries"})
+
+# Corpus RPCs behind the in-memory indexes (app/core/catalog_index.py)
+CORPUS_RPCS = frozenset(
+    {
+        "get_procedure_search_corpus",
+        "get_suggestion_corpus",
+        "get_zip_centroids",
+        "get_provider_geo_corpus",
+    }
+)
+
+
+def upstream_class(kind: str, name: str, write: bool = False) -> str:
+    """Limiter class of an upstream call."""
+    if write:
+        return "write"
+    if kind == "rpc" and (name.startswith("search_") or name in SEARCH_RPCS):
+        return "search"
+    if kind == "rpc" and name in CORPUS_RPCS:
+        return "bulk"
+    return "detail"
+
+
+def limiter_for(call_class: str) -> AdaptiveLimiter | None:
+    """The limiter calls of a class must take a slot from (None when disabled)."""
+    if not UPSTREAM_LIMITER:
+        return None
+    return upstream_limiters[call_class]
@@ -1,22 +1,91 @@
-from supabase import create_client, Client
-from functools import lru_cache
+from supabase import AsyncClient, AsyncClientOptions
+from supabase_auth import AsyncMemoryStorage
+from typing import Optional
+import asyncio
 import os
+import httpx
 from dotenv import load_dotenv
 load_dotenv()
 
+from app.core.pg_backend import DATA_BACKEND, AsyncpgClient, get_pg_pool, close_pg_pool
+from app.core.instrumentation import InstrumentedClient
+
+# Connection pool sizing for the shared PostgREST transport.
+# Keep-alive connections are reused across requests so each RPC skips the
+# TCP/TLS handshake to Supabase.
+SUPABASE_HTTP_MAX_CONNECTIONS = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "100"))
+SUPABASE_HTTP_MAX_KEEPALIVE = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "20"))
+SUPABASE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "10"))
+
+_async_client: Optional[AsyncClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the pooled keep-alive HTTP transport shared by all requests."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(SUPABASE_HTTP_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=SUPABASE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_async_supabase_client() -> AsyncClient:
+    """Return the process-wide async Supabase client.
+
+    The client and its connection pool are bound to the running event loop,
+    so a new pair is created if the loop changes (e.g. between TestClient
+    sessions). In production uvicorn runs a single loop per worker.
+    """
+    global _async_client, _http_client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client is not None and _client_loop is loop:
+        return _async_client
 
-@lru_cache()
-def get_supabase_client() -> Client:
-    """Create cached Supabase client."""
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_KEY")
 
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
 
-    return create_client(url, key)
+    _http_client = _create_http_client()
+    _async_client = AsyncClient(
+        url,
+        key,
+        AsyncClientOptions(storage=AsyncMemoryStorage(), httpx_client=_http_client),
+    )
+    _client_loop = loop
+    return _async_client
+
+
+async def close_async_supabase_client() -> None:
+    """Close the pooled HTTP transport (called on application shutdown)."""
+    global _async_client, _http_client, _client_loop
+
+    if _http_client is not None:
+        await _http_client.aclose()
+
+    _async_client = None
+    _http_client = None
+    _client_loop = None
+    await close_pg_pool()
+
 
+async def get_supabase() -> AsyncClient:
+    """FastAPI dependency for the async Supabase client.
 
-async def get_supabase() -> Client:
-    """FastAPI dependency for Supabase client."""
-    return get_supabase_client()
+    With DATA_BACKEND=asyncpg the hot RPCs are served over a direct
+    Postgres pool; everything else still goes through PostgREST. Either way
+    every rpc()/table() call is instrumented (app/core/instrumentation.py).
+    """
+    client = get_async_supabase_client()
+    if DATA_BACKEND == "asyncpg":
+        client = AsyncpgClient(await get_pg_pool(), client)
+    return InstrumentedClient(client)
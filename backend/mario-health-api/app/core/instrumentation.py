@@ -0,0 +1,111 @@
+"""
+Instrumentation hook around every Supabase/Postgres call.
+
+``get_supabase`` hands services an ``InstrumentedClient``: a thin proxy whose
+``.rpc(name, ...)`` and ``.table(name)`` return query builders that behave
+exactly like the wrapped ones, except that ``execute()`` is timed and
+recorded under the RPC or table name (see app/core/metrics.py) and added as
+a span to the current request's trace (see app/core/tracing.py). Before it
+is sent, each call takes a slot from the adaptive concurrency limiter for
+its class (see app/core/concurrency.py); reads also go through the circuit
+breaker of their class, which may retry them (see app/core/circuit_breaker.py).
+
+Works the same over PostgREST and the asyncpg backend, and adds one small
+object per query.
+"""
+
+import time
+from typing import Any
+
+from app.core.circuit_breaker import breaker_for
+from app.core.concurrency import limiter_for, upstream_class
+from app.core.metrics import upstream_request_duration, upstream_requests_in_flight
+from app.core.tracing import Span, current_trace, payload_size
+
+
+class InstrumentedQuery:
+    """Proxy for a query builder that records its ``execute()``."""
+
+    __slots__ = ("_builder", "kind", "name", "write")
+
+    # Builder methods that turn a table query into a user write
+    WRITE_METHODS = frozenset({"insert", "update", "upsert", "delete"})
+
+    def __init__(self, builder: Any, kind: str, name: str, write: bool = False):
+        self._builder = builder
+        self.kind = kind
+        self.name = name
+        self.write = write
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._builder, attr)
+        if not callable(value):
+            return value
+
+        def chained(*args, **kwargs):
+            result = value(*args, **kwargs)
+            # Filters/modifiers return a builder; keep it wrapped
+            if hasattr(result, "execute"):
+                write = self.write or attr in self.WRITE_METHODS
+                return InstrumentedQuery(result, self.kind, self.name, write)
+            return result
+
+        return chained
+
+    async def execute(self) -> Any:
+        call_class = upstream_class(self.kind, self.name, self.write)
+        breaker = None if self.write else breaker_for(call_class)
+        if breaker is None:
+            return await self._limited(call_class)
+        return await breaker.call(lambda: self._limited(call_class))
+
+    async def _limited(self, call_class: str) -> Any:
+        limiter = limiter_for(call_class)
+        if limiter is None:
+            return await self._execute()
+        async with limiter.slot():
+            return await self._execute()
+
+    async def _execute(self) -> Any:
+        status = "error"
+        result = None
+        start = time.perf_counter()
+        upstream_requests_in_flight.inc()
+        try:
+            result = await self._builder.execute()
+            status = "ok"
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            upstream_requests_in_flight.dec()
+            upstream_request_duration.labels(self.kind, self.name, status).observe(elapsed)
+
+            trace = current_trace()
+            if trace is not None:
+                data = getattr(result, "data", None)
+                trace.add(
+                    Span(
+                        kind=self.kind,
+                        name=self.name,
+                        duration_ms=round(elapsed * 1000, 2),
+                        rows=len(data) if isinstance(data, list) else int(bool(data)),
+                        bytes=payload_size(data),
+                        status=status,
+                    )
+                )
+
+
+class InstrumentedClient:
+    """Supabase-compatible client proxy that instruments rpc()/table() calls."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def rpc(self, fn: str, *args, **kwargs) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), "rpc", fn)
+
+    def table(self, table_name: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.table(table_name), "table", table_name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
@@ -0,0 +1,151 @@
+"""
+Background writer for structured log entries.
+
+``log_structured`` hands each entry (a plain dict) to ``log_writer.submit``,
+which is a bounded, lock-free ``deque.append``. A daemon thread wakes every
+LOG_FLUSH_INTERVAL, drains the queue in batches, serializes them with
+orjson and writes each batch to stdout in a single call, so JSON encoding
+and the stdout syscall stay off the request path.
+
+When the queue is full new entries are dropped rather than blocking the
+request; the number dropped is reported with the next batch.
+
+Environment:
+    LOG_QUEUE_SIZE      max entries waiting to be written (default 10000)
+    LOG_BATCH_SIZE      max entries per write (default 256)
+    LOG_FLUSH_INTERVAL  seconds between writer wake-ups (default 0.2)
+"""
+
+import os
+import sys
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+    import json
+
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.2"))
+
+
+def serialize(entry: Dict[str, Any]) -> bytes:
+    """Encode one log entry as a JSON line (without the newline)."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(entry, default=str).encode()
+
+
+class _FlushMarker:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class StructuredLogWriter:
+    """Bounded queue + daemon thread that writes log entries in batches."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self._stream = stream
+        self._queue: deque = deque()
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        # Started lazily, and again in a forked worker (threads don't survive fork)
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="structured-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """Queue an entry for writing. Returns False if it was dropped."""
+        self._ensure_started()
+        # deque.append is atomic under the GIL; the length check is only a
+        # soft bound, which is all a drop-on-overload policy needs.
+        if len(self._queue) >= self.queue_size:
+            self.dropped += 1
+            return False
+        self._queue.append(entry)
+        return True
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return True
+        marker = _FlushMarker()
+        self._queue.append(marker)
+        self._wakeup.set()
+        return marker.done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            while self._queue:
+                batch: List[Any] = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(self._queue.popleft())
+                except IndexError:
+                    pass
+
+                entries = [e for e in batch if not isinstance(e, _FlushMarker)]
+                try:
+                    self._write(entries)
+                except Exception as e:  # never let a bad entry kill the writer
+                    sys.stderr.write(f"structured log writer error: {e}\n")
+                for marker in batch:
+                    if isinstance(marker, _FlushMarker):
+                        marker.done.set()
+
+    def _write(self, entries: List[Dict[str, Any]]) -> None:
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            entries.append(
+                {
+                    "severity": "WARNING",
+                    "message": "Log entries dropped (queue full)",
+                    "dropped": dropped,
+                }
+            )
+        if not entries:
+            return
+
+        payload = b"\n".join(serialize(e) for e in entries) + b"\n"
+        stream = self._stream or sys.stdout
+        buffer = getattr(stream, "buffer", None)
+        if buffer is not None:
+            stream.flush()
+            buffer.write(payload)
+            buffer.flush()
+        else:
+            stream.write(payload.decode())
+            stream.flush()
+        self.written += len(entries)
+
+
+log_writer = StructuredLogWriter()
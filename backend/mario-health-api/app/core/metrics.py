@@ -0,0 +1,355 @@
+"""
+Prometheus-style metrics, served at ``GET /metrics``.
+
+A small, dependency-free implementation of counters, gauges and histograms
+with labels, rendered in the Prometheus text exposition format (0.0.4).
+
+Recording is cheap enough to leave on at full traffic: ``labels(...)``
+is a dict lookup (children are created once per label set), a histogram
+observation is one ``bisect`` plus two additions, and nothing takes a
+lock. Observations are made on the event-loop thread; under the GIL a
+rare lost increment from another thread is acceptable for metrics.
+
+Values that already live elsewhere (cache hit/miss counters, single-flight
+stats) are read at scrape time by collectors registered with
+``registry.register_collector`` rather than being recorded twice.
+
+Metrics:
+    http_request_duration_seconds{method,route,status}   histogram
+    http_response_size_bytes{method,route}               histogram
+    http_requests_in_flight                              gauge
+    upstream_request_duration_seconds{kind,name,status}  histogram
+    upstream_requests_in_flight                          gauge
+    cache_hits_total / cache_misses_total / cache_hit_ratio{cache}
+    singleflight_calls_total / singleflight_merged_total / singleflight_inflight
+    upstream_concurrency_limit / _inflight / _queue_depth{class}
+    upstream_rejected_total{class,reason}
+    upstream_circuit_state{class} / upstream_circuit_opened_total{class}
+    upstream_retries_total{class} / stale_responses_served_total
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds, from a cache hit to the Supabase HTTP timeout
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Payload buckets in bytes, from a 304 to a large provider list
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Child for one label set, e.g. ``.labels("GET", "/health", "200")``."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def collect(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            yield from child.samples(self.name, dict(zip(self.labelnames, values)))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def samples(self, name: str, labels: Dict[str, str]) -> Iterable[Sample]:
+        yield name, labels, self.value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; stored per bucket, made cumulative on render
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: Dict[str, str]) -> Iterable[Sample]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            yield f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield f"{name}_sum", labels, self.sum
+        yield f"{name}_count", labels, cumulative
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors and renders them as text."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable) -> None:
+        """Add a function yielding ``(name, type, help, samples)`` at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name, type_name, documentation, samples):
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_name}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for metric in self._metrics:
+            family(metric.name, metric.type_name, metric.documentation, metric.collect())
+        for collector in self._collectors:
+            for name, type_name, documentation, samples in collector():
+                family(name, type_name, documentation, samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ("method", "route", "status"),
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route template",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+upstream_request_duration = registry.histogram(
+    "upstream_request_duration_seconds",
+    "Supabase/Postgres call latency by RPC or table name",
+    ("kind", "name", "status"),
+)
+upstream_requests_in_flight = registry.gauge(
+    "upstream_requests_in_flight", "Supabase/Postgres calls currently awaiting a response"
+)
+
+
+def _cache_collector():
+    # Imported here: the caches import the logging middleware, which records
+    # into this module
+    from app.auth.token_cache import token_cache
+    from app.core.cache import catalog_cache
+    from app.core.result_cache import search_cache
+
+    caches = {
+        "catalog": catalog_cache.stats(),
+        "search": search_cache.stats(),
+        "token": token_cache.stats(),
+    }
+    for field, name, type_name, documentation in (
+        ("hits", "cache_hits_total", "counter", "Cache hits (search includes stale hits)"),
+        ("misses", "cache_misses_total", "counter", "Cache misses"),
+        ("hit_rate", "cache_hit_ratio", "gauge", "Hits / lookups since start"),
+    ):
+        samples = []
+        for cache_name, stats in caches.items():
+            value = stats[field]
+            if cache_name == "search" and field == "hits":
+                value += stats["stale_hits"]
+            samples.append((name, {"cache": cache_name}, value))
+        yield name, type_name, documentation, samples
+
+
+def _singleflight_collector():
+    from app.core.singleflight import upstream_calls
+
+    stats = upstream_calls.stats()
+    yield (
+        "singleflight_calls_total",
+        "counter",
+        "Upstream calls requested through single-flight",
+        [("singleflight_calls_total", {}, stats["calls"])],
+    )
+    yield (
+        "singleflight_merged_total",
+        "counter",
+        "Calls that joined an identical call already in flight",
+        [("singleflight_merged_total", {}, stats["merged"])],
+    )
+    yield (
+        "singleflight_inflight",
+        "gauge",
+        "Distinct upstream calls currently in flight",
+        [("singleflight_inflight", {}, stats["inflight"])],
+    )
+
+
+def _limiter_collector():
+    from app.core.concurrency import upstream_limiters
+
+    stats = {name: limiter.stats() for name, limiter in upstream_limiters.items()}
+    for field, name, documentation in (
+        ("limit", "upstream_concurrency_limit", "Current adaptive concurrency limit"),
+        ("inflight", "upstream_concurrency_inflight", "Calls holding a limiter slot"),
+        ("queue_depth", "upstream_concurrency_queue_depth", "Calls waiting for a limiter slot"),
+    ):
+        yield name, "gauge", documentation, [
+            (name, {"class": cls}, s[field]) for cls, s in stats.items()
+        ]
+    yield (
+        "upstream_rejected_total",
+        "counter",
+        "Calls shed with a 503 because their class was saturated",
+        [
+            ("upstream_rejected_total", {"class": cls, "reason": reason}, count)
+            for cls, s in stats.items()
+            for reason, count in s["rejected"].items()
+        ],
+    )
+
+
+def _breaker_collector():
+    from app.core.circuit_breaker import OPEN, HALF_OPEN, upstream_breakers
+    from app.middleware.stale import stale_responses
+
+    states = {OPEN: 2, HALF_OPEN: 1}
+    stats = {name: breaker.stats() for name, breaker in upstream_breakers.items()}
+    yield (
+        "upstream_circuit_state",
+        "gauge",
+        "Circuit state: 0 closed, 1 half-open, 2 open",
+        [("upstream_circuit_state", {"class": cls}, states.get(s["state"], 0)) for cls, s in stats.items()],
+    )
+    for field, name, documentation in (
+        ("opened", "upstream_circuit_opened_total", "Times the circuit opened"),
+        ("short_circuited", "upstream_short_circuited_total", "Calls failed fast by an open circuit"),
+        ("retries", "upstream_retries_total", "Failed reads retried within the retry budget"),
+    ):
+        yield name, "counter", documentation, [(name, {"class": cls}, s[field]) for cls, s in stats.items()]
+    yield (
+        "stale_responses_served_total",
+        "counter",
+        "Last good responses served while upstream was unavailable",
+        [("stale_responses_served_total", {}, stale_responses.hits)],
+    )
+
+
+registry.register_collector(_cache_collector)
+registry.register_collector(_singleflight_collector)
+registry.register_collector(_limiter_collector)
+registry.register_collector(_breaker_collector)
@@ -0,0 +1,174 @@
+"""
+Direct Postgres read path for the hot RPCs.
+
+Selected with ``DATA_BACKEND=asyncpg``. The adapter exposes the same
+``rpc(...).execute()`` / ``table(...)`` surface as the Supabase AsyncClient,
+so service classes are unchanged:
+
+- ``search_procedures_v2``/``_v3``, ``get_procedure_price_summaries``,
+  ``get_procedure_detail``, ``get_provider_detail`` and
+  ``get_procedures_with_pricing`` run over an asyncpg pool. asyncpg
+  prepares each statement once per connection and reuses it from its
+  statement cache, so repeat calls skip parsing/planning and the
+  PostgREST HTTP + JSON round-trip.
+- Every other RPC and all ``table()`` queries fall through to PostgREST.
+
+DATABASE_URL must point at a session-mode connection (Supabase direct
+connection or session pooler on port 5432). The transaction-mode pooler
+(port 6543) does not support prepared statements; set
+PG_STATEMENT_CACHE_SIZE=0 if it has to be used.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from postgrest import APIError, APIResponse
+
+DATA_BACKEND = os.getenv("DATA_BACKEND", "postgrest").lower()
+PG_POOL_MIN_SIZE = int(os.getenv("PG_POOL_MIN_SIZE", "2"))
+PG_POOL_MAX_SIZE = int(os.getenv("PG_POOL_MAX_SIZE", "10"))
+PG_STATEMENT_CACHE_SIZE = int(os.getenv("PG_STATEMENT_CACHE_SIZE", "100"))
+PG_COMMAND_TIMEOUT = float(os.getenv("PG_COMMAND_TIMEOUT", "10"))
+
+
+@dataclass(frozen=True)
+class PreparedRpc:
+    """A database function served directly over asyncpg."""
+
+    name: str
+    args: Tuple[str, ...]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def sql(self) -> str:
+        named_args = ", ".join(
+            f"{arg} => ${position}" for position, arg in enumerate(self.args, start=1)
+        )
+        return f"SELECT * FROM {self.name}({named_args})"
+
+    def bind(self, params: Dict[str, Any]) -> list:
+        return [params.get(arg, self.defaults.get(arg)) for arg in self.args]
+
+
+PREPARED_RPCS: Dict[str, PreparedRpc] = {
+    rpc.name: rpc
+    for rpc in (
+        PreparedRpc(
+            "search_procedures_v2",
+            ("search_query", "zip_code_input", "radius_miles"),
+            {"zip_code_input": None, "radius_miles": 25},
+        ),
+        PreparedRpc(
+            "search_procedures_v3",
+            ("search_query", "zip_code_input", "radius_miles"),
+            {"zip_code_input": None, "radius_miles": 25},
+        ),
+        PreparedRpc(
+            "get_procedure_price_summaries",
+            ("procedure_ids", "zip_code_input", "radius_miles"),
+            {"zip_code_input": None, "radius_miles": 25},
+        ),
+        PreparedRpc("get_procedure_detail", ("procedure_slug_input",)),
+        PreparedRpc("get_provider_detail", ("provider_id_input",)),
+        PreparedRpc("get_procedures_with_pricing", ("family_slug_input",)),
+    )
+}
+
+_pool = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def get_pg_pool():
+    """Return the process-wide asyncpg pool, creating it on first use."""
+    global _pool, _pool_loop, _pool_lock
+
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop:
+        return _pool
+
+    if _pool_lock is None or _pool_loop is not loop:
+        _pool_lock = asyncio.Lock()
+        _pool_loop = loop
+        _pool = None
+
+    async with _pool_lock:
+        if _pool is None:
+            # Imported lazily: asyncpg is only needed when DATA_BACKEND=asyncpg
+            import asyncpg
+
+            dsn = os.getenv("DATABASE_URL")
+            if not dsn:
+                raise ValueError("DATABASE_URL must be set when DATA_BACKEND=asyncpg")
+
+            _pool = await asyncpg.create_pool(
+                dsn,
+                min_size=PG_POOL_MIN_SIZE,
+                max_size=PG_POOL_MAX_SIZE,
+                statement_cache_size=PG_STATEMENT_CACHE_SIZE,
+                command_timeout=PG_COMMAND_TIMEOUT,
+            )
+    return _pool
+
+
+async def close_pg_pool() -> None:
+    """Close the asyncpg pool (called on application shutdown)."""
+    global _pool, _pool_loop, _pool_lock
+
+    if _pool is not None:
+        await _pool.close()
+
+    _pool = None
+    _pool_loop = None
+    _pool_lock = None
+
+
+class PreparedRpcCall:
+    """Awaitable stand-in for a PostgREST RPC request builder."""
+
+    def __init__(self, pool, rpc: PreparedRpc, params: Dict[str, Any]):
+        self.pool = pool
+        self.rpc = rpc
+        self.params = params
+
+    async def execute(self) -> APIResponse:
+        import asyncpg
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(self.rpc.sql, *self.rpc.bind(self.params))
+        except asyncpg.PostgresError as e:
+            # Surface database errors the same way PostgREST does so the
+            # services' existing APIError handling keeps working.
+            raise APIError(
+                {
+                    "message": str(e),
+                    "code": getattr(e, "sqlstate", None),
+                    "hint": getattr(e, "hint", None),
+                    "details": getattr(e, "detail", None),
+                }
+            )
+
+        return APIResponse(data=[dict(row) for row in rows], count=None)
+
+
+class AsyncpgClient:
+    """Supabase-compatible client serving the hot RPCs from asyncpg."""
+
+    def __init__(self, pool, postgrest_client):
+        self.pool = pool
+        self.postgrest_client = postgrest_client
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        prepared = PREPARED_RPCS.get(fn)
+        if prepared is None:
+            return self.postgrest_client.rpc(fn, params or {}, *args, **kwargs)
+        return PreparedRpcCall(self.pool, prepared, params or {})
+
+    def table(self, table_name: str):
+        return self.postgrest_client.table(table_name)
+
+    def __getattr__(self, name: str):
+        return getattr(self.postgrest_client, name)
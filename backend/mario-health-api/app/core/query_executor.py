@@ -0,0 +1,75 @@
+"""
+Concurrent execution of independent upstream queries.
+
+Services create one executor per request and hand it every lookup that
+does not depend on another one's result. The lookups run concurrently, so
+the request pays the slowest round-trip instead of the sum of them, and
+per-call timings are logged for the whole request.
+
+    qx = QueryExecutor("provider_detail")
+    detail, procedures = await qx.gather(
+        get_provider_detail=self.supabase.rpc(...).execute(),
+        get_provider_procedures=self.supabase.rpc(...).execute(),
+    )
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List
+
+from app.middleware.logging import log_structured
+
+
+class QueryExecutor:
+    """Request-scoped runner that executes named queries concurrently."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    async def _timed(self, name: str, query: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await query
+        except Exception as e:
+            self.errors[name] = type(e).__name__
+            raise
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def gather(
+        self, *, return_exceptions: bool = False, **queries: Awaitable[Any]
+    ) -> List[Any]:
+        """Run ``queries`` concurrently and return results in argument order.
+
+        With ``return_exceptions=True`` a failing query yields its exception
+        in place of a result, so callers can degrade per query (e.g. optional
+        pricing). Otherwise the first failure cancels the remaining queries
+        and is re-raised.
+        """
+        start = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self._timed(name, query))
+            for name, query in queries.items()
+        ]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            self._log(list(queries), round((time.perf_counter() - start) * 1000, 2))
+
+    def _log(self, names: List[str], wall_ms: float) -> None:
+        timings = {name: self.timings.get(name) for name in names}
+        log_structured(
+            severity="DEBUG",
+            message=f"Upstream queries: {self.label}",
+            label=self.label,
+            wall_ms=wall_ms,
+            sum_ms=round(sum(t for t in timings.values() if t is not None), 2),
+            query_timings_ms=timings,
+            query_errors={n: e for n, e in self.errors.items() if n in timings} or None,
+        )
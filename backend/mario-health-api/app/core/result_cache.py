@@ -0,0 +1,281 @@
+"""
+Shared result cache for expensive RPCs (search).
+
+``ResultCache`` stores the raw rows an RPC returned, serialized with orjson,
+in a pluggable backend:
+
+- ``MemoryBackend``: bounded LRU in this process (default).
+- ``RedisBackend``: any Redis-protocol server via ``redis.asyncio``, so all
+  API instances share hits instead of each warming its own.
+
+Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds
+they are still served, but the first request to see a stale entry starts a
+background refresh (stale-while-revalidate); a short lock in the backend
+keeps other requests and instances from refreshing the same key at once.
+Backend errors are logged and treated as misses, so Redis being down only
+costs the cache. NUMERIC values (``Decimal`` from the asyncpg backend) are
+stored as JSON numbers, as PostgREST returns them.
+
+Environment:
+    SEARCH_CACHE_BACKEND    memory | redis | none (default memory)
+    SEARCH_CACHE_TTL        seconds an entry is fresh (default 60)
+    SEARCH_CACHE_STALE_TTL  seconds a stale entry may be served (default 300)
+    SEARCH_CACHE_SIZE       max entries for the memory backend (default 10000)
+    REDIS_URL               redis://host:port/db for the redis backend
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import orjson
+
+from app.middleware.logging import log_structured
+
+SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "memory").lower()
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "60"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "300"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# How long one refresh may hold a key's refresh lock
+REFRESH_LOCK_SECONDS = 10
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = SEARCH_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._locks: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        now = time.monotonic()
+        if self._locks.get(key, 0.0) > now:
+            return False
+        self._locks[key] = now + ttl
+        return True
+
+    async def unlock(self, key: str) -> None:
+        self._locks.pop(key, None)
+
+    async def clear(self, prefix: str = "") -> None:
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+        for key in [k for k in self._locks if k.startswith(prefix)]:
+            del self._locks[key]
+
+
+class RedisBackend:
+    """Redis-protocol backend (Redis, Memorystore, Valkey, ...)."""
+
+    name = "redis"
+
+    def __init__(self, client=None, url: str = REDIS_URL, prefix: str = "mario:"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        return bool(
+            await self.client.set(self.prefix + "lock:" + key, b"1", nx=True, px=int(ttl * 1000))
+        )
+
+    async def unlock(self, key: str) -> None:
+        await self.client.delete(self.prefix + "lock:" + key)
+
+    async def clear(self, prefix: str = "") -> None:
+        patterns = (self.prefix + prefix + "*", self.prefix + "lock:" + prefix + "*")
+        for pattern in patterns:
+            keys = [key async for key in self.client.scan_iter(match=pattern)]
+            if keys:
+                await self.client.delete(*keys)
+
+
+def create_backend(name: str = SEARCH_CACHE_BACKEND):
+    """Build the backend named by SEARCH_CACHE_BACKEND (None disables caching)."""
+    if name == "memory":
+        return MemoryBackend()
+    if name == "redis":
+        return RedisBackend()
+    if name in ("none", "off", ""):
+        return None
+    raise ValueError(f"Unknown cache backend: {name!r} (expected memory, redis or none)")
+
+
+class ResultCache:
+    """Cache of JSON-serializable RPC results with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        namespace: str,
+        backend,
+        ttl: float = SEARCH_CACHE_TTL,
+        stale_ttl: float = SEARCH_CACHE_STALE_TTL,
+    ):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        A stale value is returned as-is while ``loader()`` refreshes it in
+        the background. Exceptions from ``loader()`` on a miss propagate and
+        nothing is cached.
+        """
+        if self.backend is None:
+            return await loader()
+
+        cache_key = self._key(key)
+        entry = await self._read(cache_key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                await self._refresh_in_background(cache_key, loader)
+                return value
+
+        self.misses += 1
+        value = await loader()
+        await self._write(cache_key, value)
+        return value
+
+    async def _read(self, cache_key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            raw = await self.backend.get(cache_key)
+            if raw is None:
+                return None
+            entry = orjson.loads(raw)
+            return entry["stored_at"], entry["value"]
+        except Exception as e:
+            self._backend_error("read", e)
+            return None
+
+    async def _write(self, cache_key: str, value: Any) -> None:
+        try:
+            payload = orjson.dumps(
+                {"stored_at": time.time(), "value": value}, default=_json_default
+            )
+            await self.backend.set(cache_key, payload, self.ttl + self.stale_ttl)
+        except Exception as e:
+            self._backend_error("write", e)
+
+    async def _refresh_in_background(self, cache_key: str, loader) -> None:
+        try:
+            if not await self.backend.try_lock(cache_key, REFRESH_LOCK_SECONDS):
+                return
+        except Exception as e:
+            self._backend_error("lock", e)
+            return
+
+        async def refresh():
+            try:
+                await self._write(cache_key, await loader())
+                self.refreshes += 1
+            except Exception as e:
+                self.errors += 1
+                log_structured(
+                    "WARNING",
+                    "Background cache refresh failed",
+                    event_type="result_cache",
+                    namespace=self.namespace,
+                    error=str(e),
+                )
+            finally:
+                try:
+                    await self.backend.unlock(cache_key)
+                except Exception:
+                    pass  # the lock expires on its own
+
+        # Hold a reference so the task isn't garbage collected mid-flight
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _backend_error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        log_structured(
+            "WARNING",
+            f"Result cache {operation} failed",
+            event_type="result_cache",
+            namespace=self.namespace,
+            backend=self.backend.name,
+            error=str(error),
+        )
+
+    async def clear(self) -> None:
+        """Drop every entry in this cache's namespace."""
+        if self.backend is not None:
+            await self.backend.clear(self._key(""))
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.hits + self.stale_hits
+        total = served + self.misses
+        return {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "hit_rate": round(served / total, 4) if total else 0.0,
+        }
+
+
+search_cache = ResultCache("search", create_backend())
@@ -0,0 +1,127 @@
+"""
+Single-flight coalescing of identical concurrent upstream calls.
+
+When many requests need the same upstream result at the same moment (a
+shared procedure link, a popular search right after a deploy or cache
+expiry), only the first caller runs the call; everyone else with the same
+key awaits that one in-flight future.
+
+    detail = await upstream_calls.do(
+        ("get_procedure_detail", slug),
+        lambda: supabase.rpc("get_procedure_detail", {...}).execute(),
+    )
+
+- The shared call is bounded by a per-key timeout (``timeout=`` or the
+  group default); when it expires every waiter gets ``asyncio.TimeoutError``
+  and the key is released for the next caller.
+- A waiter that is cancelled (client went away) doesn't cancel the call for
+  the others; the call is only cancelled once it has no waiters left.
+- Results are shared by reference, so callers must treat them as read-only.
+
+Environment:
+    SINGLEFLIGHT_TIMEOUT  default per-key timeout in seconds (default 10)
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.middleware.logging import log_structured
+
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", "10"))
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Group of keyed calls where concurrent callers of a key share one call."""
+
+    def __init__(self, name: str, timeout: float = SINGLEFLIGHT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.executions = 0
+        self.merged = 0
+        self.max_waiters = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Run ``fn()`` for ``key``, or join the call already in flight."""
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            self.executions += 1
+            task = asyncio.ensure_future(
+                self._run(key, fn, self.timeout if timeout is None else timeout)
+            )
+            flight = self._flights[key] = _Flight(task)
+        else:
+            self.merged += 1
+
+        flight.waiters += 1
+        self.max_waiters = max(self.max_waiters, flight.waiters)
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[T]], timeout: float) -> T:
+        try:
+            return await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            flight = self._flights.pop(key, None)
+            if flight is not None and flight.waiters > 1:
+                log_structured(
+                    severity="DEBUG",
+                    message=f"Coalesced upstream call: {self.name}",
+                    event_type="singleflight",
+                    key=str(key),
+                    waiters=flight.waiters,
+                )
+
+    @property
+    def inflight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "merged": self.merged,
+            "max_waiters": self.max_waiters,
+            "inflight": self.inflight,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "merge_rate": round(self.merged / self.calls, 4) if self.calls else 0.0,
+        }
+
+
+# Supabase reads shared by the procedure and search services
+upstream_calls = SingleFlight("upstream")
@@ -0,0 +1,114 @@
+"""
+Startup timeline for cold-start profiling.
+
+``startup_timeline`` is created when app/main.py starts importing and records
+named marks as the app comes up (framework imported, routers imported, app
+configured, lifespan started, ready). The report is logged once at startup
+and served at ``GET /health/startup``. On Linux it also includes how long the
+process had been running before app/main.py was imported (interpreter and
+uvicorn start-up), read from /proc.
+
+For a per-module breakdown run the CLI, which imports the app in a fresh
+interpreter under ``python -X importtime``:
+
+    python -m app.core.startup --top 30
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+def _process_age_ms() -> Optional[float]:
+    """Milliseconds since this process started, or None if unavailable."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime, in clock ticks since boot); the command
+            # name in field 2 may contain spaces, so split after its ")"
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return round((uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimeline:
+    """Ordered, named marks relative to when the timeline was created."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.process_age_ms = _process_age_ms()
+        self.marks: List[Dict[str, Any]] = []
+
+    def mark(self, name: str) -> None:
+        now_ms = round((time.perf_counter() - self.origin) * 1000, 2)
+        previous_ms = self.marks[-1]["at_ms"] if self.marks else 0.0
+        self.marks.append(
+            {"name": name, "at_ms": now_ms, "delta_ms": round(now_ms - previous_ms, 2)}
+        )
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "process_age_at_import_ms": self.process_age_ms,
+            "total_ms": self.marks[-1]["at_ms"] if self.marks else 0.0,
+            "marks": list(self.marks),
+        }
+
+
+startup_timeline = StartupTimeline()
+
+
+def profile_imports(module: str = "app.main", top: int = 25) -> List[Dict[str, Any]]:
+    """
+    Import ``module`` in a fresh interpreter and return the slowest imports.
+
+    Returns:
+        List of {"module", "self_ms", "cumulative_ms"} sorted by cumulative
+        time, slowest first.
+    """
+    import subprocess
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append(
+            {
+                "module": name.strip(),
+                "self_ms": round(int(self_us) / 1000, 2),
+                "cumulative_ms": round(int(cumulative_us) / 1000, 2),
+            }
+        )
+    timings.sort(key=lambda t: t["cumulative_ms"], reverse=True)
+    return timings[:top]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the slowest imports of the API")
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--top", type=int, default=25, help="number of imports to show")
+    args = parser.parse_args()
+
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for timing in profile_imports(args.module, args.top):
+        print(
+            f"{timing['cumulative_ms']:>9.1f}ms {timing['self_ms']:>7.1f}ms  {timing['module']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
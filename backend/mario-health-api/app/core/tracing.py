@@ -0,0 +1,147 @@
+"""
+Per-request trace of upstream (Supabase/Postgres) calls.
+
+RequestLoggingMiddleware starts a ``RequestTrace`` for every request and
+keeps it in a context variable. Each instrumented ``execute()`` (see
+app/core/instrumentation.py) appends a span with the RPC or table name,
+rows returned, duration, status and, when TRACE_PAYLOAD_BYTES is on,
+response bytes. Tasks started during
+the request (QueryExecutor.gather, single-flight leaders) inherit the
+context, so their calls land in the same trace.
+
+At the end of the request the trace is:
+
+- summarised on the request log line (upstream call count, time, rows,
+  bytes), with the full span list on the slow-request warning;
+- sent as a ``Server-Timing`` header (visible in browser devtools) when
+  SERVER_TIMING is enabled;
+- passed to any registered observers (used by the query budget test helper).
+
+Neither client keeps the raw response body, so bytes are measured by
+re-encoding the rows; that is only done when TRACE_PAYLOAD_BYTES is on.
+
+Environment:
+    SERVER_TIMING        true/false (default false)
+    TRACE_PAYLOAD_BYTES  true/false (default: true with SERVER_TIMING or LOG_LEVEL=DEBUG)
+"""
+
+import os
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+TRACE_PAYLOAD_BYTES = os.getenv(
+    "TRACE_PAYLOAD_BYTES",
+    "true" if SERVER_TIMING or os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG" else "false",
+).lower() == "true"
+
+
+class Span:
+    """One upstream call."""
+
+    __slots__ = ("kind", "name", "duration_ms", "rows", "bytes", "status")
+
+    def __init__(
+        self, kind: str, name: str, duration_ms: float, rows: int, bytes: Optional[int], status: str
+    ):
+        self.kind = kind
+        self.name = name
+        self.duration_ms = duration_ms
+        self.rows = rows
+        self.bytes = bytes
+        self.status = status
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class RequestTrace:
+    """Upstream spans recorded while serving one request."""
+
+    def __init__(self, request_id: str = "", route: str = ""):
+        self.request_id = request_id
+        self.route = route
+        self.spans: List[Span] = []
+
+    def add(self, span: Span) -> None:
+        self.spans.append(span)
+
+    @property
+    def call_count(self) -> int:
+        return len(self.spans)
+
+    def count(self, name: str) -> int:
+        return sum(1 for span in self.spans if span.name == name)
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "upstream_calls": len(self.spans),
+            "upstream_ms": round(sum(s.duration_ms for s in self.spans), 2),
+            "upstream_rows": sum(s.rows for s in self.spans),
+        }
+        if TRACE_PAYLOAD_BYTES:
+            summary["upstream_bytes"] = sum(s.bytes or 0 for s in self.spans)
+        return summary
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: one entry per RPC/table, calls aggregated."""
+        by_name: Dict[str, List[float]] = {}
+        for span in self.spans:
+            by_name.setdefault(f"{span.kind}.{span.name}", []).append(span.duration_ms)
+
+        entries = [f'db;dur={self.summary()["upstream_ms"]};desc="{len(self.spans)} calls"']
+        for name, durations in by_name.items():
+            entry = f"{name};dur={round(sum(durations), 2)}"
+            if len(durations) > 1:
+                entry += f';desc="x{len(durations)}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+_observers: List[Callable[[RequestTrace], None]] = []
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def start_trace(request_id: str = "") -> Token:
+    return _current_trace.set(RequestTrace(request_id))
+
+
+def end_trace(token: Token, route: str = "") -> Optional[RequestTrace]:
+    """Detach the request's trace and hand it to observers."""
+    trace = _current_trace.get()
+    _current_trace.reset(token)
+    if trace is not None:
+        trace.route = route
+        for observer in list(_observers):
+            observer(trace)
+    return trace
+
+
+def add_trace_observer(observer: Callable[[RequestTrace], None]) -> None:
+    _observers.append(observer)
+
+
+def remove_trace_observer(observer: Callable[[RequestTrace], None]) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def payload_size(data: Any) -> Optional[int]:
+    """Approximate response size of an upstream result, in JSON bytes.
+
+    None unless TRACE_PAYLOAD_BYTES is on, since it encodes the result again.
+    """
+    if not TRACE_PAYLOAD_BYTES:
+        return None
+    if data is None:
+        return 0
+    try:
+        return len(orjson.dumps(data, default=str))
+    except TypeError:
+        return 0
@@ -0,0 +1,170 @@
+"""
+Startup cache warming and readiness.
+
+Right after a deploy or scale-out every cache is cold, and the first users
+pay for it. The lifespan in app/main.py starts ``run_warmup`` in the
+background, and ``GET /ready`` answers 503 until it has finished.
+``GET /health`` stays a plain liveness check. Point the load balancer or
+Cloud Run startup probe at /ready so instances only take traffic once warm.
+
+Warm-up sends ordinary GET requests to the app in-process (httpx
+ASGITransport). They run the same code and fill the same caches as real
+traffic, so nothing here knows any cache keys:
+
+- catalog: categories, each category's families, specialties and insurance
+  providers (catalog cache and the stale-response store), and one
+  suggestion lookup (builds the typeahead index);
+- ``WARMUP_PROCEDURES``: procedure detail pages (procedure id cache);
+- ``WARMUP_SEARCH_QUERIES``, each without a ZIP and with each of
+  ``WARMUP_ZIPS``: search results (search result cache); the first one
+  also builds the procedure search index.
+
+Requests run ``WARMUP_CONCURRENCY`` at a time, which also opens that many
+pooled upstream connections: HTTP keep-alive to PostgREST, or the asyncpg
+pool.
+
+Warm-up is best effort. Failed requests are recorded, and the instance
+becomes ready once every request has finished or ``WARMUP_TIMEOUT`` has
+passed, so a Supabase outage can't keep new instances out of rotation.
+
+Environment:
+    WARMUP_ENABLED         true/false (default true; false = ready immediately)
+    WARMUP_SEARCH_QUERIES  comma-separated search queries to replay
+    WARMUP_ZIPS            comma-separated ZIPs to replay each query with (default none)
+    WARMUP_PROCEDURES      comma-separated procedure slugs (default none)
+    WARMUP_CONCURRENCY     parallel warm-up requests (default 8)
+    WARMUP_TIMEOUT         seconds before becoming ready regardless (default 30)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.startup import startup_timeline
+from app.middleware.logging import log_structured
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_SEARCH_QUERIES = _csv(
+    os.getenv(
+        "WARMUP_SEARCH_QUERIES",
+        "mri,ct scan,x-ray,ultrasound,colonoscopy,mammogram,blood test,physical therapy",
+    )
+)
+WARMUP_ZIPS = _csv(os.getenv("WARMUP_ZIPS", ""))
+WARMUP_PROCEDURES = _csv(os.getenv("WARMUP_PROCEDURES", ""))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "8"))
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+
+CATALOG_PATHS = (
+    "/api/v1/specialties",
+    "/api/v1/insurance/providers",
+    "/api/v1/search/suggest?q=a",
+)
+
+
+class WarmupState:
+    """Progress of this instance's warm-up, reported by ``GET /ready``."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.requests = 0
+        self.failed: List[str] = []
+        self.timed_out = False
+
+    def finish(self) -> None:
+        self.ready = True
+        self.finished_at = time.monotonic()
+
+    def report(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round((self.finished_at - self.started_at) * 1000, 1)
+        return {
+            "ready": self.ready,
+            "warmup_ms": duration,
+            "requests": self.requests,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def warmup_paths(categories: List[str]) -> List[str]:
+    """Requests to replay once the category slugs are known."""
+    paths = [f"/api/v1/categories/{slug}/families" for slug in categories]
+    paths.extend(CATALOG_PATHS)
+    paths.extend(f"/api/v1/procedures/{slug}" for slug in WARMUP_PROCEDURES)
+    for query in WARMUP_SEARCH_QUERIES:
+        paths.append(str(httpx.URL("/api/v1/search", params={"q": query})))
+        paths.extend(
+            str(httpx.URL("/api/v1/search", params={"q": query, "zip": zip_code}))
+            for zip_code in WARMUP_ZIPS
+        )
+    return paths
+
+
+async def run_warmup(app, state: WarmupState = warmup_state) -> WarmupState:
+    """Replay the warm-up requests against ``app``; always ends ready."""
+    state.started_at = time.monotonic()
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://warmup",
+        headers={"User-Agent": "mario-warmup", "X-Request-ID": "warmup"},
+    ) as client:
+
+        async def fetch(path: str) -> Optional[httpx.Response]:
+            async with semaphore:
+                state.requests += 1
+                try:
+                    response = await client.get(path)
+                except Exception as e:
+                    state.failed.append(f"{path}: {type(e).__name__}")
+                    return None
+                if response.status_code != 200:
+                    state.failed.append(f"{path}: {response.status_code}")
+                return response
+
+        async def replay() -> None:
+            categories = await fetch("/api/v1/categories")
+            slugs = []
+            if categories is not None and categories.status_code == 200:
+                slugs = [c["slug"] for c in categories.json().get("categories", [])]
+            await asyncio.gather(*(fetch(path) for path in warmup_paths(slugs)))
+
+        try:
+            await asyncio.wait_for(replay(), WARMUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            state.timed_out = True
+
+    state.finish()
+    startup_timeline.mark("warm")
+    log_structured(
+        severity="WARNING" if state.failed or state.timed_out else "INFO",
+        message="Warm-up finished",
+        event_type="warmup",
+        **state.report(),
+    )
+    return state
+
+
+def start_warmup(app, state: WarmupState = warmup_state) -> Optional[asyncio.Task]:
+    """Start warm-up in the background (or mark ready at once when disabled)."""
+    if not WARMUP_ENABLED:
+        state.finish()
+        return None
+    return asyncio.create_task(run_warmup(app, state))
@@ -4,13 +4,19 @@ Mario Health API - Main application entry point.
 Provides endpoints for healthcare procedure price comparison.
 """
 
+from app.core.startup import startup_timeline
+
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status, Depends, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from typing import Optional, Dict, Any
+
+startup_timeline.mark("fastapi_imported")
+
 from app.api.v1.endpoints import (
     categories,
     families,
@@ -24,10 +30,21 @@ from app.api.v1.endpoints import (
     bookings,
     insurance,
     specialties,
+    admin,
 )
 import os
 from pathlib import Path
-from app.middleware.logging import RequestLoggingMiddleware
+from app.middleware.logging import RequestLoggingMiddleware, flush_logs, log_structured
+from app.middleware.stale import StaleResponseMiddleware
+from app.core.dependencies import close_async_supabase_client
+from app.core.metrics import registry as metrics_registry
+from app.core.warmup import start_warmup, warmup_state
+from app.core.catalog_index import preload_indexes
+from app.services.provider_geo_index import provider_geo_index
+from app.services.zip_geocoder import zip_geocoder
+from app.auth.firebase_auth import stop_signing_key_refresh
+
+startup_timeline.mark("routers_imported")
 
 # Configure logging
 logging.basicConfig(
@@ -41,13 +58,26 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
-    logger.info("\n" + ASCII_ART)
-    logger.info("🚀 Mario Health API starting up...")
-    logger.info("📚 Docs available at: /docs")
-    logger.info("🔍 Health check at: /health")
+    startup_timeline.mark("lifespan_started")
+    # Banner and config logging don't need to hold up the first request
+    asyncio.get_running_loop().run_in_executor(None, log_startup_info)
+    startup_timeline.mark("ready")
+    log_structured(
+        "INFO", "Startup timeline", event_type="startup_timeline", **startup_timeline.report()
+    )
+    # Fill caches and open upstream connections; /ready reports 503 until done
+    warmup_task = start_warmup(app)
+    preload_task = asyncio.create_task(preload_indexes(zip_geocoder, provider_geo_index))
     yield
     # Shutdown
     logger.info("👋 Mario Health API shutting down...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    if not preload_task.done():
+        preload_task.cancel()
+    stop_signing_key_refresh()
+    await close_async_supabase_client()
+    flush_logs()
 
 
 # Load ASCII art
@@ -61,7 +91,27 @@ def load_ascii_art():
         return "🏥 Mario Health API"
 
 
-ASCII_ART = load_ascii_art()
+def log_startup_info():
+    """Log the startup banner and CORS/Firebase configuration."""
+    logger.info("\n" + load_ascii_art())
+    logger.info("🚀 Mario Health API starting up...")
+    logger.info("📚 Docs available at: /docs")
+    logger.info("🔍 Health check at: /health")
+
+    for origin in ADDED_REQUIRED_ORIGINS:
+        logger.info(f"✅ Added required CORS origin: {origin}")
+    if FIREBASE_HOSTING_ORIGINS:
+        logger.info(f"✅ Added Firebase Hosting CORS origins: {FIREBASE_HOSTING_ORIGINS}")
+    else:
+        logger.info(
+            "ℹ️  Add Firebase Hosting origins via ALLOWED_ORIGINS env var (e.g., https://your-site.web.app)"
+        )
+
+    logger.info(f"🔒 CORS configured with allowed origins: {ALLOWED_ORIGINS}")
+    if FIREBASE_PROJECT_ID:
+        logger.info(f"🔐 Firebase Project ID: {FIREBASE_PROJECT_ID}")
+    else:
+        logger.warning("⚠️  FIREBASE_PROJECT_ID not set - token verification will fail")
 
 # Create FastAPI app
 app = FastAPI(
@@ -72,7 +122,6 @@ app = FastAPI(
     redoc_url="/redoc",
     lifespan=lifespan,
 )
-app.middleware("http")(RequestLoggingMiddleware(app))
 
 # CORS middleware configuration
 # Required origins for frontend access
@@ -101,31 +150,28 @@ ALLOWED_ORIGINS = [
 ]
 
 # Always add required origins (they take precedence)
-for origin in REQUIRED_ORIGINS:
-    if origin not in ALLOWED_ORIGINS:
-        ALLOWED_ORIGINS.append(origin)
-        logger.info(f"✅ Added required CORS origin: {origin}")
+ADDED_REQUIRED_ORIGINS = [o for o in REQUIRED_ORIGINS if o not in ALLOWED_ORIGINS]
+ALLOWED_ORIGINS.extend(ADDED_REQUIRED_ORIGINS)
 
 # Add Firebase Hosting origins from environment variable
 # Since FastAPI CORSMiddleware doesn't support wildcards, add specific origins via ALLOWED_ORIGINS
 # Example: ALLOWED_ORIGINS=https://your-site.web.app,https://your-site.firebaseapp.com
-if FIREBASE_HOSTING_ORIGINS:
-    ALLOWED_ORIGINS.extend(FIREBASE_HOSTING_ORIGINS)
-    logger.info(f"✅ Added Firebase Hosting CORS origins: {FIREBASE_HOSTING_ORIGINS}")
-else:
-    logger.info(
-        "ℹ️  Add Firebase Hosting origins via ALLOWED_ORIGINS env var (e.g., https://your-site.web.app)"
-    )
+ALLOWED_ORIGINS.extend(FIREBASE_HOSTING_ORIGINS)
 
 # Firebase configuration
 FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "")
 
-logger.info(f"🔒 CORS configured with allowed origins: {ALLOWED_ORIGINS}")
-if FIREBASE_PROJECT_ID:
-    logger.info(f"🔐 Firebase Project ID: {FIREBASE_PROJECT_ID}")
-else:
-    logger.warning("⚠️  FIREBASE_PROJECT_ID not set - token verification will fail")
+# CORS/Firebase configuration is logged from the lifespan (log_startup_info)
 
+# Innermost: falls back to the last good response of a public GET when
+# upstream is unavailable (CORS and logging apply to the stale response too)
+app.add_middleware(StaleResponseMiddleware)
+
+# Request logging sits inside CORS, so the 500 it sends for an unexpected
+# error carries the CORS headers and browsers can read it
+app.add_middleware(RequestLoggingMiddleware)
+
+# Outermost (added last)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
@@ -178,6 +224,7 @@ app.include_router(whoami.router, prefix="/api/v1")  # Debug endpoint for authen
 app.include_router(bookings.router, prefix="/api/v1")
 app.include_router(insurance.router, prefix="/api/v1")
 app.include_router(specialties.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 
 # Alias routes for compatibility
@@ -198,6 +245,7 @@ def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
         "endpoints": {
             "categories": "/api/v1/categories",
             "search": "/api/v1/search",
@@ -214,30 +262,28 @@ def health_check():
         "environment": os.getenv("ENVIRONMENT", "development"),
     }
 
-# Add middleware for request logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests with headers for debugging."""
-    # Log auth header if present (truncated for security)
-    auth_header = request.headers.get("authorization", "")
-    if auth_header:
-        # Show first 30 chars only
-        auth_preview = (
-            auth_header[:30] + "..." if len(auth_header) > 30 else auth_header
-        )
-        logger.info(f"{request.method} {request.url.path} | Auth: {auth_preview}")
 
-    # Log origin header for CORS debugging
-    origin = request.headers.get("origin", "")
-    if origin:
-        logger.info(f"  Origin: {origin}")
+@app.get("/ready", tags=["root"], include_in_schema=False)
+def readiness_check():
+    """Readiness for load balancers and startup probes: 503 until warm-up is done."""
+    return JSONResponse(
+        warmup_state.report(),
+        status_code=status.HTTP_200_OK if warmup_state.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@app.get("/metrics", tags=["root"], include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (see app/core/metrics.py)."""
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
 
-    response = await call_next(request)
+@app.get("/health/startup", tags=["root"], include_in_schema=False)
+def startup_report():
+    """Cold-start timeline of this instance (see app/core/startup.py)."""
+    return startup_timeline.report()
 
-    # Log CORS headers in response
-    cors_origin = response.headers.get("access-control-allow-origin", "")
-    if cors_origin:
-        logger.info(f"  CORS Allowed Origin: {cors_origin}")
 
-    logger.info(f"Response status: {response.status_code}")
-    return response
+startup_timeline.mark("app_configured")
@@ -1,17 +1,27 @@
 """
 FastAPI Structured Logging for GCP Cloud Run
 Automatically captures request/response metrics in Cloud Logging format
-Handles both HTTPExceptions (from services) and unexpected errors
+Logs HTTPExceptions (from services) by status and handles unexpected errors
+
+RequestLoggingMiddleware is a pure ASGI middleware: it wraps ``send``
+instead of going through BaseHTTPMiddleware/call_next, so responses are
+streamed straight through without an extra task and body queue per request.
+It also records the request metrics (app/core/metrics.py) by route template
+and the per-request trace of upstream calls (app/core/tracing.py).
 """
 
-import json
+import os
+import random
 import time
 import logging
 import traceback
-from typing import Callable
-from fastapi import FastAPI, Request, Response
+from typing import Dict
 from fastapi.responses import JSONResponse
-from fastapi.exceptions import HTTPException
+from starlette.datastructures import Headers, URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.log_writer import log_writer
+from app.core.metrics import http_request_duration, http_requests_in_flight, http_response_size
+from app.core.tracing import SERVER_TIMING, RequestTrace, current_trace, end_trace, start_trace
 
 # Configure structured logging for GCP
 logging.basicConfig(
@@ -20,18 +30,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SEVERITY_LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "NOTICE": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# Minimum severity that gets written (DEBUG events are dropped by default)
+LOG_LEVEL = SEVERITY_LEVELS.get(os.getenv("LOG_LEVEL", "INFO").upper(), 20)
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``event=rate,event=rate`` (e.g. ``get_procedure_detail=0.1``)."""
+    rates = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        event, rate = item.rsplit("=", 1)
+        rates[event.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+
+# Requests slower than this are logged again as a WARNING
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+
+# Per-event sampling for high-volume INFO/DEBUG events, keyed by event_type
+# (or message when an event has no event_type). WARNING and above are never sampled.
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
 
 def log_structured(severity: str, message: str, **kwargs):
     """
     Log in GCP Cloud Logging structured format.
     https://cloud.google.com/logging/docs/structured-logging
+
+    Entries are queued and written in batches by a background thread
+    (see app/core/log_writer.py), so this never blocks on stdout.
     """
+    level = SEVERITY_LEVELS.get(severity, 20)
+    if level < LOG_LEVEL:
+        return
+
+    if level < 30 and LOG_SAMPLE_RATES:
+        rate = LOG_SAMPLE_RATES.get(kwargs.get("event_type") or message)
+        if rate is not None and random.random() >= rate:
+            return
+
     log_entry = {
         "severity": severity,
         "message": message,
         **kwargs
     }
-    print(json.dumps(log_entry))
+    log_writer.submit(log_entry)
+
+
+def flush_logs(timeout: float = 2.0) -> bool:
+    """Write out any queued log entries (called on shutdown)."""
+    return log_writer.flush(timeout)
 
 
 class RequestLoggingMiddleware:
@@ -42,138 +100,80 @@ class RequestLoggingMiddleware:
     1. Successful requests (200-299)
     2. Client errors (400-499) - HTTPException from services
     3. Server errors (500-599) - Unexpected exceptions
+
+    Sets ``request.state.request_id`` / ``request.state.start_time`` and
+    adds an ``X-Request-ID`` header to every response.
     """
 
-    def __init__(self, app: FastAPI):
+    def __init__(self, app: ASGIApp):
         self.app = app
 
-    async def __call__(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Start timer
         start_time = time.time()
+        start = time.perf_counter()
 
         # Generate request ID
-        request_id = request.headers.get("X-Request-ID", f"req_{int(time.time() * 1000)}")
-        user_agent = request.headers.get("User-Agent", "unknown")
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id") or f"req_{int(start_time * 1000)}"
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
 
         # Store in request state for access in routes/services
-        request.state.request_id = request_id
-        request.state.start_time = start_time
-
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-
-            # Determine log severity based on status code
-            if response.status_code >= 500:
-                severity = "ERROR"
-            elif response.status_code >= 400:
-                severity = "WARNING"
-            else:
-                severity = "INFO"
-
-            # Log request
-            log_structured(
-                severity=severity,
-                message=f"{request.method} {request.url.path}",
-                httpRequest={
-                    "requestMethod": request.method,
-                    "requestUrl": str(request.url),
-                    "status": response.status_code,
-                    "userAgent": user_agent,
-                    "latency": f"{duration_ms}ms",
-                },
-                request_id=request_id,
-                duration_ms=duration_ms,
-                status_code=response.status_code,
-                endpoint=request.url.path,
-            )
-
-            # Warn on slow requests
-            if duration_ms > 1000:
-                log_structured(
-                    severity="WARNING",
-                    message=f"Slow request: {request.method} {request.url.path}",
-                    duration_ms=duration_ms,
-                    request_id=request_id,
-                    threshold_ms=1000,
-                )
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
-
-        except HTTPException as e:
-            """
-            Handle HTTPException raised by services (400, 404, etc.)
-            These are EXPECTED errors with user-friendly messages.
-            """
-            duration_ms = round((time.time() - start_time) * 1000, 2)
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["start_time"] = start_time
 
-            # Determine severity
-            severity = "ERROR" if e.status_code >= 500 else "WARNING"
+        status_code = 500
+        response_started = False
+        response_bytes = 0
+        http_requests_in_flight.inc()
+        trace_token = start_trace(request_id)
+        trace = current_trace()
 
-            # Log with appropriate severity
-            log_structured(
-                severity=severity,
-                message=f"HTTP {e.status_code}: {request.method} {request.url.path}",
-                httpRequest={
-                    "requestMethod": request.method,
-                    "requestUrl": str(request.url),
-                    "status": e.status_code,
-                    "userAgent": user_agent,
-                },
-                request_id=request_id,
-                duration_ms=duration_ms,
-                status_code=e.status_code,
-                endpoint=request.url.path,
-                error_detail=e.detail,
-            )
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_started, response_bytes
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                extra_headers = [request_id_header]
+                if SERVER_TIMING and trace.spans:
+                    extra_headers.append(
+                        (b"server-timing", trace.server_timing().encode("latin-1"))
+                    )
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", ()), *extra_headers],
+                }
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
 
-            # Return properly formatted error response
-            return JSONResponse(
-                status_code=e.status_code,
-                content={
-                    "error": e.detail,
-                    "status_code": e.status_code,
-                    "request_id": request_id,
-                },
-                headers={"X-Request-ID": request_id},
-            )
+        error_fields = {}
+        try:
+            await self.app(scope, receive, send_with_request_id)
 
         except Exception as e:
             """
             Handle UNEXPECTED errors (bugs, network issues, etc.)
             These should be investigated immediately.
             """
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-
-            # Log error with full details
-            log_structured(
-                severity="ERROR",
-                message=f"Unexpected error: {request.method} {request.url.path}",
-                httpRequest={
-                    "requestMethod": request.method,
-                    "requestUrl": str(request.url),
-                    "status": 500,
-                    "userAgent": user_agent,
-                },
-                request_id=request_id,
-                duration_ms=duration_ms,
-                status_code=500,
-                endpoint=request.url.path,
-                error={
+            status_code = 500
+            error_fields = {
+                "error": {
                     "type": type(e).__name__,
                     "message": str(e),
                     "traceback": traceback.format_exc(),
-                },
-            )
+                }
+            }
+            if response_started:
+                raise
 
             # Return generic 500 error (don't leak internal details)
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error. Please try again later.",
@@ -181,3 +181,85 @@ class RequestLoggingMiddleware:
                 },
                 headers={"X-Request-ID": request_id},
             )
+            await response(scope, receive, send)
+
+        finally:
+            http_requests_in_flight.dec()
+            # Label by route template (/api/v1/procedures/{slug}), never the
+            # raw path, so label cardinality stays bounded
+            route_path = getattr(scope.get("route"), "path", None) or "unmatched"
+            end_trace(trace_token, route_path)
+            self._record_metrics(scope, route_path, status_code, start, response_bytes)
+            self._log_request(
+                scope, headers, request_id, status_code, start, error_fields, trace
+            )
+
+    @staticmethod
+    def _record_metrics(
+        scope: Scope, route_path: str, status_code: int, start: float, response_bytes: int
+    ) -> None:
+        method = scope["method"]
+        http_request_duration.labels(method, route_path, str(status_code)).observe(
+            time.perf_counter() - start
+        )
+        http_response_size.labels(method, route_path).observe(response_bytes)
+
+    @staticmethod
+    def _log_request(
+        scope: Scope,
+        headers: Headers,
+        request_id: str,
+        status_code: int,
+        start: float,
+        error_fields: dict,
+        trace: RequestTrace,
+    ) -> None:
+        # Calculate duration
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        method = scope["method"]
+        path = scope["path"]
+
+        # Determine log severity based on status code
+        if status_code >= 500:
+            severity = "ERROR"
+        elif status_code >= 400:
+            severity = "WARNING"
+        else:
+            severity = "INFO"
+
+        if "error" in error_fields:
+            message = f"Unexpected error: {method} {path}"
+        else:
+            message = f"{method} {path}"
+
+        # Log request (origin/auth presence replace the old per-request debug lines)
+        log_structured(
+            severity=severity,
+            message=message,
+            httpRequest={
+                "requestMethod": method,
+                "requestUrl": str(URL(scope=scope)),
+                "status": status_code,
+                "userAgent": headers.get("user-agent", "unknown"),
+                "latency": f"{duration_ms}ms",
+            },
+            request_id=request_id,
+            duration_ms=duration_ms,
+            status_code=status_code,
+            endpoint=path,
+            origin=headers.get("origin"),
+            has_auth="authorization" in headers,
+            **trace.summary(),
+            **error_fields,
+        )
+
+        # Warn on slow requests
+        if duration_ms > SLOW_REQUEST_THRESHOLD_MS:
+            log_structured(
+                severity="WARNING",
+                message=f"Slow request: {method} {path}",
+                duration_ms=duration_ms,
+                request_id=request_id,
+                threshold_ms=SLOW_REQUEST_THRESHOLD_MS,
+                upstream_spans=[span.to_dict() for span in trace.spans],
+            )
@@ -0,0 +1,141 @@
+"""
+Stale-response fallback for public read endpoints.
+
+StaleResponseMiddleware keeps the last good (200) response of every public
+``GET /api/v1/...`` request in a bounded in-memory LRU, keyed by path and
+query string. If the same request later fails because upstream is
+unavailable, the stored response is served instead of the error. That
+covers a 502/503/504 (open circuit, load shed, a service's "temporarily
+unavailable") and an upstream timeout or connection error that escaped
+the service. A stale response carries:
+
+    X-Stale: true
+    Age: <seconds since it was stored>
+    Cache-Control: no-store    (so browsers and CDNs don't keep it)
+
+Requests with an Authorization header are per-user and are never stored
+or served stale. Typeahead suggestions are served from memory and would
+only churn the store one keystroke at a time, so they are skipped too.
+Errors from bad requests (4xx) pass through unchanged.
+
+Environment:
+    STALE_CACHE_SIZE       max stored responses (default 1000)
+    STALE_CACHE_MAX_AGE    seconds a response may be served stale (default 86400)
+    STALE_CACHE_MAX_BYTES  largest response body stored (default 262144)
+"""
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+from fastapi.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.concurrency import is_overload_error
+from app.middleware.logging import log_structured
+
+STALE_CACHE_SIZE = int(os.getenv("STALE_CACHE_SIZE", "1000"))
+STALE_CACHE_MAX_AGE = float(os.getenv("STALE_CACHE_MAX_AGE", "86400"))
+STALE_CACHE_MAX_BYTES = int(os.getenv("STALE_CACHE_MAX_BYTES", "262144"))
+
+STALE_PATH_PREFIX = "/api/v1/"
+STALE_EXCLUDED_PATHS = frozenset({"/api/v1/search/suggest"})
+# Statuses that mean "upstream unavailable" rather than "bad request"
+FALLBACK_STATUSES = {502, 503, 504}
+
+# (stored_at, content_type, body)
+StaleEntry = Tuple[float, bytes, bytes]
+
+stale_responses = TTLCache(max_size=STALE_CACHE_SIZE, ttl=STALE_CACHE_MAX_AGE)
+
+
+class StaleResponseMiddleware:
+    """Serve the last good response of a public GET when upstream is down."""
+
+    def __init__(self, app: ASGIApp, store: Optional[TTLCache] = None):
+        self.app = app
+        self.store = stale_responses if store is None else store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(STALE_PATH_PREFIX)
+            or scope["path"] in STALE_EXCLUDED_PATHS
+            or any(name == b"authorization" for name, _ in scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        held: List[Message] = []  # a failed response, held back until we know there's no fallback
+        body = bytearray()
+        content_type = b""
+        storable = False
+        started = False
+
+        async def send_or_hold(message: Message) -> None:
+            nonlocal content_type, storable, started
+            if message["type"] == "http.response.start":
+                started = True
+                if message["status"] in FALLBACK_STATUSES:
+                    held.append(message)
+                    return
+                storable = message["status"] == 200
+                content_type = dict(message.get("headers", ())).get(b"content-type", b"")
+            elif held:
+                held.append(message)
+                return
+            elif storable:
+                body.extend(message.get("body", b""))
+                if len(body) > STALE_CACHE_MAX_BYTES:
+                    storable = False
+                    body.clear()
+                elif not message.get("more_body", False):
+                    self.store.set(key, (time.time(), content_type, bytes(body)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_or_hold)
+        except Exception as e:
+            if started or isinstance(e, HTTPException) or not is_overload_error(e):
+                raise
+            if not await self._send_stale(key, send, reason=type(e).__name__):
+                raise
+            return
+
+        if held and not await self._send_stale(key, send, reason=str(held[0]["status"])):
+            for message in held:
+                await send(message)
+
+    async def _send_stale(self, key: str, send: Send, reason: str) -> bool:
+        entry: Optional[StaleEntry] = self.store.get(key)
+        if entry is None:
+            return False
+
+        stored_at, content_type, body = entry
+        age = max(0, int(time.time() - stored_at))
+        log_structured(
+            severity="WARNING",
+            message="Served stale response",
+            event_type="stale_response",
+            key=key,
+            age_seconds=age,
+            reason=reason,
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type or b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"x-stale", b"true"),
+                    (b"age", str(age).encode("latin-1")),
+                    (b"cache-control", b"no-store"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+        return True
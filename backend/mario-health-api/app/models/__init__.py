@@ -26,6 +26,8 @@ from app.models.procedure import (
 from app.models.search import (
     SearchResult,
     SearchResponse,
+    Suggestion,
+    SuggestResponse,
 )
 
 # Billing code models
@@ -86,6 +88,8 @@ __all__ = [
     # Search
     "SearchResult",
     "SearchResponse",
+    "Suggestion",
+    "SuggestResponse",
     # Billing codes
     "CodeType",
     "BillingCodeProcedureMapping",
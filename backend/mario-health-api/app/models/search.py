@@ -36,7 +36,8 @@ class SearchResponse(BaseModel):
     """Response for GET /api/v1/search."""
     query: str
     location: str | None = None
-    radius_miles: int = 25
+    radius_miles: int = 25  # Radius used; larger than requested if the search expanded
+    radius_expanded: bool = False
     results_count: int
     results: List[SearchResult]
 
@@ -46,6 +47,7 @@ class SearchResponse(BaseModel):
                 "query": "chest x-ray",
                 "location": "02138",
                 "radius_miles": 25,
+                "radius_expanded": False,
                 "results_count": 2,
                 "results": [
                     {
@@ -67,3 +69,32 @@ class SearchResponse(BaseModel):
                 ]
             }
         }
+
+
+class Suggestion(BaseModel):
+    """Typeahead suggestion."""
+    type: str = Field(..., description="procedure, specialty, hospital or billing_code")
+    label: str = Field(..., description="Matched text, e.g. a common name, alias or code")
+    slug: str = Field(..., description="Procedure or specialty slug, or hospital id")
+    name: str = Field(..., description="Canonical name of the procedure, specialty or hospital")
+
+
+class SuggestResponse(BaseModel):
+    """Response for GET /api/v1/search/suggest."""
+    query: str
+    suggestions: List[Suggestion]
+
+    class ConfigDict:
+        json_schema_extra = {
+            "example": {
+                "query": "belly",
+                "suggestions": [
+                    {
+                        "type": "procedure",
+                        "label": "Belly MRI",
+                        "slug": "abdominal-mri",
+                        "name": "Abdominal MRI"
+                    }
+                ]
+            }
+        }
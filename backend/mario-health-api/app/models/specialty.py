@@ -116,7 +116,8 @@ class SpecialtyProvidersMetadata(BaseModel):
     """
     total_providers_found: int  # Total matching providers (before limit)
     providers_returned: int  # Providers in response (after limit)
-    search_radius: int
+    search_radius: int  # Radius used; larger than requested if the search expanded
+    radius_expanded: bool = False
     providers_with_pricing: int
     pricing_coverage_pct: float
 
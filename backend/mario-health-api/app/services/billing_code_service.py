@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
 from decimal import Decimal
 from postgrest.exceptions import APIError
 
@@ -8,7 +8,7 @@ from app.middleware.logging import log_structured
 
 
 class BillingCodeService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def get_billing_code_detail(
@@ -25,7 +25,7 @@ class BillingCodeService:
         """
         try:
             # Call RPC function
-            result = self.supabase.rpc(
+            result = await self.supabase.rpc(
                 "get_billing_code_detail",
                 {
                     "code_input": code,
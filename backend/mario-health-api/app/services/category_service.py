@@ -1,16 +1,16 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Category, CategoriesResponse, Family, CategoryFamiliesResponse
 
 
 class CategoryService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def get_all_categories(self) -> CategoriesResponse:
         """Fetch all categories with family counts."""
 
-        result = self.supabase.rpc("get_categories_with_counts").execute()
+        result = await self.supabase.rpc("get_categories_with_counts").execute()
 
         categories = [
             Category(
@@ -30,14 +30,14 @@ class CategoryService:
         """Fetch families for a category with procedure counts."""
 
         # Call the RPC function
-        result = self.supabase.rpc(
+        result = await self.supabase.rpc(
             "get_families_with_counts",
             {"category_slug_input": slug}
         ).execute()
 
         if not result.data:
             # Verify category exists
-            category_check = self.supabase.table("procedure_category") \
+            category_check = await self.supabase.table("procedure_category") \
                 .select("id") \
                 .eq("slug", slug) \
                 .limit(1) \
@@ -1,18 +1,18 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Procedure, FamilyProceduresResponse
 from decimal import Decimal
 
 
 class FamilyService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def get_procedures_by_family(self, slug: str) -> FamilyProceduresResponse:
         """Fetch procedures for a family with pricing stats."""
 
         # First, get family info including description
-        family_check = (
+        family_check = await (
             self.supabase.table("procedure_family")
             .select("id, name, slug, description")
             .eq("slug", slug)
@@ -26,7 +26,7 @@ class FamilyService:
         family_info = family_check.data[0]
 
         # Get procedures with pricing
-        result = self.supabase.rpc(
+        result = await self.supabase.rpc(
             "get_procedures_with_pricing", {"family_slug_input": slug}
         ).execute()
 
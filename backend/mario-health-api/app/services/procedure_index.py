@@ -0,0 +1,342 @@
+"""
+In-process procedure search index.
+
+``search_procedures_v2`` scores every procedure row with full-text search,
+trigram similarity and an ILIKE fallback, and it aggregates prices in the
+same query. The catalog is a few hundred procedures that only change when
+the sync job runs, so the text-matching half of search runs here in memory.
+The database is then only asked for price aggregates for the matched ids
+(``get_procedure_price_summaries``).
+
+Scores stay in the same buckets as ``match_score`` in search_procedures_v2,
+so results from either path rank the same way:
+
+    1.0          exact name (ignoring case and punctuation)
+    0.95         exact common name
+    0.9          exact billing code (CPT/HCPCS), e.g. "74181"
+    0.5 - 0.9    every query word matches (stemmed); BM25 sets the position
+    0.4 - 0.5    every word matches and the last one only as a prefix ("color")
+    0.3 x 0.4 +  trigram similarity to the name (x 0.4) or common name (x 0.35)
+                 above 0.3, same as pg_trgm's ``similarity()``
+
+Full-text fields are name, common name, search terms and description, with
+name weighted highest. Unlike the SQL ``search_vector`` this includes
+``search_terms``, so synonyms such as "belly mri" find Abdominal MRI.
+
+The index is built from ``get_procedure_search_corpus`` (one call) and
+rebuilt when the catalog changes; see app/core/catalog_index.py. Until it
+can be built, search falls back to search_procedures_v2.
+
+Environment:
+    SEARCH_INDEX        true/false (default true; false = always search_procedures_v2)
+"""
+
+import math
+import os
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.catalog_index import CatalogIndexLoader
+
+SEARCH_INDEX = os.getenv("SEARCH_INDEX", "true").lower() == "true"
+
+SIMILARITY_THRESHOLD = 0.3  # pg_trgm.similarity_threshold default
+MIN_PREFIX_LENGTH = 2
+MAX_MATCHES = 200
+
+# Weighted term frequency per field (name counts three times a description word)
+FIELD_WEIGHTS = (
+    ("procedure_name", 3.0),
+    ("common_name", 2.0),
+    ("search_terms", 1.0),
+    ("description", 1.0),
+)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with without".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def words(text: Optional[str]) -> List[str]:
+    """Lowercased alphanumeric words, as pg_trgm and to_tsvector split them."""
+    return _WORD.findall(text.lower()) if text else []
+
+
+def stem(word: str) -> str:
+    """Light English suffix stripping: "x-rays" and "x-ray" share a term."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("es") and word[-3] in "sxz":
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def terms(text: Optional[str]) -> List[str]:
+    """Stemmed words without stopwords."""
+    return [stem(word) for word in words(text) if word not in STOPWORDS]
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """pg_trgm trigrams: each word padded with two spaces before, one after."""
+    grams: Set[str] = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """pg_trgm ``similarity()``: shared trigrams over distinct trigrams."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+@dataclass(frozen=True)
+class IndexedProcedure:
+    """The procedure fields search results are built from."""
+
+    id: str
+    name: str
+    slug: str
+    common_name: Optional[str]
+    family_name: str
+    family_slug: str
+    category_name: str
+    category_slug: str
+
+
+class ProcedureIndex:
+    """Immutable text index over the procedure catalog."""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.procedures: List[IndexedProcedure] = []
+        self._names: Dict[str, List[int]] = defaultdict(list)
+        self._common_names: Dict[str, List[int]] = defaultdict(list)
+        self._codes: Dict[str, List[int]] = defaultdict(list)
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._name_trigrams: Dict[str, List[int]] = defaultdict(list)
+        self._common_trigrams: Dict[str, List[int]] = defaultdict(list)
+        self._name_sizes: List[int] = []
+        self._common_sizes: List[int] = []
+        lengths: List[float] = []
+
+        for doc, row in enumerate(rows):
+            self.procedures.append(
+                IndexedProcedure(
+                    id=row["procedure_id"],
+                    name=row["procedure_name"],
+                    slug=row["procedure_slug"],
+                    common_name=row.get("common_name"),
+                    family_name=row["family_name"],
+                    family_slug=row["family_slug"],
+                    category_name=row["category_name"],
+                    category_slug=row["category_slug"],
+                )
+            )
+            self._names[" ".join(words(row["procedure_name"]))].append(doc)
+            if row.get("common_name"):
+                self._common_names[" ".join(words(row["common_name"]))].append(doc)
+            for code in row.get("billing_codes") or ():
+                self._codes[code.strip().upper()].append(doc)
+
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS:
+                for term in terms(row.get(field)):
+                    postings = self._postings[term]
+                    postings[doc] = postings.get(doc, 0.0) + weight
+                    length += weight
+            lengths.append(length)
+
+            for text, postings, sizes in (
+                (row["procedure_name"], self._name_trigrams, self._name_sizes),
+                (row.get("common_name"), self._common_trigrams, self._common_sizes),
+            ):
+                grams = trigrams(text)
+                sizes.append(len(grams))
+                for gram in grams:
+                    postings[gram].append(doc)
+
+        count = len(self.procedures)
+        average = (sum(lengths) / count) if count else 0.0
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / average) if average else BM25_K1
+            for length in lengths
+        ]
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        # Sorted vocabulary for prefix expansion of the last query word
+        self.vocabulary: List[str] = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.procedures)
+
+    def search(self, query: str, limit: int = MAX_MATCHES) -> List[Tuple[IndexedProcedure, float]]:
+        """Procedures matching ``query`` with their match score, best first."""
+        normalized = " ".join(words(query))
+        if not normalized:
+            return []
+        scores: Dict[int, float] = {}
+
+        def offer(doc: int, score: float) -> None:
+            if score > scores.get(doc, 0.0):
+                scores[doc] = score
+
+        for doc in self._names.get(normalized, ()):
+            offer(doc, 1.0)
+        for doc in self._common_names.get(normalized, ()):
+            offer(doc, 0.95)
+        for doc in self._codes.get(query.strip().upper(), ()):
+            offer(doc, 0.9)
+
+        query_terms = terms(query)
+        if query_terms:
+            full = self._bm25(query_terms)
+            for doc, score in full.items():
+                offer(doc, 0.5 + 0.4 * score)
+            if len(query_terms[-1]) >= MIN_PREFIX_LENGTH:
+                for doc, score in self._bm25(query_terms, prefix=True).items():
+                    if doc not in full:
+                        offer(doc, 0.4 + 0.1 * score)
+
+        query_grams = trigrams(query)
+        for postings, sizes, weight in (
+            (self._name_trigrams, self._name_sizes, 0.4),
+            (self._common_trigrams, self._common_sizes, 0.35),
+        ):
+            for doc, score in self._similar(query_grams, postings, sizes).items():
+                offer(doc, score * weight)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.procedures[item[0]].name))
+        return [(self.procedures[doc], round(score, 6)) for doc, score in ranked[:limit]]
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with ``prefix``."""
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + "\uffff", start)
+        return self.vocabulary[start:end]
+
+    @staticmethod
+    def _similar(
+        query_grams: Set[str], postings: Dict[str, List[int]], sizes: List[int]
+    ) -> Dict[int, float]:
+        """Documents above the similarity threshold, counting shared trigrams from postings."""
+        shared = Counter(chain.from_iterable([postings.get(gram, ()) for gram in query_grams]))
+        size = len(query_grams)
+        matches = {}
+        for doc, count in shared.items():
+            score = count / (size + sizes[doc] - count)
+            if score > SIMILARITY_THRESHOLD:
+                matches[doc] = score
+        return matches
+
+    def _bm25(self, query_terms: List[str], prefix: bool = False) -> Dict[int, float]:
+        """Documents containing every term, BM25 scores scaled to 0-1 by the best.
+
+        With ``prefix`` the last term also matches any word it starts.
+        """
+        term_groups = [[term] for term in query_terms]
+        if prefix:
+            term_groups[-1] = self.expand_prefix(query_terms[-1])
+
+        matched: Optional[Set[int]] = None
+        for group in term_groups:
+            docs: Set[int] = set()
+            for term in group:
+                docs.update(self._postings.get(term, ()))
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return {}
+
+        raw: Dict[int, float] = {}
+        for doc in matched:
+            score = 0.0
+            for group in term_groups:
+                for term in group:
+                    tf = self._postings[term].get(doc)
+                    if tf:
+                        score += self._idf[term] * tf * (BM25_K1 + 1) / (tf + self._norms[doc])
+            raw[doc] = score
+        best = max(raw.values())
+        return {doc: (score / best if best else 1.0) for doc, score in raw.items()}
+
+
+class ProcedureIndexLoader(CatalogIndexLoader[ProcedureIndex]):
+    """Loads the procedure index from ``get_procedure_search_corpus``."""
+
+    def __init__(self, **kwargs):
+        super().__init__("procedure_search", "get_procedure_search_corpus", ProcedureIndex, **kwargs)
+
+    async def get(self, supabase) -> Optional[ProcedureIndex]:
+        """Current index, or None to search with search_procedures_v2."""
+        if not SEARCH_INDEX:
+            return None
+        return await super().get(supabase)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": SEARCH_INDEX,
+            **super().stats(),
+            "terms": len(self.index.vocabulary) if self.index is not None else 0,
+        }
+
+
+procedure_index = ProcedureIndexLoader()
+
+
+def merge_price_summaries(
+    matches: List[Tuple[IndexedProcedure, float]],
+    summaries: Iterable[Dict[str, Any]],
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """Rows shaped like search_procedures_v2's, for matches that have prices.
+
+    Ordered like the RPC: score, then best price, then nearest distance.
+    """
+    by_id = {row["procedure_id"]: row for row in summaries}
+    rows = []
+    for procedure, score in matches:
+        prices = by_id.get(procedure.id)
+        if prices is None:
+            continue
+        rows.append(
+            {
+                "procedure_id": procedure.id,
+                "procedure_name": procedure.name,
+                "procedure_slug": procedure.slug,
+                "family_name": procedure.family_name,
+                "family_slug": procedure.family_slug,
+                "category_name": procedure.category_name,
+                "category_slug": procedure.category_slug,
+                "best_price": prices["best_price"],
+                "avg_price": prices["avg_price"],
+                "max_price": prices["max_price"],
+                "provider_count": prices["provider_count"],
+                "nearest_provider": prices.get("nearest_provider"),
+                "nearest_distance_miles": prices.get("nearest_distance_miles"),
+                "match_score": score,
+            }
+        )
+    rows.sort(
+        key=lambda r: (
+            -r["match_score"],
+            r["best_price"],
+            r["nearest_distance_miles"] if r["nearest_distance_miles"] is not None else 999999,
+        )
+    )
+    return rows[:limit]
@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
 from app.models import (
     ProcedureDetail,
     CarrierPrice,
@@ -8,21 +8,78 @@ from app.models import (
     ProcedureOrg,
     ProcedureOrgsResponse,
 )
+from app.core.query_executor import QueryExecutor
+from app.core.responses import validate_many
+from app.core.singleflight import upstream_calls
+from app.middleware.logging import log_structured
 from decimal import Decimal
-from typing import List
+from typing import Dict, List, Optional
+
+# slug -> procedure id. The catalog only changes on sync, so resolved ids are
+# kept for the life of the process; misses are not cached.
+_PROCEDURE_ID_CACHE_MAX = 4096
+_procedure_ids: Dict[str, str] = {}
+
+
+async def resolve_procedure_id(supabase: AsyncClient, slug: str) -> Optional[str]:
+    """Resolve a procedure slug to its id, or None if it does not exist.
+
+    Lets callers start id-keyed queries alongside ``get_procedure_detail``
+    instead of waiting for the detail RPC to return the id.
+    """
+    procedure_id = _procedure_ids.get(slug)
+    if procedure_id is not None:
+        return procedure_id
+
+    result = await upstream_calls.do(
+        ("procedure_id", slug),
+        lambda: supabase.table("procedure").select("id").eq("slug", slug).limit(1).execute(),
+    )
+    if not result.data:
+        return None
+
+    procedure_id = result.data[0]["id"]
+    if len(_procedure_ids) >= _PROCEDURE_ID_CACHE_MAX:
+        _procedure_ids.clear()
+    _procedure_ids[slug] = procedure_id
+    return procedure_id
 
 
 class ProcedureService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
+    def _procedure_detail(self, slug: str):
+        """get_procedure_detail, shared with concurrent requests for the same slug."""
+        return upstream_calls.do(
+            ("get_procedure_detail", slug),
+            lambda: self.supabase.rpc(
+                "get_procedure_detail", {"procedure_slug_input": slug}
+            ).execute(),
+        )
+
     async def get_procedure_by_slug(self, slug: str) -> ProcedureDetail:
         """Fetch detailed procedure information with all carrier pricing."""
 
-        # Get procedure details
-        result = self.supabase.rpc(
-            "get_procedure_detail", {"procedure_slug_input": slug}
-        ).execute()
+        procedure_id = await resolve_procedure_id(self.supabase, slug)
+        if procedure_id is None:
+            raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
+
+        # Detail stats and carrier prices only depend on the procedure id
+        qx = QueryExecutor("procedure_detail")
+        result, prices_result = await qx.gather(
+            get_procedure_detail=self._procedure_detail(slug),
+            get_procedure_carrier_prices=upstream_calls.do(
+                ("get_procedure_carrier_prices", procedure_id),
+                lambda: self.supabase.rpc(
+                    "get_procedure_carrier_prices", {"procedure_id_input": procedure_id}
+                ).execute(),
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(result, Exception):
+            raise result
 
         if not result.data or len(result.data) == 0:
             raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
@@ -32,9 +89,8 @@ class ProcedureService:
         # Get carrier prices (if you have pricing table)
         carrier_prices = []
         try:
-            prices_result = self.supabase.rpc(
-                "get_procedure_carrier_prices", {"procedure_id_input": proc["id"]}
-            ).execute()
+            if isinstance(prices_result, Exception):
+                raise prices_result
 
             carrier_prices = [
                 CarrierPrice(
@@ -54,7 +110,13 @@ class ProcedureService:
             ]
         except Exception as e:
             # If pricing function doesn't exist or fails, continue without prices
-            print(f"Warning: Could not fetch carrier prices: {e}")
+            log_structured(
+                severity="WARNING",
+                message="Could not fetch procedure carrier prices",
+                slug=slug,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
 
         return ProcedureDetail(
             id=proc["id"],
@@ -85,37 +147,60 @@ class ProcedureService:
     async def get_procedure_providers(self, slug: str) -> ProcedureProvidersResponse:
         """Fetch all providers offering a specific procedure with pricing."""
 
-        # First get the procedure to verify it exists
-        proc_result = self.supabase.rpc(
-            "get_procedure_detail", {"procedure_slug_input": slug}
-        ).execute()
+        procedure_id = await resolve_procedure_id(self.supabase, slug)
+        if procedure_id is None:
+            raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
+
+        # Get the procedure stats and the providers offering it concurrently
+        # Query procedure_pricing table joined with provider info
+        qx = QueryExecutor("procedure_providers")
+        proc_result, providers_result = await qx.gather(
+            get_procedure_detail=self._procedure_detail(slug),
+            procedure_pricing=upstream_calls.do(
+                ("procedure_pricing", procedure_id),
+                lambda: (
+                    self.supabase.table("procedure_pricing")
+                    .select(
+                        "provider_id, price, provider_name"
+
+                    # removing all these columns as they do not yet exist in the procedure_pricing table
+                    # in_network, rating, reviews, distance, address, city, state, zip_code, mario_points
+                    )
+                    .eq("procedure_id", procedure_id)
+                    .execute()
+                ),
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(proc_result, Exception):
+            raise proc_result
 
         if not proc_result.data or len(proc_result.data) == 0:
             raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
 
         proc = proc_result.data[0]
-        procedure_id = proc["id"]
         procedure_name = proc["name"]
         procedure_slug = proc["slug"]
         avg_price = Decimal(str(proc["avg_price"])) if proc.get("avg_price") else None
 
-        # Get providers offering this procedure
-        # Query procedure_pricing table joined with provider info
-        try:
-            # Use a query to get providers with pricing for this procedure
-            providers_result = (
-                self.supabase.table("procedure_pricing")
-                .select(
-                    "provider_id, price, provider_name"
-
-                # removing all these columns as they do not yet exist in the procedure_pricing table
-                # in_network, rating, reviews, distance, address, city, state, zip_code, mario_points
-                )
-                .eq("procedure_id", procedure_id)
-                .execute()
+        if isinstance(providers_result, HTTPException):
+            raise providers_result  # shed or circuit open: keeps its Retry-After
+        if isinstance(providers_result, Exception):
+            # An empty list would hide the outage (and replace the last good
+            # response kept for the stale fallback), so report it as such
+            log_structured(
+                severity="ERROR",
+                message="Could not fetch procedure providers",
+                slug=slug,
+                error_type=type(providers_result).__name__,
+                error_message=str(providers_result),
             )
+            raise HTTPException(status_code=503, detail="Procedure providers temporarily unavailable")
+
+        try:
 
-            providers: List[ProcedureProvider] = []
+            provider_rows = []
 
             for p in providers_result.data:
                 price = Decimal(str(p["price"]))
@@ -132,25 +217,29 @@ class ProcedureService:
                 else:
                     price_relative = None
 
-                providers.append(
-                    ProcedureProvider(
-                        provider_id=p.get("provider_id", ""),
-                        provider_name=p.get("provider_name", "Unknown Provider"),
-                        in_network=p.get("in_network", False),
-                        rating=float(p["rating"]) if p.get("rating") else None,
-                        reviews=int(p["reviews"]) if p.get("reviews") else 0,
-                        distance=float(p["distance"]) if p.get("distance") else None,
-                        price_estimate=price,
-                        price_average=price_avg,
-                        price_relative_to_average=price_relative,
-                        mario_points=int(p.get("mario_points", 0)),
-                        address=p.get("address"),
-                        city=p.get("city"),
-                        state=p.get("state"),
-                        zip_code=p.get("zip_code"),
-                    )
+                provider_rows.append(
+                    {
+                        "provider_id": p.get("provider_id", ""),
+                        "provider_name": p.get("provider_name", "Unknown Provider"),
+                        "in_network": p.get("in_network", False),
+                        "rating": float(p["rating"]) if p.get("rating") else None,
+                        "reviews": int(p["reviews"]) if p.get("reviews") else 0,
+                        "distance": float(p["distance"]) if p.get("distance") else None,
+                        "price_estimate": price,
+                        "price_average": price_avg,
+                        "price_relative_to_average": price_relative,
+                        "mario_points": int(p.get("mario_points", 0)),
+                        "address": p.get("address"),
+                        "city": p.get("city"),
+                        "state": p.get("state"),
+                        "zip_code": p.get("zip_code"),
+                    }
                 )
 
+            providers: List[ProcedureProvider] = validate_many(
+                ProcedureProvider, provider_rows
+            )
+
             # Sort by price (lowest first)
             providers.sort(key=lambda x: x.price_estimate)
 
@@ -160,8 +249,14 @@ class ProcedureService:
                 providers=providers,
             )
         except Exception as e:
-            # If query fails, return empty list
-            print(f"Warning: Could not fetch providers: {e}")
+            # If rows can't be parsed, return empty list
+            log_structured(
+                severity="WARNING",
+                message="Could not parse procedure providers",
+                slug=slug,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
             return ProcedureProvidersResponse(
                 procedure_name=procedure_name,
                 procedure_slug=procedure_slug,
@@ -172,72 +267,73 @@ class ProcedureService:
     async def get_procedure_orgs(self, slug: str) -> ProcedureOrgsResponse:
         """Fetch all orgs offering a specific procedure with pricing."""
 
-        # First get the procedure to verify it exists
-        proc_result = self.supabase.rpc(
-            "get_procedure_detail", {"procedure_slug_input": slug}
-        ).execute()
+        procedure_id = await resolve_procedure_id(self.supabase, slug)
+        if procedure_id is None:
+            raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
+
+        # Get the procedure and the orgs offering it concurrently
+        # Query procedure_org_pricing table
+        qx = QueryExecutor("procedure_orgs")
+        proc_result, orgs_result = await qx.gather(
+            get_procedure_detail=self._procedure_detail(slug),
+            procedure_org_pricing=upstream_calls.do(
+                ("procedure_org_pricing", procedure_id),
+                lambda: (
+                    self.supabase.table("procedure_org_pricing")
+                    .select(
+                        "procedure_id",
+                        "org_id",
+                        "carrier_id",
+                        "carrier_name",
+                        "count_provider",
+                        "min_price",
+                        "max_price",
+                        "avg_price",
+                        "org_name",
+                        "org_type",
+                        "address",
+                        "city",
+                        "state",
+                        "zip_code",
+                        "latitude",
+                        "longitude",
+                        "phone",
+                    )
+                    .eq("procedure_id", procedure_id)
+                    .execute()
+                ),
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(proc_result, Exception):
+            raise proc_result
 
         if not proc_result.data or len(proc_result.data) == 0:
             raise HTTPException(status_code=404, detail=f"Procedure '{slug}' not found")
 
         proc = proc_result.data[0]
-        procedure_id = proc["id"]
         procedure_name = proc["name"]
         procedure_slug = proc["slug"]
 
-        # Get orgs offering this procedure
-        # Query procedure_org_pricing table
-        try:
-            # Use a query to get orgs with pricing for this procedure
-            orgs_result = (
-                self.supabase.table("procedure_org_pricing")
-                .select(
-                    "procedure_id",
-                    "org_id",
-                    "carrier_id",
-                    "carrier_name",
-                    "count_provider",
-                    "min_price",
-                    "max_price",
-                    "avg_price",
-                    "org_name",
-                    "org_type",
-                    "address",
-                    "city",
-                    "state",
-                    "zip_code",
-                    "latitude",
-                    "longitude",
-                    "phone",
-                )
-                .eq("procedure_id", procedure_id)
-                .execute()
+        if isinstance(orgs_result, HTTPException):
+            raise orgs_result  # shed or circuit open: keeps its Retry-After
+        if isinstance(orgs_result, Exception):
+            # An empty list would hide the outage (and replace the last good
+            # response kept for the stale fallback), so report it as such
+            log_structured(
+                severity="ERROR",
+                message="Could not fetch procedure orgs",
+                slug=slug,
+                error_type=type(orgs_result).__name__,
+                error_message=str(orgs_result),
             )
+            raise HTTPException(status_code=503, detail="Procedure orgs temporarily unavailable")
 
-            orgs: List[ProcedureOrg] = []
-            for p in orgs_result.data:
-
-                orgs.append(
-                    ProcedureOrg(
-                        procedure_id=p.get("procedure_id"),
-                        org_id= p.get("org_id"),
-                        carrier_id= p.get("carrier_id"),
-                        carrier_name= p.get("carrier_name"),
-                        count_provider= p.get("count_provider"),
-                        min_price= p.get("min_price"),
-                        max_price= p.get("max_price"),
-                        avg_price= p.get("avg_price"),
-                        org_name= p.get("org_name"),
-                        org_type= p.get("org_type"),
-                        address= p.get("address"),
-                        city= p.get("city"),
-                        state= p.get("state"),
-                        zip_code= p.get("zip_code"),
-                        latitude= p.get("latitude"),
-                        longitude= p.get("longitude"),
-                        phone= p.get("phone"),
-                    )
-                )
+        try:
+
+            # Rows already carry exactly the ProcedureOrg fields; validate them in bulk
+            orgs: List[ProcedureOrg] = validate_many(ProcedureOrg, orgs_result.data)
 
             # Sort by price (lowest first)
             orgs.sort(key=lambda x: x.avg_price)
@@ -248,8 +344,14 @@ class ProcedureService:
                 orgs=orgs,
             )
         except Exception as e:
-            # If query fails, return empty list
-            print(f"Warning: Could not fetch orgs: {e}")
+            # If rows can't be parsed, return empty list
+            log_structured(
+                severity="WARNING",
+                message="Could not parse procedure orgs",
+                slug=slug,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
             return ProcedureOrgsResponse(
                 procedure_name=procedure_name,
                 procedure_slug=procedure_slug,
@@ -0,0 +1,249 @@
+"""
+In-memory spatial index over provider locations.
+
+Specialty provider search used to fetch ``limit * 10`` providers in
+``provider_id`` order and only then filter by distance, so nearby providers
+whose ids sort late were never seen. ``ProviderGeoIndex`` answers "locations
+of providers with a taxonomy in S within R miles of P, nearest first, top k"
+in memory; the database is only asked for the k winners' details.
+
+Layout (all NumPy arrays, no per-location Python objects):
+
+- locations: ``ids`` (fixed-width bytes), float32 ``lats``/``lons`` and
+  int32 ``orgs`` (codes from ``org_codes``; -1 for none);
+- entries: one per (location, taxonomy) pair, sorted by an int64 key of
+  (taxonomy, grid row, grid column) with ``GRID_DEGREES`` cells, and an
+  int32 location index.
+
+Because a taxonomy's cells in one grid row are adjacent in key order, a
+query reads one contiguous slice per (taxonomy in S, row the radius
+touches): two binary searches each. The taxonomy filter is therefore
+applied by the traversal itself, and the org filter on the slices'
+locations before any distance is computed. Distances and top-k use
+app/core/geo.py. Longitude ranges are clamped at ±180°, so a radius that
+crosses the antimeridian only sees one side.
+
+The corpus comes from ``get_provider_geo_corpus`` in pages of
+``PROVIDER_INDEX_PAGE_SIZE`` locations. It is built at startup and rebuilt
+when ``data_version`` changes (see app/core/catalog_index.py), always in the
+background: pages are fetched by a task on the event loop, and merging and
+indexing them run in a worker thread. Until the first build finishes,
+searches use the per-request provider queries.
+
+Environment:
+    PROVIDER_INDEX            true/false (default true; false = query provider tables per request)
+    PROVIDER_INDEX_PAGE_SIZE  locations per corpus page (default 50000)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from math import floor
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core import cache
+from app.core.catalog_index import CatalogIndexLoader
+from app.core.geo import bounding_box, nearest_within
+
+PROVIDER_INDEX = os.getenv("PROVIDER_INDEX", "true").lower() == "true"
+PROVIDER_INDEX_PAGE_SIZE = int(os.getenv("PROVIDER_INDEX_PAGE_SIZE", "50000"))
+
+# About 7 miles of latitude per cell
+GRID_DEGREES = 0.1
+GRID_ROWS = int(180 / GRID_DEGREES)
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+
+
+def grid_row(lat: float) -> int:
+    return min(GRID_ROWS - 1, max(0, floor((lat + 90) / GRID_DEGREES)))
+
+
+def grid_column(lon: float) -> int:
+    return min(GRID_COLUMNS - 1, max(0, floor((lon + 180) / GRID_DEGREES)))
+
+
+@dataclass
+class NearbyLocations:
+    """Result of a query: nearest first."""
+
+    location_ids: List[str]
+    distances: List[float]
+    total_within_radius: int
+    candidates: int
+
+
+class ProviderGeoIndex:
+    """Taxonomy-partitioned grid over provider locations."""
+
+    def __init__(self, data: Dict[str, List[Any]]):
+        """Build from columnar corpus pages merged by ``merge_pages``.
+
+        ``data`` has parallel lists ``id``, ``org_id``, ``lat``, ``lon`` and
+        ``taxonomies`` (a list of taxonomy codes per location).
+        """
+        taxonomy_codes: Dict[str, int] = {}
+        org_codes: Dict[str, int] = {}
+        ids, lats, lons, orgs = [], [], [], []
+        entry_taxonomies, entry_locations = [], []
+        for location_id, org_id, lat, lon, taxonomies in zip(
+            data["id"], data["org_id"], data["lat"], data["lon"], data["taxonomies"]
+        ):
+            if lat is None or lon is None or not taxonomies:
+                continue
+            position = len(ids)
+            ids.append(location_id)
+            lats.append(float(lat))
+            lons.append(float(lon))
+            orgs.append(org_codes.setdefault(org_id, len(org_codes)) if org_id else -1)
+            for taxonomy in taxonomies:
+                entry_taxonomies.append(taxonomy_codes.setdefault(taxonomy, len(taxonomy_codes)))
+                entry_locations.append(position)
+
+        self.ids = np.array(ids, dtype="S") if ids else np.array([], dtype="S1")
+        self.lats = np.array(lats, dtype=np.float32)
+        self.lons = np.array(lons, dtype=np.float32)
+        self.orgs = np.array(orgs, dtype=np.int32)
+        self.taxonomy_codes = taxonomy_codes
+        self.org_codes = org_codes
+
+        locations = np.array(entry_locations, dtype=np.int32)
+        lats = self.lats[locations].astype(np.float64)
+        lons = self.lons[locations].astype(np.float64)
+        rows = np.clip(np.floor((lats + 90) / GRID_DEGREES), 0, GRID_ROWS - 1)
+        columns = np.clip(np.floor((lons + 180) / GRID_DEGREES), 0, GRID_COLUMNS - 1)
+        keys = (
+            np.array(entry_taxonomies, dtype=np.int64) * (GRID_ROWS * GRID_COLUMNS)
+            + rows.astype(np.int64) * GRID_COLUMNS
+            + columns.astype(np.int64)
+        )
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.locations = locations[order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (self.ids, self.lats, self.lons, self.orgs, self.keys, self.locations)
+        )
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        radius_miles: float,
+        taxonomies: Iterable[str],
+        k: int,
+        org_ids: Optional[Iterable[str]] = None,
+    ) -> NearbyLocations:
+        """The ``k`` nearest locations with any of ``taxonomies`` within the radius."""
+        codes = sorted({self.taxonomy_codes[t] for t in taxonomies if t in self.taxonomy_codes})
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_miles)
+        first_row, last_row = grid_row(min_lat), grid_row(max_lat)
+        first_column, last_column = grid_column(min_lon), grid_column(max_lon)
+
+        slices = []
+        for code in codes:
+            base = code * (GRID_ROWS * GRID_COLUMNS)
+            for row in range(first_row, last_row + 1):
+                row_base = base + row * GRID_COLUMNS
+                start = np.searchsorted(self.keys, row_base + first_column, side="left")
+                end = np.searchsorted(self.keys, row_base + last_column, side="right")
+                if end > start:
+                    slices.append(self.locations[start:end])
+        if not slices:
+            return NearbyLocations([], [], 0, 0)
+
+        candidates = np.concatenate(slices)
+        if len(codes) > 1:
+            # A location listed under several of the taxonomies counts once
+            candidates = np.unique(candidates)
+        if org_ids is not None:
+            wanted = [self.org_codes[o] for o in org_ids if o in self.org_codes]
+            candidates = candidates[np.isin(self.orgs[candidates], wanted)]
+
+        nearest, distances, total = nearest_within(
+            lat,
+            lon,
+            self.lats[candidates].astype(np.float64),
+            self.lons[candidates].astype(np.float64),
+            radius_miles,
+            k,
+        )
+        return NearbyLocations(
+            location_ids=[location_id.decode() for location_id in self.ids[candidates[nearest]]],
+            distances=distances.tolist(),
+            total_within_radius=total,
+            candidates=int(candidates.size),
+        )
+
+
+def merge_pages(pages: List[Dict[str, List[Any]]]) -> Dict[str, List[Any]]:
+    """Concatenate columnar corpus pages."""
+    columns = ("id", "org_id", "lat", "lon", "taxonomies")
+    return {column: [value for page in pages for value in page[column]] for column in columns}
+
+
+class ProviderGeoIndexLoader(CatalogIndexLoader[ProviderGeoIndex]):
+    """Loads the corpus page by page; disabled with PROVIDER_INDEX=false."""
+
+    def __init__(self, enabled: bool = PROVIDER_INDEX, page_size: int = PROVIDER_INDEX_PAGE_SIZE):
+        super().__init__(
+            "provider_geo",
+            "get_provider_geo_corpus",
+            lambda pages: ProviderGeoIndex(merge_pages(pages)),
+            build_in_thread=True,
+        )
+        self.enabled = enabled
+        self.page_size = page_size
+        self._build_task: Optional[asyncio.Task] = None
+
+    async def get(self, supabase) -> Optional[ProviderGeoIndex]:
+        """Current index, or None; never waits for a build.
+
+        The corpus is large, so (re)builds run in the background: requests
+        keep using the previous index, or the per-request queries until the
+        first build finishes.
+        """
+        if not self.enabled:
+            return None
+        await cache.data_version.check(supabase)
+        now = time.monotonic()
+        if self.stale(now) and now >= self._retry_at and not self.building:
+            self._build_task = asyncio.create_task(super().get(supabase))
+        return self.index
+
+    @property
+    def building(self) -> bool:
+        return self._build_task is not None and not self._build_task.done()
+
+    async def _load(self, supabase) -> List[Dict[str, List[Any]]]:
+        pages = []
+        after_id = None
+        while True:
+            result = await supabase.rpc(
+                self.rpc, {"after_id": after_id, "page_size": self.page_size}
+            ).execute()
+            page = result.data
+            if not page or not page["id"]:
+                break
+            pages.append(page)
+            if len(page["id"]) < self.page_size:
+                break
+            after_id = page["id"][-1]
+        return pages
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["enabled"] = self.enabled
+        stats["building"] = self.building
+        stats["bytes"] = self.index.nbytes if self.index is not None else 0
+        return stats
+
+
+provider_geo_index = ProviderGeoIndexLoader()
@@ -1,18 +1,21 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
 from app.models import Provider, ProviderDetail, ProviderProcedurePricing, ProviderProcedureDetail
+from app.core.query_executor import QueryExecutor
+from app.core.responses import validate_many
+from app.services.procedure_service import resolve_procedure_id
 from decimal import Decimal
 
 
 class ProviderService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def get_provider(self, provider_id: str) -> ProviderDetail:
         """Fetch detailed provider information with all procedures."""
 
         # Get provider basic info and stats
-        provider_result = (
+        provider_result = await (
             self.supabase.table("provider")
             .select(
                 "provider_id",
@@ -56,10 +59,16 @@ class ProviderService:
     async def get_provider_detail(self, provider_id: str) -> ProviderDetail:
         """Fetch detailed provider information with all procedures."""
 
-        # Get provider basic info and stats
-        provider_result = self.supabase.rpc(
-            "get_provider_detail", {"provider_id_input": provider_id}
-        ).execute()
+        # Provider info/stats and the procedure list are independent lookups
+        qx = QueryExecutor("provider_detail")
+        provider_result, procedures_result = await qx.gather(
+            get_provider_detail=self.supabase.rpc(
+                "get_provider_detail", {"provider_id_input": provider_id}
+            ).execute(),
+            get_provider_procedures=self.supabase.rpc(
+                "get_provider_procedures", {"provider_id_input": provider_id}
+            ).execute(),
+        )
 
         if not provider_result.data or len(provider_result.data) == 0:
             raise HTTPException(
@@ -68,31 +77,21 @@ class ProviderService:
 
         provider = provider_result.data[0]
 
-        # Get all procedures offered by this provider
-        procedures_result = self.supabase.rpc(
-            "get_provider_procedures", {"provider_id_input": provider_id}
-        ).execute()
-
-        procedures = [
-            ProviderProcedurePricing(
-                procedure_id=proc["procedure_id"],
-                procedure_name=proc["procedure_name"],
-                procedure_slug=proc["procedure_slug"],
-                family_name=proc["family_name"],
-                family_slug=proc["family_slug"],
-                category_name=proc["category_name"],
-                category_slug=proc["category_slug"],
-                price=Decimal(str(proc["price"])),
-                carrier_id=proc["carrier_id"],
-                carrier_name=proc["carrier_name"],
-                last_updated=(
-                    proc["last_updated"].isoformat()
-                    if proc.get("last_updated")
-                    else None
-                ),
-            )
-            for proc in procedures_result.data
-        ]
+        # Validate all procedure rows in one call; pydantic coerces price to Decimal
+        procedures = validate_many(
+            ProviderProcedurePricing,
+            (
+                {
+                    **proc,
+                    "last_updated": (
+                        proc["last_updated"].isoformat()
+                        if hasattr(proc.get("last_updated"), "isoformat")
+                        else proc.get("last_updated")
+                    ),
+                }
+                for proc in procedures_result.data
+            ),
+        )
 
         return ProviderDetail(
             provider_id=provider["provider_id"],
@@ -130,24 +129,19 @@ class ProviderService:
     ) -> ProviderProcedureDetail:
         """Fetch detailed provider-procedure information with cost breakdown."""
 
-        # First get the procedure to verify it exists
-        proc_result = self.supabase.rpc(
-            "get_procedure_detail", {"procedure_slug_input": procedure_slug}
-        ).execute()
-
-        if not proc_result.data or len(proc_result.data) == 0:
+        procedure_id = await resolve_procedure_id(self.supabase, procedure_slug)
+        if procedure_id is None:
             raise HTTPException(
                 status_code=404, detail=f"Procedure '{procedure_slug}' not found"
             )
 
-        proc = proc_result.data[0]
-        procedure_id = proc["id"]
-        procedure_name = proc["name"]
-        avg_price = Decimal(str(proc["avg_price"])) if proc.get("avg_price") else None
-
-        # Get provider-procedure pricing record
-        try:
-            pricing_result = (
+        # Procedure stats and the provider's pricing record only need the id
+        qx = QueryExecutor("provider_procedure_detail")
+        proc_result, pricing_result = await qx.gather(
+            get_procedure_detail=self.supabase.rpc(
+                "get_procedure_detail", {"procedure_slug_input": procedure_slug}
+            ).execute(),
+            procedure_pricing=(
                 self.supabase.table("procedure_pricing")
                 .select(
                     "provider_id, provider_name, price"
@@ -161,8 +155,26 @@ class ProviderService:
                 # return multiple rows and the logic below doesn't handle that
                 .single()
                 .execute()
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(proc_result, Exception):
+            raise proc_result
+
+        if not proc_result.data or len(proc_result.data) == 0:
+            raise HTTPException(
+                status_code=404, detail=f"Procedure '{procedure_slug}' not found"
             )
 
+        proc = proc_result.data[0]
+        procedure_name = proc["name"]
+        avg_price = Decimal(str(proc["avg_price"])) if proc.get("avg_price") else None
+
+        try:
+            if isinstance(pricing_result, Exception):
+                raise pricing_result
+
             if not pricing_result.data:
                 raise HTTPException(
                     status_code=404,
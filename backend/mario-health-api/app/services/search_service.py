@@ -1,64 +1,113 @@
+"""
+Procedure search and typeahead suggestions.
+
+Environment:
+    SEARCH_PROCEDURES_RPC  database search function used without the search
+                           index (default search_procedures_v2; search_procedures_v3
+                           returns the same rows with a cheaper plan)
+"""
+
+import os
+
 from fastapi import HTTPException
-from supabase import Client
-from decimal import Decimal
+from supabase import AsyncClient
 from postgrest.exceptions import APIError
 
-from app.models import SearchResponse, SearchResult
+from app.core.geo import expanding_radii
+from app.core.responses import validate_many
+from app.core.result_cache import search_cache
+from app.core.singleflight import upstream_calls
+from app.models import SearchResponse, SearchResult, Suggestion, SuggestResponse
 from app.middleware.logging import log_structured
+from app.services.procedure_index import merge_price_summaries, procedure_index
+from app.services.suggest_index import suggest_index
+from app.services.zip_geocoder import zip_geocoder
+
+SEARCH_PROCEDURES_RPC = os.getenv("SEARCH_PROCEDURES_RPC", "search_procedures_v2")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace; the search RPC is case-insensitive."""
+    return " ".join(query.lower().split())
+
+
+def search_cache_key(query: str, zip_code: str | None, radius_miles: int) -> str:
+    """Cache key for a search: normalized query, ZIP and (with a ZIP) radius."""
+    if not zip_code:
+        return normalize_query(query)
+    return f"{normalize_query(query)}|{zip_code}|{radius_miles}"
 
 
 class SearchService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def search(
             self,
             query: str,
             zip_code: str | None = None,
-            radius_miles: int = 25
+            radius_miles: int = 25,
+            max_radius_miles: int | None = None
     ) -> SearchResponse:
         """Search procedures with optional location filtering.
 
-        Uses PostgreSQL full-text search + fuzzy matching for intelligent results.
-        Results are ranked by relevance score (match_score).
+        Text matching runs against the in-process procedure index and only
+        price aggregates come from the database; without the index it falls
+        back to search_procedures_v2 (full-text search + fuzzy matching in
+        PostgreSQL, or SEARCH_PROCEDURES_RPC). Results are ranked by relevance
+        score (match_score).
+
+        With a ZIP and ``max_radius_miles``, a search with no results within
+        ``radius_miles`` is repeated at doubling radii up to
+        ``max_radius_miles`` (see ``expanding_radii``), stopping at the first
+        radius with results. Every empty ring costs a full upstream search
+        on a cache miss: prices are aggregated over the whole radius, so one
+        search at the maximum cannot give a smaller ring's rows. Each radius
+        is its own search cache entry, so only repeat searches (by anyone)
+        skip rings already searched. The response reports the radius used.
         """
+        requested_radius = radius_miles
 
         try:
+            if zip_code and not await self._known_zip(zip_code):
+                # Nothing is within range of a ZIP the database doesn't have
+                rows = []
+            else:
+                radii = [radius_miles]
+                if zip_code and max_radius_miles:
+                    radii = expanding_radii(radius_miles, max_radius_miles)
+                for radius_miles in radii:
+                    rows = await self._cached_search_rows(query, zip_code, radius_miles)
+                    if rows:
+                        break
 
-            # Prepare RPC parameters
-            rpc_params = {"search_query": query}
-
-            if zip_code:
-                rpc_params["zip_code_input"] = zip_code
-                rpc_params["radius_miles"] = radius_miles
-
-            # Call the database function
-            result = self.supabase.rpc("search_procedures_v2", rpc_params).execute()
-
-            # Transform results
-            results = [
-                SearchResult(
-                    procedure_id=r["procedure_id"],
-                    procedure_name=r["procedure_name"],
-                    procedure_slug=r["procedure_slug"],
-                    family_name=r["family_name"],
-                    family_slug=r["family_slug"],
-                    category_name=r["category_name"],
-                    category_slug=r["category_slug"],
-                    best_price=Decimal(str(r["best_price"])),
-                    avg_price=Decimal(str(r["avg_price"])),
-                    price_range=f"${r['best_price']} - ${r['max_price']}",
-                    provider_count=r["provider_count"],
-                    nearest_provider=r.get("nearest_provider"),
-                    nearest_distance_miles=(
-                        float(r["nearest_distance_miles"])
-                        if r.get("nearest_distance_miles")
-                        else None
-                    ),
-                    match_score=float(r["match_score"])  # NEW: Include relevance score
-                )
-                for r in result.data
-            ]
+            # Transform results (validated in one bulk call; prices coerce to Decimal)
+            results = validate_many(
+                SearchResult,
+                (
+                    {
+                        "procedure_id": r["procedure_id"],
+                        "procedure_name": r["procedure_name"],
+                        "procedure_slug": r["procedure_slug"],
+                        "family_name": r["family_name"],
+                        "family_slug": r["family_slug"],
+                        "category_name": r["category_name"],
+                        "category_slug": r["category_slug"],
+                        "best_price": r["best_price"],
+                        "avg_price": r["avg_price"],
+                        "price_range": f"${r['best_price']} - ${r['max_price']}",
+                        "provider_count": r["provider_count"],
+                        "nearest_provider": r.get("nearest_provider"),
+                        "nearest_distance_miles": (
+                            float(r["nearest_distance_miles"])
+                            if r.get("nearest_distance_miles")
+                            else None
+                        ),
+                        "match_score": float(r["match_score"]),  # NEW: Include relevance score
+                    }
+                    for r in rows
+                ),
+            )
 
             # Log search analytics
             log_structured(
@@ -67,6 +116,7 @@ class SearchService:
                 query=query,
                 zip_code=zip_code,
                 radius_miles=radius_miles,
+                requested_radius_miles=requested_radius,
                 results_count=len(results),
                 has_results=len(results) > 0,
             )
@@ -75,6 +125,7 @@ class SearchService:
                 query=query,
                 location=zip_code,
                 radius_miles=radius_miles,
+                radius_expanded=radius_miles != requested_radius,
                 results_count=len(results),
                 results=results
             )
@@ -109,3 +160,68 @@ class SearchService:
                 error_message=str(e),
             )
             raise
+
+    async def suggest(self, query: str, limit: int = 8) -> SuggestResponse:
+        """Typeahead suggestions from the in-memory suggest index.
+
+        Only the first request after a data change (or a cold start) reaches
+        the database, to build the index.
+        """
+        index = await suggest_index.get(self.supabase)
+        if index is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Suggestions temporarily unavailable"
+            )
+
+        return SuggestResponse(
+            query=query,
+            suggestions=[
+                Suggestion(type=entry.kind, label=entry.label, slug=entry.slug, name=entry.name)
+                for entry in index.suggest(query, limit)
+            ],
+        )
+
+    async def _known_zip(self, zip_code: str) -> bool:
+        """False only when the ZIP geocoder is loaded and doesn't know ``zip_code``."""
+        geocoder = await zip_geocoder.get(self.supabase)
+        return geocoder is None or zip_code in geocoder
+
+    async def _cached_search_rows(self, query: str, zip_code: str | None, radius_miles: int) -> list:
+        """Search rows through the search cache.
+
+        Rows are shared via the search cache, and concurrent misses for the
+        same key share one upstream call.
+        """
+        rpc_params = {"search_query": normalize_query(query)}
+        if zip_code:
+            rpc_params["zip_code_input"] = zip_code
+            rpc_params["radius_miles"] = radius_miles
+
+        cache_key = search_cache_key(query, zip_code, radius_miles)
+        return await search_cache.get_or_load(
+            cache_key,
+            lambda: upstream_calls.do(
+                ("search", cache_key),
+                lambda: self._search_rows(rpc_params),
+            ),
+        )
+
+    async def _search_rows(self, rpc_params: dict) -> list:
+        index = await procedure_index.get(self.supabase)
+        if index is None:
+            result = await self.supabase.rpc(SEARCH_PROCEDURES_RPC, rpc_params).execute()
+            return result.data
+
+        matches = index.search(rpc_params["search_query"])
+        if not matches:
+            return []
+        result = await self.supabase.rpc(
+            "get_procedure_price_summaries",
+            {
+                "procedure_ids": [procedure.id for procedure, _ in matches],
+                "zip_code_input": rpc_params.get("zip_code_input"),
+                "radius_miles": rpc_params.get("radius_miles", 25),
+            },
+        ).execute()
+        return merge_price_summaries(matches, result.data)
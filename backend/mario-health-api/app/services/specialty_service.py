@@ -1,8 +1,22 @@
 from fastapi import HTTPException
-from supabase import Client
+from supabase import AsyncClient
+from postgrest.exceptions import APIError
 from decimal import Decimal
 from typing import Optional
 import os
+import numpy as np
+from app.core.geo import (
+    bounding_box,
+    coordinate_arrays,
+    expanding_radii,
+    first_ring_holding,
+    in_bounding_box,
+    nearest_within,
+)
+from app.core.concurrency import is_overload_error
+from app.core.query_executor import QueryExecutor
+from app.services.provider_geo_index import ProviderGeoIndex, provider_geo_index
+from app.services.zip_geocoder import zip_geocoder
 from app.models import (
     NuccSpecialty,
     Specialty,
@@ -22,16 +36,26 @@ USE_PROVIDER_SEARCH_MV = os.getenv("USE_PROVIDER_SEARCH_MV", "false").lower() in
     "yes",
     "on",
 )
+# find_specialty_providers ranks and prices nearby providers in one RPC;
+# false = provider, provider_location and procedure_pricing queries. Off
+# until the function is deployed; a missing or failing function falls back
+# to those queries
+USE_SPECIALTY_PROVIDERS_RPC = os.getenv("USE_SPECIALTY_PROVIDERS_RPC", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
 
 
 class SpecialtyService:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     async def get_all_specialties(self) -> SpecialtiesResponse:
         """Fetch all specialties."""
 
-        result = self.supabase.table("specialty").select("*").execute()
+        result = await self.supabase.table("specialty").select("*").execute()
 
         specialties = [
             Specialty(
@@ -52,14 +76,14 @@ class SpecialtyService:
         """Fetch all NUCC specialities mapped to a given specialty."""
 
         # Call the RPC function
-        result = self.supabase.rpc(
+        result = await self.supabase.rpc(
             "get_specialty_details",
             {"specialty_slug_input": specialty_slug},
         ).execute()
 
         if not result.data:
             # Verify specialty exists
-            specialty_check = (
+            specialty_check = await (
                 self.supabase.table("specialty")
                 .select("id")
                 .eq("slug", specialty_slug)
@@ -98,16 +122,18 @@ class SpecialtyService:
         zip_code: str,
         radius_miles: int = 25,
         limit: int = 20,
+        max_radius_miles: Optional[int] = None,
     ) -> SpecialtyProvidersResponse:
         """Fetch providers for a specialty with location filtering and pricing.
 
         Query flow:
         1. Validate specialty exists
-        2. Resolve zip code to coordinates
+        2. Resolve zip code to coordinates (in memory via the ZIP geocoder;
+           unknown ZIPs are rejected before any query)
         3. Find providers via specialty → specialty_map → taxonomy → provider
         4. Apply bounding-box prefilter on provider_location (performance)
-        5. Calculate haversine distance and filter by radius
-        6. Sort by distance, limit to top N
+        5. Calculate haversine distance and filter by radius (vectorized, app/core/geo.py)
+        6. Select the nearest N (partial selection, not a full sort)
         7. Join pricing data via organization (org_id)
         8. Optional: if USE_PROVIDER_SEARCH_MV is enabled, read from provider_search_mv
 
@@ -127,20 +153,46 @@ class SpecialtyService:
             zip_code: Search center ZIP code (required)
             radius_miles: Search radius in miles (default: 25, max: 100)
             limit: Max providers to return (default: 20, max: 100)
+            max_radius_miles: If set, widen the radius (doubling) up to this
+                until ``limit`` providers are found; metadata.search_radius
+                reports the radius used
 
         Returns:
             SpecialtyProvidersResponse with providers sorted by distance
         """
 
-        # Step 1: Verify specialty exists and get specialty info
-        specialty_result = (
+        specialty_query = (
             self.supabase.table("specialty")
             .select("id, name, slug")
             .eq("slug", specialty_slug)
             .limit(1)
-            .execute()
         )
+        geocoder = await zip_geocoder.get(self.supabase)
+        if geocoder is not None:
+            # Step 2 first, in memory: unknown ZIPs never reach the database
+            coordinates = geocoder.lookup(zip_code)
+            if coordinates is None:
+                raise HTTPException(
+                    status_code=400, detail=f"ZIP code '{zip_code}' not found"
+                )
+            search_lat, search_lon = coordinates
+            specialty_result = await specialty_query.execute()
+        else:
+            # Steps 1-2 are independent: look up the specialty and the ZIP together
+            qx = QueryExecutor("specialty_lookup")
+            specialty_result, zip_result = await qx.gather(
+                specialty=specialty_query.execute(),
+                zip_codes=(
+                    self.supabase.table("zip_codes")
+                    .select("zip_code, latitude, longitude, location")
+                    .eq("zip_code", zip_code)
+                    .limit(1)
+                    .execute()
+                ),
+            )
+            zip_data = zip_result.data[0] if zip_result.data else None
 
+        # Step 1: Verify specialty exists and get specialty info
         if not specialty_result.data:
             raise HTTPException(
                 status_code=404, detail=f"Specialty '{specialty_slug}' not found"
@@ -150,22 +202,13 @@ class SpecialtyService:
         specialty_id = specialty_data["id"]
 
         # Step 2: Validate zip code exists
-        zip_result = (
-            self.supabase.table("zip_codes")
-            .select("zip_code, latitude, longitude, location")
-            .eq("zip_code", zip_code)
-            .limit(1)
-            .execute()
-        )
-
-        if not zip_result.data:
-            raise HTTPException(
-                status_code=400, detail=f"ZIP code '{zip_code}' not found"
-            )
-
-        zip_data = zip_result.data[0]
-        search_lat = float(zip_data["latitude"])
-        search_lon = float(zip_data["longitude"])
+        if geocoder is None:
+            if zip_data is None:
+                raise HTTPException(
+                    status_code=400, detail=f"ZIP code '{zip_code}' not found"
+                )
+            search_lat = float(zip_data["latitude"])
+            search_lon = float(zip_data["longitude"])
 
         # Step 3: Query providers with pricing
         # Uses multiple efficient queries to avoid N+1:
@@ -173,12 +216,13 @@ class SpecialtyService:
         # 2. Get nearby provider locations (1 query)
         # 3. Get pricing for representative procedure (1 query)
         # 4. Aggregate and filter in Python
-        providers, total_providers_found = await self._get_specialty_providers_query(
+        providers, total_providers_found, search_radius = await self._get_specialty_providers_query(
             specialty_id=specialty_id,
             search_lat=search_lat,
             search_lon=search_lon,
             radius_miles=radius_miles,
             limit=limit,
+            max_radius_miles=max_radius_miles,
         )
 
         # Calculate pricing coverage for metadata
@@ -200,7 +244,8 @@ class SpecialtyService:
             metadata=SpecialtyProvidersMetadata(
                 total_providers_found=total_providers_found,
                 providers_returned=providers_returned,
-                search_radius=radius_miles,
+                search_radius=search_radius,
+                radius_expanded=search_radius != radius_miles,
                 providers_with_pricing=providers_with_pricing,
                 pricing_coverage_pct=pricing_coverage_pct,
             ),
@@ -213,52 +258,389 @@ class SpecialtyService:
         search_lon: float,
         radius_miles: int,
         limit: int,
-    ) -> tuple[list[SpecialtyProvider], int]:
+        max_radius_miles: Optional[int] = None,
+    ) -> tuple[list[SpecialtyProvider], int, int]:
         """Query providers using efficient PostgREST queries.
 
         This still avoids N+1 queries by:
-        1. Getting all taxonomy codes for specialty (1 query)
-        2. Getting all providers with matching specialty_id (1 query)
-        3. Getting all locations for those providers (1 query)
-        4. Getting all pricing for representative procedure (1 query)
-        5. Aggregating and filtering in Python
+        1. Getting taxonomy codes and the representative procedure for the
+           specialty (2 concurrent queries)
+        2. Finding the nearest locations with one of those taxonomies, from
+           the in-memory provider index plus one query for their details, or
+           else from find_specialty_providers (1 RPC, which also returns the
+           pricing) or the provider and provider_location tables (2 queries)
+        3. Getting all pricing for representative procedure (1 query, skipped
+           after the RPC)
+        4. Aggregating and filtering in Python
+
+        Steps 2-3 each depend on the previous step's rows, so they run in series.
+
+        With ``max_radius_miles``, the search widens through doubling radii
+        (see ``expanding_radii``) and stops at the first ring holding
+        ``limit`` locations, or the maximum. The index and the RPC are
+        searched once at the maximum and the ring is picked from those
+        distances, so step 2 costs the same for any number of rings (the
+        RPC path adds one call when it needs the ring's own count). Only
+        the provider and provider_location table queries are repeated per
+        ring. Pricing is fetched once, for the ring returned.
 
         Returns:
-            Tuple of (providers_list, total_found_within_radius)
+            Tuple of (providers_list, total_found_within_radius, radius_used)
         """
 
-        # Get taxonomy codes for this specialty
-        taxonomy_result = (
-            self.supabase.table("specialty_map")
-            .select("taxonomy_id")
-            .eq("specialty_id", specialty_id)
-            .execute()
+        # Taxonomy codes and the representative procedure both key off the
+        # specialty only, so fetch them together
+        qx = QueryExecutor("specialty_providers")
+        taxonomy_result, proc_map_result = await qx.gather(
+            specialty_map=(
+                self.supabase.table("specialty_map")
+                .select("taxonomy_id")
+                .eq("specialty_id", specialty_id)
+                .execute()
+            ),
+            specialty_procedure_map=(
+                self.supabase.table("specialty_procedure_map")
+                .select("procedure_id")
+                .eq("specialty_id", specialty_id)
+                .eq("is_representative", True)
+                .eq("visit_type", "standard")
+                .limit(1)
+                .execute()
+            ),
         )
 
         taxonomy_codes = [row["taxonomy_id"] for row in taxonomy_result.data]
 
         if not taxonomy_codes:
-            return [], 0
-
-        # Get representative procedure for this specialty
-        proc_map_result = (
-            self.supabase.table("specialty_procedure_map")
-            .select("procedure_id")
-            .eq("specialty_id", specialty_id)
-            .eq("is_representative", True)
-            .eq("visit_type", "standard")
-            .limit(1)
-            .execute()
-        )
+            return [], 0, radius_miles
 
         representative_procedure_id = None
         if proc_map_result.data:
             representative_procedure_id = proc_map_result.data[0]["procedure_id"]
 
+        index = await provider_geo_index.get(self.supabase)
+        radii = expanding_radii(radius_miles, max_radius_miles or radius_miles)
+        pricing_map = None  # Map org_id -> pricing data
+        nearby_locations = None
+        if index is not None:
+            nearby_locations, total_within_radius, search_radius = await self._indexed_nearby_locations(
+                index, specialty_id, taxonomy_codes, search_lat, search_lon, radii, limit
+            )
+        elif USE_SPECIALTY_PROVIDERS_RPC and not USE_PROVIDER_SEARCH_MV:
+            try:
+                (
+                    nearby_locations,
+                    total_within_radius,
+                    pricing_map,
+                    search_radius,
+                ) = await self._rpc_nearby_locations(
+                    specialty_id, search_lat, search_lon, radii, limit, representative_procedure_id
+                )
+            except APIError as e:
+                if is_overload_error(e):
+                    raise
+                # Not deployed yet (PGRST202) or broken: the table queries still work
+                from app.middleware.logging import log_structured
+
+                log_structured(
+                    severity="WARNING",
+                    message="find_specialty_providers failed, querying provider tables",
+                    specialty_id=specialty_id,
+                    error_code=getattr(e, "code", "unknown"),
+                    error_details=str(e),
+                )
+        if nearby_locations is None:
+            for search_radius in radii:
+                nearby_locations, total_within_radius = await self._queried_nearby_locations(
+                    specialty_id, taxonomy_codes, search_lat, search_lon, search_radius, limit
+                )
+                if len(nearby_locations) >= limit:
+                    break
+
+        if search_radius != radius_miles:
+            from app.middleware.logging import log_structured
+
+            log_structured(
+                severity="INFO",
+                message="Specialty provider search radius expanded",
+                specialty_id=specialty_id,
+                requested_radius_miles=radius_miles,
+                search_radius_miles=search_radius,
+                max_radius_miles=max_radius_miles,
+                returned=len(nearby_locations),
+            )
+
+        # Collect org_ids (not provider_ids) for pricing join
+        org_ids_with_location = {}  # Map org_id -> location data
+        for loc in nearby_locations:
+            if loc.get("org_id"):
+                org_ids_with_location[loc["org_id"]] = loc
+
+        if not nearby_locations:
+            return [], 0, search_radius
+
+        # Get pricing for these organizations (single query), unless the RPC
+        # already joined it. Pricing is associated with org_id in
+        # procedure_pricing, not provider_id
+        priced = pricing_map is not None
+        pricing_map = pricing_map or {}
+        if not priced and representative_procedure_id and org_ids_with_location:
+            org_ids_list = list(org_ids_with_location.keys())
+            pricing_result = await (
+                self.supabase.table("procedure_pricing")
+                .select("org_id, price")
+                .eq("procedure_id", representative_procedure_id)
+                .in_("org_id", org_ids_list)
+                .execute()
+            )
+
+            # Aggregate pricing per organization
+            from collections import defaultdict
+
+            org_prices = defaultdict(list)
+            for p in pricing_result.data:
+                if p.get("org_id"):
+                    org_prices[p["org_id"]].append(float(p["price"]))
+
+            for org_id, prices in org_prices.items():
+                pricing_map[org_id] = {
+                    "min_price": min(prices),
+                    "max_price": max(prices),
+                    "avg_price": sum(prices) / len(prices),
+                }
+
+        # Build final provider list
+        providers = []
+        providers_with_pricing = 0
+
+        for loc in nearby_locations:
+            provider_id = loc["provider_id"]
+            org_id = loc.get("org_id")
+
+            location = ProviderLocation(
+                address=loc.get("address"),
+                city=loc.get("city"),
+                state=loc.get("state"),
+                zip_code=loc.get("zip_code"),
+                distance_miles=round(loc["distance"], 1),
+            )
+
+            # Join pricing by org_id (pricing is at organization level)
+            pricing = None
+            if org_id and org_id in pricing_map:
+                p = pricing_map[org_id]
+                pricing = ProviderPricing(
+                    min_price=Decimal(str(p["min_price"])),
+                    max_price=Decimal(str(p["max_price"])),
+                    avg_price=Decimal(str(p["avg_price"])),
+                )
+                providers_with_pricing += 1
+
+            providers.append(
+                SpecialtyProvider(
+                    provider_id=provider_id,
+                    provider_name=loc["provider_name"],
+                    location=location,
+                    pricing=pricing,
+                )
+            )
+
+        # Debug logging for pricing coverage
+        from app.middleware.logging import log_structured
+
+        log_structured(
+            severity="DEBUG",
+            message="Specialty provider pricing aggregation",
+            specialty_id=specialty_id,
+            total_providers=len(providers),
+            providers_with_pricing=providers_with_pricing,
+            pricing_coverage_pct=(
+                round(providers_with_pricing / len(providers) * 100, 1)
+                if providers
+                else 0
+            ),
+        )
+
+        return providers, total_within_radius, search_radius
+
+    async def _indexed_nearby_locations(
+        self,
+        index: ProviderGeoIndex,
+        specialty_id: str,
+        taxonomy_codes: list[str],
+        search_lat: float,
+        search_lon: float,
+        radii: list[int],
+        limit: int,
+    ) -> tuple[list[dict], int, int]:
+        """Nearest locations from the in-memory index, then their details (1 query).
+
+        The index is searched once at the largest of ``radii``; the radius
+        used is the first ring holding ``limit`` of those hits, which then
+        holds all of them.
+
+        Returns:
+            Tuple of (nearby_locations, total_within_radius, radius_used)
+        """
+        hits = index.nearest(search_lat, search_lon, radii[-1], taxonomy_codes, limit)
+        radius_miles = first_ring_holding(radii, hits.distances, limit)
+        total_within_radius = hits.total_within_radius
+        if radius_miles != radii[-1]:
+            total_within_radius = index.nearest(
+                search_lat, search_lon, radius_miles, taxonomy_codes, limit
+            ).total_within_radius
+
+        rows_by_id = {}
+        if hits.location_ids:
+            location_result = await (
+                self.supabase.table("provider_location")
+                .select("id, provider_id, provider_name, org_id, address, city, state, zip_code")
+                .in_("id", hits.location_ids)
+                .execute()
+            )
+            rows_by_id = {row["id"]: row for row in location_result.data}
+
+        nearby_locations = []
+        for location_id, distance in zip(hits.location_ids, hits.distances):
+            loc = rows_by_id.get(location_id)
+            if loc is None:
+                # Deleted since the index was built
+                continue
+            nearby_locations.append(
+                {
+                    "provider_id": loc["provider_id"],
+                    "org_id": loc.get("org_id"),
+                    "provider_name": loc.get("provider_name") or "Unknown Provider",
+                    "address": loc.get("address"),
+                    "city": loc.get("city"),
+                    "state": loc.get("state"),
+                    "zip_code": loc.get("zip_code"),
+                    "distance": distance,
+                }
+            )
+
+        from app.middleware.logging import log_structured
+
+        log_structured(
+            severity="INFO",
+            message="Specialty provider search funnel",
+            specialty_id=specialty_id,
+            candidate_locations=hits.candidates,
+            within_radius=total_within_radius,
+            returned_after_limit=len(nearby_locations),
+            search_radius_miles=radius_miles,
+            limit=limit,
+            provider_geo_index=True,
+        )
+
+        return nearby_locations, total_within_radius, radius_miles
+
+    async def _rpc_nearby_locations(
+        self,
+        specialty_id: str,
+        search_lat: float,
+        search_lon: float,
+        radii: list[int],
+        limit: int,
+        representative_procedure_id: Optional[str],
+    ) -> tuple[list[dict], int, dict, int]:
+        """Nearest locations and their org pricing from find_specialty_providers (1 RPC).
+
+        The database joins specialty_map, provider and provider_location,
+        ranks with a KNN scan of the provider_location GIST index and joins
+        the representative procedure's prices by org_id.
+
+        The RPC is called at the largest of ``radii``; the radius used is
+        the first ring holding ``limit`` of its rows. Those rows are the
+        ring's too, but total_within_radius counts the largest radius, so
+        when more locations lie beyond a smaller ring it is called again at
+        that ring (2 RPCs). Counting at the largest radius costs more than
+        at the first ring where locations are dense.
+
+        Returns:
+            Tuple of (nearby_locations, total_within_radius, pricing_map, radius_used)
+        """
+
+        async def find(radius_miles: int) -> list[dict]:
+            result = await self.supabase.rpc(
+                "find_specialty_providers",
+                {
+                    "specialty_id_input": specialty_id,
+                    "search_lat": search_lat,
+                    "search_lon": search_lon,
+                    "radius_miles": radius_miles,
+                    "result_limit": limit,
+                    "procedure_id_input": representative_procedure_id,
+                },
+            ).execute()
+            return result.data or []
+
+        rows = await find(radii[-1])
+        radius_miles = first_ring_holding(
+            radii, [float(row["distance_miles"]) for row in rows], limit
+        )
+        if rows and radius_miles != radii[-1] and rows[0]["total_within_radius"] > len(rows):
+            rows = await find(radius_miles)
+
+        nearby_locations = []
+        pricing_map = {}
+        for row in rows:
+            nearby_locations.append(
+                {
+                    "provider_id": row["provider_id"],
+                    "org_id": row.get("org_id"),
+                    "provider_name": row.get("provider_name") or "Unknown Provider",
+                    "address": row.get("address"),
+                    "city": row.get("city"),
+                    "state": row.get("state"),
+                    "zip_code": row.get("zip_code"),
+                    "distance": float(row["distance_miles"]),
+                }
+            )
+            if row.get("org_id") and row.get("min_price") is not None:
+                pricing_map[row["org_id"]] = {
+                    "min_price": float(row["min_price"]),
+                    "max_price": float(row["max_price"]),
+                    "avg_price": float(row["avg_price"]),
+                }
+        total_within_radius = rows[0]["total_within_radius"] if rows else 0
+
+        from app.middleware.logging import log_structured
+
+        log_structured(
+            severity="INFO",
+            message="Specialty provider search funnel",
+            specialty_id=specialty_id,
+            within_radius=total_within_radius,
+            returned_after_limit=len(nearby_locations),
+            search_radius_miles=radius_miles,
+            limit=limit,
+            use_specialty_providers_rpc=True,
+        )
+
+        return nearby_locations, total_within_radius, pricing_map, radius_miles
+
+    async def _queried_nearby_locations(
+        self,
+        specialty_id: str,
+        taxonomy_codes: list[str],
+        search_lat: float,
+        search_lon: float,
+        radius_miles: int,
+        limit: int,
+    ) -> tuple[list[dict], int]:
+        """Nearest locations from per-request provider queries.
+
+        Fetches ``limit * 10`` providers in id order (1 query), then their
+        locations inside the bounding box (1 query), and ranks by distance.
+        Nearby providers beyond the first ``limit * 10`` are missed; this is
+        the path with USE_PROVIDER_SEARCH_MV or USE_SPECIALTY_PROVIDERS_RPC=false
+        while the provider index is disabled or not built yet.
+        """
         # Get providers with matching specialty_id (which corresponds to taxonomy_id)
         # Fetch more than needed to account for distance filtering
         if USE_PROVIDER_SEARCH_MV:
-            provider_result = (
+            provider_result = await (
                 self.supabase.table("provider_search_mv")
                 .select(
                     "provider_id, first_name, last_name, credential, specialty_id, "
@@ -270,7 +652,7 @@ class SpecialtyService:
                 .execute()
             )
         else:
-            provider_result = (
+            provider_result = await (
                 self.supabase.table("provider")
                 .select("provider_id, first_name, last_name, credential, specialty_id")
                 .in_("specialty_id", taxonomy_codes)
@@ -309,21 +691,12 @@ class SpecialtyService:
             return [], 0
 
         # Calculate bounding box for performance optimization
-        # Approximate: 1 degree latitude ≈ 69 miles, 1 degree longitude ≈ 69 * cos(lat) miles
-        from math import cos, radians
-
-        lat_delta = radius_miles / 69.0
-        lng_delta = radius_miles / (69.0 * abs(cos(radians(search_lat))))
-
-        min_lat = search_lat - lat_delta
-        max_lat = search_lat + lat_delta
-        min_lng = search_lon - lng_delta
-        max_lng = search_lon + lng_delta
+        min_lat, max_lat, min_lng, max_lng = bounding_box(search_lat, search_lon, radius_miles)
 
         # Debug logging for bbox and zip resolution (helps diagnose radius anomalies)
         from app.middleware.logging import log_structured
         log_structured(
-            severity="INFO",
+            severity="DEBUG",
             message="Specialty provider bbox debug",
             specialty_id=specialty_id,
             search_lat=search_lat,
@@ -339,16 +712,12 @@ class SpecialtyService:
         # Apply bounding box prefilter for performance
         if USE_PROVIDER_SEARCH_MV:
             # Data already includes location/org info; apply bbox in-memory
-            location_rows = [
-                row
-                for row in provider_result.data
-                if row.get("latitude") is not None
-                and row.get("longitude") is not None
-                and min_lat <= float(row["latitude"]) <= max_lat
-                and min_lng <= float(row["longitude"]) <= max_lng
-            ]
+            lats, lons = coordinate_arrays(provider_result.data)
+            in_box = np.flatnonzero(in_bounding_box(lats, lons, (min_lat, max_lat, min_lng, max_lng)))
+            location_rows = [provider_result.data[i] for i in in_box]
+            lats, lons = lats[in_box], lons[in_box]
         else:
-            location_result = (
+            location_result = await (
                 self.supabase.table("provider_location")
                 .select(
                     "provider_id, provider_name, org_id, address, city, state, zip_code, latitude, longitude"
@@ -361,6 +730,7 @@ class SpecialtyService:
                 .execute()
             )
             location_rows = location_result.data
+            lats, lons = coordinate_arrays(location_rows)
 
         bbox_filtered_count = len(location_rows)
 
@@ -378,56 +748,26 @@ class SpecialtyService:
                 use_provider_search_mv=USE_PROVIDER_SEARCH_MV,
             )
 
-        # Calculate distances and filter by radius
-        from math import radians, sin, cos, sqrt, atan2
-
-        def haversine_distance(
-            lat1: float, lon1: float, lat2: float, lon2: float
-        ) -> float:
-            """Calculate distance between two points using Haversine formula (in miles)."""
-            R = 3958.8  # Earth radius in miles
-
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-
-            a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-            c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-            return R * c
-
+        # Haversine distances, radius filter and top-N over whole arrays
+        nearest, distances, total_within_radius = nearest_within(
+            search_lat, search_lon, lats, lons, radius_miles, limit
+        )
         nearby_locations = []
-        for loc in location_rows:
-            if loc.get("latitude") and loc.get("longitude"):
-                distance = haversine_distance(
-                    search_lat,
-                    search_lon,
-                    float(loc["latitude"]),
-                    float(loc["longitude"]),
-                )
-                if distance <= radius_miles:
-                    nearby_locations.append(
-                        {
-                            "provider_id": loc["provider_id"],
-                            "org_id": loc.get(
-                                "org_id"
-                            ),  # Include org_id for pricing join
-                            "provider_name": loc.get("provider_name")
-                            or provider_name_map.get(
-                                loc["provider_id"], "Unknown Provider"
-                            ),
-                            "address": loc.get("address"),
-                            "city": loc.get("city"),
-                            "state": loc.get("state"),
-                            "zip_code": loc.get("zip_code"),
-                            "distance": distance,
-                        }
-                    )
-
-        # Sort by distance and limit
-        nearby_locations.sort(key=lambda x: x["distance"])
-        total_within_radius = len(nearby_locations)
-        nearby_locations = nearby_locations[:limit]
+        for i, distance in zip(nearest.tolist(), distances.tolist()):
+            loc = location_rows[i]
+            nearby_locations.append(
+                {
+                    "provider_id": loc["provider_id"],
+                    "org_id": loc.get("org_id"),  # Include org_id for pricing join
+                    "provider_name": loc.get("provider_name")
+                    or provider_name_map.get(loc["provider_id"], "Unknown Provider"),
+                    "address": loc.get("address"),
+                    "city": loc.get("city"),
+                    "state": loc.get("state"),
+                    "zip_code": loc.get("zip_code"),
+                    "distance": distance,
+                }
+            )
 
         # Log search funnel metrics (counts should be monotonic w.r.t radius)
         from app.middleware.logging import log_structured
@@ -445,93 +785,4 @@ class SpecialtyService:
             use_provider_search_mv=USE_PROVIDER_SEARCH_MV,
         )
 
-        # Collect org_ids (not provider_ids) for pricing join
-        org_ids_with_location = {}  # Map org_id -> location data
-        for loc in nearby_locations:
-            if loc.get("org_id"):
-                org_ids_with_location[loc["org_id"]] = loc
-
-        if not nearby_locations:
-            return [], 0
-
-        # Get pricing for these organizations (single query)
-        # Pricing is associated with org_id in procedure_pricing, not provider_id
-        pricing_map = {}  # Map org_id -> pricing data
-        if representative_procedure_id and org_ids_with_location:
-            org_ids_list = list(org_ids_with_location.keys())
-            pricing_result = (
-                self.supabase.table("procedure_pricing")
-                .select("org_id, price")
-                .eq("procedure_id", representative_procedure_id)
-                .in_("org_id", org_ids_list)
-                .execute()
-            )
-
-            # Aggregate pricing per organization
-            from collections import defaultdict
-
-            org_prices = defaultdict(list)
-            for p in pricing_result.data:
-                if p.get("org_id"):
-                    org_prices[p["org_id"]].append(float(p["price"]))
-
-            for org_id, prices in org_prices.items():
-                pricing_map[org_id] = {
-                    "min_price": min(prices),
-                    "max_price": max(prices),
-                    "avg_price": sum(prices) / len(prices),
-                }
-
-        # Build final provider list
-        providers = []
-        providers_with_pricing = 0
-
-        for loc in nearby_locations:
-            provider_id = loc["provider_id"]
-            org_id = loc.get("org_id")
-
-            location = ProviderLocation(
-                address=loc.get("address"),
-                city=loc.get("city"),
-                state=loc.get("state"),
-                zip_code=loc.get("zip_code"),
-                distance_miles=round(loc["distance"], 1),
-            )
-
-            # Join pricing by org_id (pricing is at organization level)
-            pricing = None
-            if org_id and org_id in pricing_map:
-                p = pricing_map[org_id]
-                pricing = ProviderPricing(
-                    min_price=Decimal(str(p["min_price"])),
-                    max_price=Decimal(str(p["max_price"])),
-                    avg_price=Decimal(str(p["avg_price"])),
-                )
-                providers_with_pricing += 1
-
-            providers.append(
-                SpecialtyProvider(
-                    provider_id=provider_id,
-                    provider_name=loc["provider_name"],
-                    location=location,
-                    pricing=pricing,
-                )
-            )
-
-        # Debug logging for pricing coverage
-        from app.middleware.logging import log_structured
-
-        log_structured(
-            severity="INFO",
-            message="Specialty provider pricing aggregation",
-            specialty_id=specialty_id,
-            total_providers=len(providers),
-            providers_with_pricing=providers_with_pricing,
-            pricing_coverage_pct=(
-                round(providers_with_pricing / len(providers) * 100, 1)
-                if providers
-                else 0
-            ),
-        )
-
-        return providers, total_within_radius
+        return nearby_locations, total_within_radius
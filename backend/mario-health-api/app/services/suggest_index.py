@@ -0,0 +1,111 @@
+"""
+Typeahead suggestions served from memory.
+
+The search box asks for suggestions on every keystroke, so
+``GET /api/v1/search/suggest`` never queries the database per request. It
+looks the prefix up in ``SuggestIndex``, a sorted-array prefix index over:
+
+- procedure names and common names;
+- CPT/HCPCS codes from ``procedure_billing_code`` (pointing at their procedure);
+- specialty names (``is_used`` specialties only);
+- hospital names and their aliases from ``hospital_aliases``.
+
+Each label is stored under its normalized text and under every suffix that
+starts a word, so "mri" suggests "Brain MRI" and "presby" suggests
+"New York-Presbyterian Hospital". The keys live in one sorted list and a
+lookup is a bisect plus a short forward scan: no trie nodes, just flat
+arrays for a few thousand labels.
+
+The corpus comes from ``get_suggestion_corpus`` (one JSON document, so
+PostgREST's row limit doesn't apply) and is rebuilt when ``data_version``
+changes; see app/core/catalog_index.py.
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from app.core.catalog_index import CatalogIndexLoader
+from app.services.procedure_index import words
+
+# Lower sorts first when two suggestions match equally well
+KIND_PRIORITY = {"procedure": 0, "specialty": 1, "hospital": 2, "billing_code": 3}
+# Keys examined per lookup; bounds the cost of one-letter prefixes
+MAX_SCAN = 256
+
+
+@dataclass(frozen=True)
+class SuggestEntry:
+    """One suggestion: the matched label and what it points at."""
+
+    kind: str
+    label: str
+    slug: str
+    name: str
+
+
+class SuggestIndex:
+    """Sorted-array prefix index over suggestion labels."""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.entries: List[SuggestEntry] = []
+        label_lengths = []
+        seen = set()
+        pairs = []
+        for row in rows:
+            label = (row.get("label") or "").strip()
+            normalized = " ".join(words(label))
+            if not normalized or row.get("kind") not in KIND_PRIORITY:
+                continue
+            entry = SuggestEntry(row["kind"], label, row["slug"], row.get("name") or label)
+            if (entry.kind, normalized, entry.slug) in seen:
+                continue
+            seen.add((entry.kind, normalized, entry.slug))
+
+            position = len(self.entries)
+            self.entries.append(entry)
+            label_lengths.append(len(normalized))
+            tokens = normalized.split(" ")
+            for start in range(len(tokens)):
+                pairs.append((" ".join(tokens[start:]), position))
+
+        pairs.sort()
+        self._keys: List[str] = [key for key, _ in pairs]
+        self._positions = array("I", (position for _, position in pairs))
+        self._label_lengths = array("I", label_lengths)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def suggest(self, query: str, limit: int = 8) -> List[SuggestEntry]:
+        """Best ``limit`` entries with a word starting with ``query``."""
+        prefix = " ".join(words(query))
+        if not prefix:
+            return []
+
+        best: Dict[tuple, tuple] = {}
+        start = bisect_left(self._keys, prefix)
+        for i in range(start, min(start + MAX_SCAN, len(self._keys))):
+            key = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            position = self._positions[i]
+            entry = self.entries[position]
+            rank = (
+                key != prefix,  # the whole remaining label matched
+                len(key) != self._label_lengths[position],  # match at the label's start
+                KIND_PRIORITY[entry.kind],
+                entry.label != entry.name,  # canonical names before aliases
+                len(entry.label),
+                entry.label,
+            )
+            target = (entry.kind, entry.slug)
+            if target not in best or rank < best[target][0]:
+                best[target] = (rank, entry)
+
+        ranked = sorted(best.values(), key=lambda item: item[0])
+        return [entry for _, entry in ranked[:limit]]
+
+
+suggest_index = CatalogIndexLoader("suggest", "get_suggestion_corpus", SuggestIndex)
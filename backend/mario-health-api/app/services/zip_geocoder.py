@@ -0,0 +1,180 @@
+"""
+ZIP code to coordinates, in memory.
+
+Location requests used to resolve the search ZIP with a round trip to
+``zip_codes`` every time. ``ZipGeocoder`` holds that whole table as three
+parallel packed arrays sorted by ZIP:
+
+- ``zips``: the ZIP as an unsigned int ("02138" -> 2138);
+- ``latitudes`` / ``longitudes``: float32, well under a metre of error.
+
+That is 12 bytes per ZIP (about 0.5 MB for the US), and a lookup is one
+bisect. Unknown ZIPs are rejected without touching the database.
+
+The arrays come from a snapshot file when ``ZIP_SNAPSHOT_PATH`` points at
+one (written after each sync by
+bigquery-to-postgres/scripts/export_zip_snapshot.py), otherwise from the
+``get_zip_centroids`` RPC. The geocoder is loaded at startup and, like the
+catalog indexes, reloaded when ``data_version`` changes (see
+app/core/catalog_index.py). While it can't be loaded, callers query
+``zip_codes`` as before.
+
+Snapshot format (little-endian):
+    8 bytes           magic b"MZIPGEO1"
+    uint32            count
+    count x uint32    ZIPs, ascending
+    count x float32   latitudes
+    count x float32   longitudes
+
+Environment:
+    ZIP_SNAPSHOT_PATH  snapshot file to load from (default: load from the database)
+"""
+
+import asyncio
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.catalog_index import CatalogIndexLoader
+from app.middleware.logging import log_structured
+
+ZIP_SNAPSHOT_PATH = os.getenv("ZIP_SNAPSHOT_PATH", "")
+
+SNAPSHOT_MAGIC = b"MZIPGEO1"
+# Decimal places kept from the float32 coordinates (about 1 m)
+COORDINATE_DIGITS = 5
+
+
+def zip_number(zip_code: str) -> Optional[int]:
+    """``"02138"`` -> 2138; None unless ``zip_code`` is five ASCII digits."""
+    if len(zip_code) != 5 or not zip_code.isascii() or not zip_code.isdigit():
+        return None
+    return int(zip_code)
+
+
+class ZipGeocoder:
+    """Sorted ZIP array with parallel float32 latitude/longitude arrays."""
+
+    def __init__(self, zips: array, latitudes: array, longitudes: array):
+        if not len(zips) == len(latitudes) == len(longitudes):
+            raise ValueError("ZIP columns have different lengths")
+        if any(a >= b for a, b in zip(zips, zips[1:])):
+            raise ValueError("ZIPs must be unique and ascending")
+        self.zips = zips
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+
+    @classmethod
+    def from_columns(cls, data: Dict[str, Any]) -> "ZipGeocoder":
+        """From get_zip_centroids' ``{"zip": [...], "lat": [...], "lon": [...]}``."""
+        coordinates = {}
+        for zip_code, lat, lon in zip(data["zip"], data["lat"], data["lon"]):
+            number = zip_number(zip_code or "")
+            if number is not None and lat is not None and lon is not None:
+                coordinates.setdefault(number, (float(lat), float(lon)))
+        ordered = sorted(coordinates.items())
+        return cls(
+            array("I", (number for number, _ in ordered)),
+            array("f", (lat for _, (lat, _) in ordered)),
+            array("f", (lon for _, (_, lon) in ordered)),
+        )
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "ZipGeocoder":
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a ZIP snapshot")
+        (count,) = struct.unpack_from("<I", data, len(SNAPSHOT_MAGIC))
+        offset = len(SNAPSHOT_MAGIC) + 4
+        columns = []
+        for typecode in ("I", "f", "f"):
+            column = array(typecode)
+            end = offset + count * column.itemsize
+            if end > len(data):
+                raise ValueError(f"{path} is truncated")
+            column.frombytes(data[offset:end])
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+            offset = end
+        return cls(*columns)
+
+    def write_snapshot(self, path: str) -> None:
+        """Write the snapshot format, atomically replacing ``path``."""
+        columns = [array(c.typecode, c) for c in (self.zips, self.latitudes, self.longitudes)]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack("<I", len(self.zips)))
+            for column in columns:
+                f.write(column.tobytes())
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return len(self.zips)
+
+    def __contains__(self, zip_code: str) -> bool:
+        return self.lookup(zip_code) is not None
+
+    def lookup(self, zip_code: str) -> Optional[Tuple[float, float]]:
+        """(latitude, longitude) of ``zip_code``, or None if it isn't a known ZIP."""
+        number = zip_number(zip_code)
+        if number is None:
+            return None
+        i = bisect_left(self.zips, number)
+        if i == len(self.zips) or self.zips[i] != number:
+            return None
+        return (
+            round(self.latitudes[i], COORDINATE_DIGITS),
+            round(self.longitudes[i], COORDINATE_DIGITS),
+        )
+
+
+def build_geocoder(data: Any) -> ZipGeocoder:
+    if isinstance(data, ZipGeocoder):
+        geocoder = data
+    else:
+        geocoder = ZipGeocoder.from_columns(data)
+    if not geocoder:
+        raise ValueError("No ZIP codes to load")
+    return geocoder
+
+
+class ZipGeocoderLoader(CatalogIndexLoader[ZipGeocoder]):
+    """Loads the geocoder from the snapshot file if there is one, else the database."""
+
+    def __init__(self, snapshot_path: str = ZIP_SNAPSHOT_PATH):
+        super().__init__("zip_geocoder", "get_zip_centroids", build_geocoder)
+        self.snapshot_path = snapshot_path
+        self.source: Optional[str] = None
+
+    async def _load(self, supabase) -> Any:
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                geocoder = await asyncio.to_thread(ZipGeocoder.from_snapshot, self.snapshot_path)
+                self.source = "snapshot"
+                return geocoder
+            except Exception as e:
+                log_structured(
+                    "WARNING",
+                    "Could not read ZIP snapshot",
+                    event_type="catalog_index",
+                    index=self.name,
+                    path=self.snapshot_path,
+                    error_type=type(e).__name__,
+                    error=str(e),
+                )
+        self.source = "database"
+        return await super()._load(supabase)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "source": self.source}
+
+
+zip_geocoder = ZipGeocoderLoader()
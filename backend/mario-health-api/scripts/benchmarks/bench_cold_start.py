@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cold-start time to first response.
+
+Each run starts a fresh uvicorn process serving app.main:app (the same
+command as the Dockerfile), polls until the first successful response
+to --path and records the wall time from spawn to that response. The
+instance's own /health/startup timeline from the last run is printed
+for the in-process breakdown.
+
+Usage:
+    python scripts/benchmarks/bench_cold_start.py --runs 10
+    python scripts/benchmarks/bench_cold_start.py --path /api/v1/categories
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(url, timeout=1.0):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def cold_start(path, timeout):
+    """Spawn the server and return (ms to first response, startup report)."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"no response from {path} within {timeout}s")
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            try:
+                status, _ = get(base + path)
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.005)
+                continue
+            if status < 500:
+                break
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _, body = get(base + "/health/startup")
+        return elapsed_ms, json.loads(body)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def time_import(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=project_root, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time to first response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/health", help="first request to wait for")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    samples, report = [], None
+    imports = []
+    for _ in range(args.runs):
+        elapsed_ms, report = cold_start(args.path, args.timeout)
+        samples.append(elapsed_ms)
+        imports.append(time_import("app.main"))
+
+    print(f"time to first response ({args.path}), {args.runs} runs:")
+    print(f"  p50 {percentile(samples, 50):7.1f}ms  min {min(samples):7.1f}ms  max {max(samples):7.1f}ms")
+    print(f"interpreter + `import app.main`: p50 {percentile(imports, 50):7.1f}ms")
+    print("startup timeline (last run):")
+    print(f"  process age at import: {report['process_age_at_import_ms']}ms")
+    for mark in report["marks"]:
+        print(f"  {mark['name']:<20} {mark['at_ms']:8.1f}ms  (+{mark['delta_ms']:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Distance ranking of specialty provider candidates: per-row loop vs NumPy.
+
+Generates PostgREST-shaped location rows (coordinates as numeric strings)
+around a search point and times, per call:
+
+- ``loop``: the previous implementation, a haversine call and dict per row
+  followed by a full sort;
+- ``numpy``: ``coordinate_arrays`` + ``nearest_within`` from app/core/geo.py
+  (parsing included), then dicts for the selected rows only;
+- ``rank``: ``nearest_within`` alone, on already-parsed arrays. Parsing the
+  JSON strings is most of the remaining cost.
+
+Both must return the same providers in the same order.
+
+Usage:
+    python scripts/benchmarks/bench_geo.py --sizes 1000,10000,100000 --limit 100
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from math import atan2, cos, radians, sin, sqrt
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app.core.geo import coordinate_arrays, nearest_within
+
+SEARCH = (42.377, -71.1167)
+
+
+def make_rows(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "provider_id": f"p{i}",
+            "latitude": f"{SEARCH[0] + rng.uniform(-0.5, 0.5):.6f}",
+            "longitude": f"{SEARCH[1] + rng.uniform(-0.7, 0.7):.6f}",
+        }
+        for i in range(count)
+    ]
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    R = 3958.8
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return R * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+def rank_loop(rows: list, radius: float, limit: int) -> list:
+    nearby = []
+    for loc in rows:
+        if loc.get("latitude") and loc.get("longitude"):
+            distance = haversine_distance(
+                SEARCH[0], SEARCH[1], float(loc["latitude"]), float(loc["longitude"])
+            )
+            if distance <= radius:
+                nearby.append({"provider_id": loc["provider_id"], "distance": distance})
+    nearby.sort(key=lambda x: x["distance"])
+    return nearby[:limit]
+
+
+def rank_numpy(rows: list, radius: float, limit: int) -> list:
+    lats, lons = coordinate_arrays(rows)
+    nearest, distances, _ = nearest_within(SEARCH[0], SEARCH[1], lats, lons, radius, limit)
+    return [
+        {"provider_id": rows[i]["provider_id"], "distance": distance}
+        for i, distance in zip(nearest.tolist(), distances.tolist())
+    ]
+
+
+def time_ms(fn, rows: list, radius: float, limit: int, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(rows, radius, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Candidate row counts")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--radius", type=float, default=25)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'loop ms':>10}{'numpy ms':>10}{'speedup':>9}{'rank ms':>9}  results")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rows = make_rows(size, seed=size)
+        loop = rank_loop(rows, args.radius, args.limit)
+        vectorized = rank_numpy(rows, args.radius, args.limit)
+        same = [r["provider_id"] for r in loop] == [r["provider_id"] for r in vectorized]
+
+        loop_ms = time_ms(rank_loop, rows, args.radius, args.limit, args.runs)
+        numpy_ms = time_ms(rank_numpy, rows, args.radius, args.limit, args.runs)
+        lats, lons = coordinate_arrays(rows)
+        rank_ms = time_ms(
+            lambda _, radius, limit: nearest_within(*SEARCH, lats, lons, radius, limit),
+            rows, args.radius, args.limit, args.runs,
+        )
+        print(
+            f"{size:>8}{loop_ms:>10.2f}{numpy_ms:>10.2f}{loop_ms / numpy_ms:>8.1f}x{rank_ms:>9.2f}  "
+            f"{'identical' if same else 'DIFFERENT'} ({len(vectorized)} rows)"
+        )
+
+
+if __name__ == "__main__":
+    main()
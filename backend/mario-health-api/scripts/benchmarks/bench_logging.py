@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request cost of structured logging on the request path.
+
+Compares the previous implementation (json.dumps + print per event) with
+the queued log_structured, using the events a typical specialty-providers
+request emits (router "viewed" event, access log, funnel/bbox/pricing
+debug logs). stdout is redirected to /dev/null for both runs so only the
+in-process cost is measured.
+
+Usage:
+    python scripts/benchmarks/bench_logging.py --requests 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app.middleware.logging import flush_logs, log_structured
+
+REQUEST_EVENTS = [
+    ("INFO", "Specialty providers viewed", {
+        "event_type": "get_specialty_providers", "request_id": "req_1",
+        "specialty_slug": "cardiologist", "zip_code": "02138", "radius_miles": 25,
+    }),
+    ("DEBUG", "Specialty provider bbox debug", {
+        "specialty_id": "spec_001", "search_lat": 42.377, "search_lon": -71.1167,
+        "radius_miles": 25, "min_lat": 42.01, "max_lat": 42.74,
+        "min_lng": -71.61, "max_lng": -70.62,
+    }),
+    ("INFO", "Specialty provider search funnel", {
+        "specialty_id": "spec_001", "candidate_providers": 200, "bbox_filtered": 143,
+        "within_radius": 120, "returned_after_limit": 20, "search_radius_miles": 25,
+        "limit": 20, "use_provider_search_mv": False,
+    }),
+    ("DEBUG", "Specialty provider pricing aggregation", {
+        "specialty_id": "spec_001", "total_providers": 20,
+        "providers_with_pricing": 14, "pricing_coverage_pct": 70.0,
+    }),
+    ("INFO", "GET /api/v1/specialties/cardiologist/providers", {
+        "httpRequest": {
+            "requestMethod": "GET",
+            "requestUrl": "http://localhost/api/v1/specialties/cardiologist/providers?zip_code=02138",
+            "status": 200, "userAgent": "Mozilla/5.0", "latency": "84.2ms",
+        },
+        "request_id": "req_1", "duration_ms": 84.2, "status_code": 200,
+        "endpoint": "/api/v1/specialties/cardiologist/providers",
+    }),
+]
+
+
+def legacy_log_structured(severity, message, **kwargs):
+    print(json.dumps({"severity": severity, "message": message, **kwargs}))
+
+
+def run(log, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        for severity, message, fields in REQUEST_EVENTS:
+            log(severity, message, **fields)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark structured logging overhead")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    real_stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            legacy_us = run(legacy_log_structured, args.requests)
+            queued_us = run(log_structured, args.requests)
+            flush_logs(timeout=30)
+        finally:
+            sys.stdout = real_stdout
+
+    print(f"events per request: {len(REQUEST_EVENTS)}")
+    print(f"print(json.dumps()):  {legacy_us:8.1f} µs/request")
+    print(f"queued log_structured: {queued_us:8.1f} µs/request")
+    print(f"saved on request path: {legacy_us - queued_us:8.1f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of the request logging middleware, before and after.
+
+"before" reproduces the previous stack: RequestLoggingMiddleware and the
+log_requests debug middleware, both registered via app.middleware("http")
+(BaseHTTPMiddleware + call_next). "after" is the pure ASGI
+RequestLoggingMiddleware. Both apps serve the same trivial JSON route
+in-process over httpx.ASGITransport; log output is discarded so only the
+middleware machinery is measured.
+
+Usage:
+    python scripts/benchmarks/bench_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.middleware import logging as structured_logging
+from app.middleware.logging import RequestLoggingMiddleware
+
+legacy_logger = logging.getLogger("bench.legacy")
+
+
+def add_route(app: FastAPI) -> FastAPI:
+    @app.get("/api/v1/categories")
+    async def categories(request: Request):
+        return {"categories": [{"id": "cat_001", "name": "Imaging", "slug": "imaging"}]}
+
+    return app
+
+
+def build_before() -> FastAPI:
+    app = add_route(FastAPI())
+
+    async def legacy_request_logging(request: Request, call_next):
+        start_time = time.time()
+        request_id = request.headers.get("X-Request-ID", f"req_{int(time.time() * 1000)}")
+        request.state.request_id = request_id
+        request.state.start_time = start_time
+        response = await call_next(request)
+        duration_ms = round((time.time() - start_time) * 1000, 2)
+        structured_logging.log_structured(
+            severity="INFO",
+            message=f"{request.method} {request.url.path}",
+            httpRequest={
+                "requestMethod": request.method,
+                "requestUrl": str(request.url),
+                "status": response.status_code,
+                "userAgent": request.headers.get("User-Agent", "unknown"),
+                "latency": f"{duration_ms}ms",
+            },
+            request_id=request_id,
+            duration_ms=duration_ms,
+            status_code=response.status_code,
+            endpoint=request.url.path,
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    async def legacy_log_requests(request: Request, call_next):
+        auth_header = request.headers.get("authorization", "")
+        if auth_header:
+            legacy_logger.info(f"{request.method} {request.url.path} | Auth: {auth_header[:30]}...")
+        origin = request.headers.get("origin", "")
+        if origin:
+            legacy_logger.info(f"  Origin: {origin}")
+        response = await call_next(request)
+        cors_origin = response.headers.get("access-control-allow-origin", "")
+        if cors_origin:
+            legacy_logger.info(f"  CORS Allowed Origin: {cors_origin}")
+        legacy_logger.info(f"Response status: {response.status_code}")
+        return response
+
+    app.middleware("http")(legacy_request_logging)
+    app.middleware("http")(legacy_log_requests)
+    return app
+
+
+def build_after() -> FastAPI:
+    app = add_route(FastAPI())
+    app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+def build_bare() -> FastAPI:
+    return add_route(FastAPI())
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Origin": "https://mario.health", "Authorization": "Bearer x" * 10}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):  # warm up
+            await client.get("/api/v1/categories", headers=headers)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/api/v1/categories", headers=headers)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main_async(requests: int, rounds: int) -> None:
+    apps = {"bare": build_bare(), "before": build_before(), "after": build_after()}
+    best = {name: float("inf") for name in apps}
+    # Interleave rounds and keep the best of each so warm-up/noise doesn't skew one side
+    for _ in range(rounds):
+        for name, app in apps.items():
+            best[name] = min(best[name], await measure(app, requests))
+
+    bare, before, after = best["bare"], best["before"], best["after"]
+    print(f"no middleware:            {bare:8.1f} µs/request")
+    print(f"before (2x call_next):    {before:8.1f} µs/request  (+{before - bare:.1f})")
+    print(f"after (pure ASGI):        {after:8.1f} µs/request  (+{after - bare:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Discard log output; the queue submit itself is still measured
+    logging.disable(logging.CRITICAL)
+    structured_logging.log_writer._stream = open(os.devnull, "w")
+
+    asyncio.run(main_async(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load test: tail latency of /api/v1/search when offered more load than
+Supabase can serve, with and without the adaptive concurrency limiter.
+
+The app runs in-process over httpx.ASGITransport against a simulated
+pooler that serves ``--capacity`` queries at a time, each taking
+``--service-ms``; queries beyond that queue inside the pooler, as they do
+at a saturated pgbouncer. Requests arrive open-loop at ``--rate`` per
+second for ``--seconds``, each with a distinct query so the search cache
+and single-flight don't absorb them.
+
+Without the limiter the pooler queue grows for as long as the overload
+lasts, and every request's latency grows with it. With the limiter the
+limit settles near the pooler's capacity, and excess requests get a fast
+503 with Retry-After. Served requests keep a bounded tail latency.
+
+Usage:
+    python scripts/benchmarks/bench_overload.py
+    python scripts/benchmarks/bench_overload.py --rate 600 --capacity 10 --service-ms 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import httpx
+
+from app.core import concurrency
+from app.core.concurrency import AdaptiveLimiter
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.core.result_cache import ResultCache
+from app.main import app
+from app.middleware import logging as structured_logging
+from app.services import search_service
+
+SEARCH_ROW = {
+    "procedure_id": "proc_001", "procedure_name": "Chest X-Ray", "procedure_slug": "chest-x-ray",
+    "family_name": "X-Ray", "family_slug": "x-ray", "category_name": "Imaging",
+    "category_slug": "imaging", "best_price": 100.0, "avg_price": 120.0, "max_price": 150.0,
+    "provider_count": 5, "match_score": 1.0,
+}
+
+
+class SimulatedPooler:
+    """Supabase stand-in whose queries share ``capacity`` connections."""
+
+    def __init__(self, capacity: int, service_time: float):
+        self.connections = asyncio.Semaphore(capacity)
+        self.service_time = service_time
+
+    def rpc(self, fn, params=None):
+        return self
+
+    async def execute(self):
+        async with self.connections:
+            await asyncio.sleep(self.service_time)
+        return SimpleNamespace(data=[SEARCH_ROW])
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(limited: bool, args) -> None:
+    concurrency.UPSTREAM_LIMITER = limited
+    limiter = concurrency.upstream_limiters["search"] = AdaptiveLimiter(
+        "search", max_limit=args.max_limit, latency_target=args.latency_target
+    )
+    pooler = SimulatedPooler(args.capacity, args.service_ms / 1000)
+    app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(pooler)
+
+    latencies = {200: [], 503: []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+        async def one(i):
+            start = time.perf_counter()
+            response = await client.get("/api/v1/search", params={"q": f"procedure {i}"})
+            latencies.setdefault(response.status_code, []).append(time.perf_counter() - start)
+
+        tasks = []
+        total = int(args.rate * args.seconds)
+        started = time.perf_counter()
+        for i in range(total):
+            # Open-loop arrivals: send on schedule regardless of responses
+            delay = started + i / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(i)))
+        await asyncio.gather(*tasks)
+
+    served = [t * 1000 for t in latencies[200]]
+    shed = [t * 1000 for t in latencies[503]]
+    label = "limiter on " if limited else "limiter off"
+    print(
+        f"{label}: served {len(served):5d}  p50 {statistics.median(served):7.0f} ms  "
+        f"p99 {percentile(served, 99):7.0f} ms  max {max(served):7.0f} ms  |  "
+        f"shed {len(shed):5d}  p99 {percentile(shed, 99):5.0f} ms"
+        + (f"  |  final limit {limiter.limit:.1f}" if limited else "")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail latency under overload")
+    parser.add_argument("--rate", type=float, default=400, help="requests per second")
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--capacity", type=int, default=10, help="simulated pooler connections")
+    parser.add_argument("--service-ms", type=float, default=50, help="query time per connection")
+    parser.add_argument("--max-limit", type=int, default=40, help="search limiter max_limit")
+    parser.add_argument("--latency-target", type=float, default=0.1, help="seconds")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structured_logging.log_writer._stream = open(os.devnull, "w")
+    search_service.search_cache = ResultCache("search", None)
+
+    print(
+        f"offered {args.rate:.0f} req/s for {args.seconds:.0f}s; pooler capacity "
+        f"{args.capacity / (args.service_ms / 1000):.0f} req/s"
+    )
+    asyncio.run(run(False, args))
+    asyncio.run(run(True, args))
+
+
+if __name__ == "__main__":
+    main()
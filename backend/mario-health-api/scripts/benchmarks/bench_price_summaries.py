@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+get_procedure_price_summaries: geo price summary vs direct aggregation.
+
+With a ZIP, get_procedure_price_summaries merges the precomputed
+procedure_price_cell summaries of geohash cells inside the radius and only
+distance-checks pricing rows in boundary cells. When price_geo_cell is empty
+it aggregates procedure_pricing directly, so each case is also run inside a
+transaction that empties price_geo_cell (rolled back afterwards) to time the
+direct path against the same data.
+
+For each ZIP and radius it checks that both paths return the same rows, then
+reports the median ``EXPLAIN (ANALYZE, BUFFERS)`` execution time and shared
+buffers touched. Procedures are the ones with the most pricing rows, i.e. the
+worst case for direct aggregation.
+
+Usage:
+    # Seed first (builds the summary too)
+    python scripts/benchmarks/seed_local_db.py --database-url $BENCH_DATABASE_URL
+    python scripts/benchmarks/bench_price_summaries.py --database-url $BENCH_DATABASE_URL --runs 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+import asyncpg
+
+ZIPS = ["10001", "02138", "60601", "94103", "59001"]
+RADII = [10, 25, 100]
+CALL = (
+    "SELECT * FROM get_procedure_price_summaries("
+    "procedure_ids => $1, zip_code_input => $2, radius_miles => $3)"
+)
+
+
+class Rollback(Exception):
+    """Raised to discard the emptied price_geo_cell."""
+
+
+def comparable(rows) -> list:
+    """Rows rounded so SUM/COUNT and AVG agree, in a stable order.
+
+    The nearest provider is left out; providers tied on distance may differ.
+    """
+    return sorted(
+        (
+            r["procedure_id"],
+            round(r["best_price"], 2),
+            round(r["avg_price"], 6),
+            round(r["max_price"], 2),
+            r["provider_count"],
+            round(r["nearest_distance_miles"] or 0, 6),
+        )
+        for r in rows
+    )
+
+
+async def explain(conn, ids, zip_code: str, radius: int, runs: int):
+    times, buffers = [], []
+    for _ in range(runs):
+        plan = await conn.fetchval("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + CALL, ids, zip_code, radius)
+        plan = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+        times.append(plan["Execution Time"])
+        node = plan["Plan"]
+        buffers.append(node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0))
+    return statistics.median(times), statistics.median(buffers)
+
+
+async def run_direct(conn, ids, zip_code: str, radius: int, runs: int):
+    """Rows and timings with the summary hidden from the function."""
+    result = {}
+    try:
+        async with conn.transaction():
+            await conn.execute("DELETE FROM price_geo_cell")
+            result["rows"] = await conn.fetch(CALL, ids, zip_code, radius)
+            result["timing"] = await explain(conn, ids, zip_code, radius, runs)
+            raise Rollback
+    except Rollback:
+        pass
+    return result["rows"], result["timing"]
+
+
+async def main_async(database_url: str, runs: int, procedures: int) -> None:
+    conn = await asyncpg.connect(database_url)
+    try:
+        cells = await conn.fetchval("SELECT COUNT(*) FROM price_geo_cell")
+        if not cells:
+            print("❌ price_geo_cell is empty; run SELECT refresh_geo_price_summary() first")
+            sys.exit(1)
+        pricing_rows = await conn.fetchval("SELECT COUNT(*) FROM procedure_pricing")
+        summaries = await conn.fetchval("SELECT COUNT(*) FROM procedure_price_cell")
+        ids = [
+            r["procedure_id"]
+            for r in await conn.fetch(
+                "SELECT procedure_id FROM procedure_pricing GROUP BY procedure_id "
+                "ORDER BY COUNT(*) DESC LIMIT $1",
+                procedures,
+            )
+        ]
+        print(
+            f"procedure_pricing: {pricing_rows} rows, {cells} cells, {summaries} cell summaries; "
+            f"{len(ids)} procedures, {runs} runs each\n"
+        )
+
+        print(f"{'zip':<7}{'miles':>6}{'direct ms':>11}{'cells ms':>10}{'speedup':>9}"
+              f"{'direct buf':>12}{'cells buf':>11}  results")
+        for zip_code in ZIPS:
+            for radius in RADII:
+                direct_rows, (direct_ms, direct_buf) = await run_direct(conn, ids, zip_code, radius, runs)
+                cell_rows = await conn.fetch(CALL, ids, zip_code, radius)
+                cells_ms, cells_buf = await explain(conn, ids, zip_code, radius, runs)
+                same = comparable(direct_rows) == comparable(cell_rows)
+                results = f"identical ({len(cell_rows)} rows)" if same else (
+                    f"DIFFERENT ({len(direct_rows)} vs {len(cell_rows)} rows)"
+                )
+                print(
+                    f"{zip_code:<7}{radius:>6}{direct_ms:>11.1f}{cells_ms:>10.1f}"
+                    f"{direct_ms / cells_ms if cells_ms else 0:>8.1f}x"
+                    f"{direct_buf:>12.0f}{cells_buf:>11.0f}  {results}"
+                )
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geo price summary vs direct aggregation")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL"),
+        help="Postgres DSN (default: $BENCH_DATABASE_URL)",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--procedures", type=int, default=20, help="Procedure ids per call")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("❌ --database-url or BENCH_DATABASE_URL is required")
+        sys.exit(1)
+
+    asyncio.run(main_async(args.database_url, args.runs, args.procedures))
+
+
+if __name__ == "__main__":
+    main()
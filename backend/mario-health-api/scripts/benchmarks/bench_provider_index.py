@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Provider spatial index: build cost, memory and k-nearest query latency.
+
+Generates a synthetic national corpus (locations clustered around US metro
+areas, one or two taxonomies each out of ``--taxonomies``) and reports, per
+size:
+
+- the time to build ``ProviderGeoIndex`` and the bytes it holds;
+- the median latency of ``nearest`` for one taxonomy around a metro;
+- the same query as a scan of the taxonomy's locations, already parsed and
+  grouped (``nearest_within``), which must return the same locations. The
+  scan grows with the corpus; the index only reads the cells the radius
+  touches.
+
+Usage:
+    python scripts/benchmarks/bench_provider_index.py --sizes 100000,1000000 --radius 25 --limit 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app.core.geo import nearest_within
+from app.services.provider_geo_index import ProviderGeoIndex
+
+METROS = [
+    (42.36, -71.06), (40.71, -74.01), (41.88, -87.63), (34.05, -118.24), (29.76, -95.37),
+    (33.45, -112.07), (39.95, -75.17), (32.72, -117.16), (37.77, -122.42), (47.61, -122.33),
+]
+
+
+def make_corpus(count: int, taxonomies: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    metro = rng.integers(0, len(METROS), count)
+    centers = np.array(METROS)[metro]
+    first = rng.integers(0, taxonomies, count)
+    second = rng.integers(0, taxonomies, count)
+    return {
+        "id": [f"loc_{i:08d}" for i in range(count)],
+        "org_id": [f"org_{i % 5000}" for i in range(count)],
+        "lat": (centers[:, 0] + rng.normal(0, 0.3, count)).tolist(),
+        "lon": (centers[:, 1] + rng.normal(0, 0.4, count)).tolist(),
+        "taxonomies": [
+            [f"tx{a}"] if a == b or i % 4 else [f"tx{a}", f"tx{b}"]
+            for i, (a, b) in enumerate(zip(first.tolist(), second.tolist()))
+        ],
+    }
+
+
+def full_scan(corpus_arrays: dict, taxonomy: str, radius: float, limit: int) -> list:
+    ids, lats, lons = corpus_arrays[taxonomy]
+    nearest, _, _ = nearest_within(*METROS[0], lats, lons, radius, limit)
+    return [ids[i] for i in nearest.tolist()]
+
+
+def time_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100000,1000000", help="Location counts")
+    parser.add_argument("--taxonomies", type=int, default=200)
+    parser.add_argument("--radius", type=float, default=25)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'locations':>10}{'build s':>9}{'MB':>7}{'index ms':>10}{'scan ms':>9}  results")
+    for size in (int(s) for s in args.sizes.split(",")):
+        corpus = make_corpus(size, args.taxonomies, seed=size)
+        start = time.perf_counter()
+        index = ProviderGeoIndex(corpus)
+        build_s = time.perf_counter() - start
+
+        taxonomy = "tx7"
+        members = [i for i, t in enumerate(corpus["taxonomies"]) if taxonomy in t]
+        by_taxonomy = {
+            taxonomy: (
+                [corpus["id"][i] for i in members],
+                np.array([corpus["lat"][i] for i in members], dtype=np.float32).astype(np.float64),
+                np.array([corpus["lon"][i] for i in members], dtype=np.float32).astype(np.float64),
+            )
+        }
+
+        def query():
+            return index.nearest(*METROS[0], args.radius, [taxonomy], args.limit).location_ids
+
+        same = query() == full_scan(by_taxonomy, taxonomy, args.radius, args.limit)
+        index_ms = time_ms(query, args.runs)
+        scan_ms = time_ms(lambda: full_scan(by_taxonomy, taxonomy, args.radius, args.limit), args.runs)
+        print(
+            f"{size:>10}{build_s:>9.2f}{index.nbytes / 1e6:>7.1f}{index_ms:>10.3f}{scan_ms:>9.3f}  "
+            f"{'identical' if same else 'DIFFERENT'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
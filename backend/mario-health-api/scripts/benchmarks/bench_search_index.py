@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Query latency of the in-process procedure search index.
+
+Builds the index from the data pipeline's seed CSVs (the same rows
+get_procedure_search_corpus returns) and times ``ProcedureIndex.search``
+for a set of typical queries, including typos, prefixes and billing codes.
+With --show it prints the top matches per query to eyeball relevance.
+
+Usage:
+    python scripts/benchmarks/bench_search_index.py --iterations 2000
+    python scripts/benchmarks/bench_search_index.py --show
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app.services.procedure_index import ProcedureIndex
+
+DEFAULT_SEEDS = os.path.join(
+    os.path.dirname(project_root), "mario-health-data-pipeline", "seeds"
+)
+QUERIES = [
+    "mri",
+    "brain mri",
+    "ct scan",
+    "x-ray",
+    "chest xray",
+    "colonoscopy",
+    "colonscopy",
+    "mammogram",
+    "blood test",
+    "physical therapy",
+    "belly mri",
+    "ultrasound pregnancy",
+    "74181",
+    "colo",
+    "knee replacement",
+]
+
+
+def read_csv(seeds: str, name: str) -> list:
+    with open(os.path.join(seeds, name), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def load_corpus(seeds: str) -> list:
+    """Rows shaped like get_procedure_search_corpus's, from the seed CSVs."""
+    categories = {row["id"]: row for row in read_csv(seeds, "procedure_category.csv")}
+    families = {row["id"]: row for row in read_csv(seeds, "procedure_family.csv")}
+    codes = defaultdict(set)
+    for row in read_csv(seeds, "procedure_billing_code.csv"):
+        codes[row["procedure_id"]].add(row["code"])
+
+    corpus = []
+    for row in read_csv(seeds, "procedure.csv"):
+        family = families.get(row["family_id"])
+        if family is None or family["category_id"] not in categories:
+            continue
+        category = categories[family["category_id"]]
+        corpus.append(
+            {
+                "procedure_id": row["id"],
+                "procedure_name": row["name"],
+                "procedure_slug": row["slug"],
+                "common_name": row["common_name"] or None,
+                "description": row["description"] or None,
+                "search_terms": row["search_terms"] or None,
+                "family_name": family["name"],
+                "family_slug": family["slug"],
+                "category_name": category["name"],
+                "category_slug": category["slug"],
+                "billing_codes": sorted(codes[row["id"]]),
+            }
+        )
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seeds", default=DEFAULT_SEEDS, help="Directory with the seed CSVs")
+    parser.add_argument("--iterations", type=int, default=1000, help="Searches per query")
+    parser.add_argument("--show", action="store_true", help="Print the top 5 matches per query")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.seeds)
+    start = time.perf_counter()
+    index = ProcedureIndex(corpus)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(index)} procedures, {len(index.vocabulary)} terms in {build_ms:.1f}ms\n")
+
+    print(f"{'query':<24}{'matches':>8}{'p50 us':>10}{'p99 us':>10}")
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            matches = index.search(query)
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"{query:<24}{len(matches):>8}{statistics.median(timings):>10.1f}{p99:>10.1f}")
+        if args.show:
+            for procedure, score in matches[:5]:
+                print(f"    {score:.3f}  {procedure.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+search_procedures_v2 vs search_procedures_v3 on a seeded local PostGIS.
+
+For each query (with and without a ZIP) it first checks that both functions
+return the same rows, then runs ``EXPLAIN (ANALYZE, BUFFERS)`` on each
+repeatedly and reports the median execution time and shared buffers
+touched. v2 runs two correlated subqueries per matched procedure to find
+the nearest provider; v3 reads only matched procedures' pricing rows, once.
+
+With --plans the plans of the statements *inside* each function are printed
+too (via auto_explain, which needs a superuser such as the local Supabase
+``postgres`` user); a plain EXPLAIN only shows a Function Scan.
+
+Usage:
+    # Seed first (200k pricing rows by default)
+    python scripts/benchmarks/seed_local_db.py --database-url $BENCH_DATABASE_URL
+    python scripts/benchmarks/bench_search_sql.py --database-url $BENCH_DATABASE_URL --runs 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+import asyncpg
+
+FUNCTIONS = ("search_procedures_v2", "search_procedures_v3")
+CASES = [
+    ("mri", None),
+    ("mri", "10001"),
+    ("chest x-ray", "02138"),
+    ("colonoscopy", "60601"),
+    ("blood test", None),
+    ("ultrasound", "94103"),
+    ("colonscopy", "59001"),  # typo, sparse rural ZIP
+]
+CALL = "SELECT * FROM {fn}(search_query => $1, zip_code_input => $2, radius_miles => $3)"
+
+
+def comparable(rows) -> list:
+    """Rows without nearest_provider, in a stable order.
+
+    Rows tied on (match_score, best_price, distance) may come back in either
+    order, and v2 picks an arbitrary provider when distances tie.
+    """
+    return sorted(
+        tuple(str(value) for key, value in row.items() if key != "nearest_provider")
+        for row in rows
+    )
+
+
+async def check_identical(conn, query: str, zip_code, radius: int) -> str:
+    v2, v3 = [await conn.fetch(CALL.format(fn=fn), query, zip_code, radius) for fn in FUNCTIONS]
+    if comparable(v2) != comparable(v3):
+        return f"DIFFERENT ({len(v2)} vs {len(v3)} rows)"
+    nearest_v2 = {r["procedure_id"]: r["nearest_provider"] for r in v2}
+    moved = sum(
+        1
+        for r in v3
+        if r["nearest_provider"] != nearest_v2[r["procedure_id"]] and r["nearest_distance_miles"]
+    )
+    return f"identical ({len(v3)} rows)" if not moved else f"{moved} nearest providers differ"
+
+
+async def explain(conn, fn: str, query: str, zip_code, radius: int, runs: int):
+    times, buffers = [], []
+    for _ in range(runs):
+        plan = await conn.fetchval(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + CALL.format(fn=fn), query, zip_code, radius
+        )
+        plan = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+        times.append(plan["Execution Time"])
+        node = plan["Plan"]
+        buffers.append(node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0))
+    return statistics.median(times), statistics.median(buffers)
+
+
+async def print_inner_plans(conn, query: str, zip_code, radius: int) -> None:
+    await conn.execute("LOAD 'auto_explain'")
+    await conn.execute("SET auto_explain.log_min_duration = 0")
+    await conn.execute("SET auto_explain.log_nested_statements = on")
+    await conn.execute("SET auto_explain.log_analyze = on")
+    await conn.execute("SET client_min_messages = log")
+    messages = []
+    conn.add_log_listener(lambda _, message: messages.append(message.message))
+    try:
+        for fn in FUNCTIONS:
+            messages.clear()
+            await conn.fetch(CALL.format(fn=fn), query, zip_code, radius)
+            print(f"\n--- {fn}({query!r}, {zip_code}) ---")
+            # The last message is the outer SELECT; the ones before are the function body
+            for message in messages[:-1]:
+                print(message)
+    finally:
+        await conn.execute("SET client_min_messages = notice")
+
+
+async def main_async(database_url: str, runs: int, radius: int, plans: bool) -> None:
+    conn = await asyncpg.connect(database_url)
+    try:
+        for fn in FUNCTIONS:
+            if not await conn.fetchval("SELECT COUNT(*) FROM pg_proc WHERE proname = $1", fn):
+                print(f"❌ {fn} is missing; apply bigquery-to-postgres/config/sql/01_functions.sql")
+                sys.exit(1)
+        pricing_rows = await conn.fetchval("SELECT COUNT(*) FROM procedure_pricing")
+        print(f"procedure_pricing: {pricing_rows} rows, radius {radius} miles, {runs} runs each\n")
+
+        print(f"{'query':<14}{'zip':<7}{'v2 ms':>9}{'v3 ms':>9}{'speedup':>9}{'v2 buf':>9}{'v3 buf':>9}  results")
+        for query, zip_code in CASES:
+            results = await check_identical(conn, query, zip_code, radius)
+            v2_ms, v2_buf = await explain(conn, FUNCTIONS[0], query, zip_code, radius, runs)
+            v3_ms, v3_buf = await explain(conn, FUNCTIONS[1], query, zip_code, radius, runs)
+            print(
+                f"{query:<14}{zip_code or '-':<7}{v2_ms:>9.1f}{v3_ms:>9.1f}"
+                f"{v2_ms / v3_ms if v3_ms else 0:>8.1f}x{v2_buf:>9.0f}{v3_buf:>9.0f}  {results}"
+            )
+
+        if plans:
+            for query, zip_code in CASES[:2]:
+                await print_inner_plans(conn, query, zip_code, radius)
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE search_procedures_v2 vs v3")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL"),
+        help="Postgres DSN (default: $BENCH_DATABASE_URL)",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--radius", type=int, default=25)
+    parser.add_argument("--plans", action="store_true", help="Print the functions' inner plans")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("❌ --database-url or BENCH_DATABASE_URL is required")
+        sys.exit(1)
+
+    asyncio.run(main_async(args.database_url, args.runs, args.radius, args.plans))
+
+
+if __name__ == "__main__":
+    main()
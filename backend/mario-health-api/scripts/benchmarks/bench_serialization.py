@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+CPU per response for the procedure orgs endpoint, default vs fast path.
+
+"default" is the previous behaviour: a per-row ``ProcedureOrg(...)`` loop,
+then FastAPI's response_model validation and JSONResponse encoding. "fast" is ``validate_many`` + ``ORJSONResponse``.
+Both run through the same FastAPI app, driven directly over ASGI with rows
+served from memory, so only API-side CPU is measured.
+
+Usage:
+    python scripts/benchmarks/bench_serialization.py --rows 500 --requests 300
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from fastapi import FastAPI
+
+from app.core.responses import ORJSONResponse, validate_many
+from app.models import ProcedureOrg, ProcedureOrgsResponse
+
+
+def make_rows(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "procedure_id": "proc_brain_mri",
+            "org_id": f"org_{i:05d}",
+            "carrier_id": "cigna_national_oap",
+            "carrier_name": "Cigna",
+            "count_provider": rng.randint(1, 40),
+            "min_price": round(rng.uniform(40, 400), 2),
+            "max_price": round(rng.uniform(400, 2000), 2),
+            "avg_price": round(rng.uniform(200, 900), 2),
+            "org_name": f"Organization {i}",
+            "org_type": "Hospital",
+            "address": f"{i} Main St",
+            "city": "Boston",
+            "state": "MA",
+            "zip_code": "02138",
+            "latitude": round(rng.uniform(42.0, 42.6), 6),
+            "longitude": round(rng.uniform(-71.4, -70.9), 6),
+            "phone": "555-0100",
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(rows: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=ProcedureOrgsResponse)
+    async def default():
+        # Verbatim shape of the previous ProcedureService.get_procedure_orgs loop
+        orgs = []
+        for p in rows:
+            orgs.append(
+                ProcedureOrg(
+                    procedure_id=p.get("procedure_id"),
+                    org_id=p.get("org_id"),
+                    carrier_id=p.get("carrier_id"),
+                    carrier_name=p.get("carrier_name"),
+                    count_provider=p.get("count_provider"),
+                    min_price=p.get("min_price"),
+                    max_price=p.get("max_price"),
+                    avg_price=p.get("avg_price"),
+                    org_name=p.get("org_name"),
+                    org_type=p.get("org_type"),
+                    address=p.get("address"),
+                    city=p.get("city"),
+                    state=p.get("state"),
+                    zip_code=p.get("zip_code"),
+                    latitude=p.get("latitude"),
+                    longitude=p.get("longitude"),
+                    phone=p.get("phone"),
+                )
+            )
+        orgs.sort(key=lambda x: x.avg_price)
+        return ProcedureOrgsResponse(procedure_name="MRI", procedure_slug="mri", orgs=orgs)
+
+    @app.get("/fast", response_model=ProcedureOrgsResponse)
+    async def fast():
+        orgs = validate_many(ProcedureOrg, rows)
+        orgs.sort(key=lambda x: x.avg_price)
+        return ORJSONResponse(
+            ProcedureOrgsResponse(procedure_name="MRI", procedure_slug="mri", orgs=orgs)
+        )
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    for _ in range(20):
+        await call(app, path)
+    start = time.process_time()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.process_time() - start) / requests * 1000
+
+
+async def main_async(rows: int, requests: int) -> None:
+    app = build_app(make_rows(rows))
+    default_body = await call(app, "/default")
+    fast_body = await call(app, "/fast")
+    assert default_body == fast_body, "fast path changed the response body"
+
+    default_ms = await measure(app, "/default", requests)
+    fast_ms = await measure(app, "/fast", requests)
+
+    print(f"rows per response: {rows} ({len(fast_body)} bytes, bodies identical)")
+    print(f"default path: {default_ms:7.2f} ms CPU/response")
+    print(f"fast path:    {fast_ms:7.2f} ms CPU/response ({default_ms / fast_ms:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.rows, args.requests))
+
+
+if __name__ == "__main__":
+    main()
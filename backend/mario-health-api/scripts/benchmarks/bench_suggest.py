@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Lookup latency of the typeahead suggest index.
+
+Builds ``SuggestIndex`` from the data pipeline's seed CSVs (the same labels
+get_suggestion_corpus returns) and replays every prefix of a set of typical
+queries, one keystroke at a time, as the search box does.
+
+Usage:
+    python scripts/benchmarks/bench_suggest.py --rounds 200
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from app.services.suggest_index import SuggestIndex
+
+DEFAULT_SEEDS = os.path.join(
+    os.path.dirname(project_root), "mario-health-data-pipeline", "seeds"
+)
+QUERIES = [
+    "brain mri",
+    "colonoscopy",
+    "cardiologist",
+    "presbyterian",
+    "mount sinai",
+    "74181",
+    "physical therapy",
+    "x-ray",
+]
+
+
+def read_csv(seeds: str, name: str) -> list:
+    with open(os.path.join(seeds, name), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def load_corpus(seeds: str) -> list:
+    """Rows shaped like get_suggestion_corpus's, from the seed CSVs."""
+    procedures = {row["id"]: row for row in read_csv(seeds, "procedure.csv")}
+    hospitals = {row["hospital_id"]: row for row in read_csv(seeds, "hospitals.csv")}
+    corpus = []
+    for p in procedures.values():
+        corpus.append({"kind": "procedure", "label": p["name"], "slug": p["slug"], "name": p["name"]})
+        if p["common_name"]:
+            corpus.append(
+                {"kind": "procedure", "label": p["common_name"], "slug": p["slug"], "name": p["name"]}
+            )
+    for code in read_csv(seeds, "procedure_billing_code.csv"):
+        p = procedures.get(code["procedure_id"])
+        if p is not None:
+            corpus.append(
+                {"kind": "billing_code", "label": code["code"], "slug": p["slug"], "name": p["name"]}
+            )
+    for s in read_csv(seeds, "specialty.csv"):
+        if s["is_used"].lower() == "true":
+            corpus.append({"kind": "specialty", "label": s["name"], "slug": s["slug"], "name": s["name"]})
+    for h in hospitals.values():
+        corpus.append(
+            {"kind": "hospital", "label": h["hospital_name"], "slug": h["hospital_id"], "name": h["hospital_name"]}
+        )
+    for alias in read_csv(seeds, "hospital_aliases.csv"):
+        h = hospitals.get(alias["hospital_id"])
+        if h is not None:
+            corpus.append(
+                {"kind": "hospital", "label": alias["alias"], "slug": h["hospital_id"], "name": h["hospital_name"]}
+            )
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seeds", default=DEFAULT_SEEDS, help="Directory with the seed CSVs")
+    parser.add_argument("--rounds", type=int, default=100, help="Replays of every keystroke")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.seeds)
+    start = time.perf_counter()
+    index = SuggestIndex(corpus)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(index)} labels from {len(corpus)} rows in {build_ms:.1f}ms")
+
+    keystrokes = [query[:i] for query in QUERIES for i in range(1, len(query) + 1)]
+    timings = []
+    for _ in range(args.rounds):
+        for prefix in keystrokes:
+            start = time.perf_counter()
+            index.suggest(prefix)
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(
+        f"{len(timings)} lookups: p50 {statistics.median(timings):.1f}us, "
+        f"p99 {p99:.1f}us, max {timings[-1]:.1f}us"
+    )
+    for query in ("br", "mri", "presby", "7418"):
+        print(f"  {query!r}: " + ", ".join(entry.label for entry in index.suggest(query, 5)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Declared upstream query budgets per endpoint.
+
+Each endpoint is served against an in-memory Supabase fake wrapped in the
+instrumented client, and fails if a request makes more rpc()/table()
+round trips than its budget. Raise a budget only deliberately.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.cache import catalog_cache
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.core.result_cache import MemoryBackend, ResultCache
+from app.main import app
+from app.middleware import logging as structured_logging
+from app.services import procedure_service, search_service, specialty_service
+from tests.query_budget import query_budget
+
+PROCEDURE_DETAIL = {
+    "id": "proc_001", "name": "Chest X-Ray", "slug": "chest-x-ray", "description": None,
+    "family_id": "fam_001", "family_name": "X-Ray", "family_slug": "x-ray",
+    "category_id": "cat_001", "category_name": "Imaging", "category_slug": "imaging",
+    "min_price": 100.0, "max_price": 150.0, "avg_price": 120.0, "median_price": 110.0,
+}
+ORG_ROW = {
+    "procedure_id": "proc_001", "org_id": "org_1", "carrier_id": "cigna", "carrier_name": "Cigna",
+    "count_provider": 3, "min_price": 90.0, "max_price": 130.0, "avg_price": 110.0,
+    "org_name": "Cambridge Imaging", "org_type": "facility", "address": "1 Main St",
+    "city": "Cambridge", "state": "MA", "zip_code": "02138",
+    "latitude": 42.37, "longitude": -71.11, "phone": "555-0100",
+}
+CORPUS_ROW = {
+    "procedure_id": "proc_001", "procedure_name": "Chest X-Ray", "procedure_slug": "chest-x-ray",
+    "common_name": "Chest X-Ray", "description": None, "search_terms": "chest radiograph",
+    "family_name": "X-Ray", "family_slug": "x-ray", "category_name": "Imaging",
+    "category_slug": "imaging", "billing_codes": ["71046"],
+}
+PRICE_SUMMARY = {
+    "procedure_id": "proc_001", "best_price": 100.0, "avg_price": 120.0, "max_price": 150.0,
+    "provider_count": 5, "nearest_provider": None, "nearest_distance_miles": None,
+}
+PROVIDER_DETAIL = {
+    "provider_id": "1234567890", "provider_name": "Jane Doe MD", "address": "1 Main St",
+    "city": "Cambridge", "state": "MA", "zip_code": "02138", "latitude": 42.37,
+    "longitude": -71.11, "phone": None, "total_procedures": 1, "avg_price": 120.0,
+    "min_price": 100.0, "max_price": 150.0,
+}
+SPECIALTY_PROVIDER = {
+    "provider_id": "p1", "provider_name": "Ann Lee MD", "org_id": "org_1", "address": "1 Main St",
+    "city": "Cambridge", "state": "MA", "zip_code": "02138", "distance_miles": 0.5,
+    "min_price": 100.0, "max_price": 150.0, "avg_price": 120.0, "total_within_radius": 1,
+}
+
+# (path, max upstream calls per request, max calls per RPC/table)
+BUDGETS = [
+    ("/api/v1/categories", 2, {}),
+    ("/api/v1/categories/imaging/families", 2, {}),
+    ("/api/v1/families/x-ray/procedures", 3, {}),
+    ("/api/v1/specialties/cardiologist", 2, {}),
+    ("/api/v1/procedures/chest-x-ray", 3, {"procedure": 1, "get_procedure_detail": 1}),
+    ("/api/v1/procedures/chest-x-ray/providers", 3, {"procedure": 1, "get_procedure_detail": 1}),
+    ("/api/v1/procedures/chest-x-ray/orgs", 3, {"procedure": 1, "get_procedure_detail": 1}),
+    ("/api/v1/search?q=chest", 1, {"get_procedure_price_summaries": 1}),
+    ("/api/v1/search?q=chest&zip=02138&radius=25", 1, {"get_procedure_price_summaries": 1}),
+    ("/api/v1/providers/1234567890", 2, {}),
+    (
+        "/api/v1/specialties/cardiologist/providers?zip_code=02138",
+        4,
+        {"specialty": 1, "zip_codes": 0, "find_specialty_providers": 1, "provider": 0, "procedure_pricing": 0},
+    ),
+    # Sparse area: rings of 25, 50 and 100 miles cost one RPC at 100
+    (
+        "/api/v1/specialties/cardiologist/providers?zip_code=02138&max_radius_miles=100",
+        4,
+        {"specialty": 1, "zip_codes": 0, "find_specialty_providers": 1, "provider": 0, "procedure_pricing": 0},
+    ),
+]
+
+
+@pytest.fixture
+def client(catalog_supabase, monkeypatch):
+    fake = catalog_supabase
+    fake.table_results.update(
+        {
+            "procedure": [{"id": "proc_001"}],
+            "procedure_family": [
+                {"id": "fam_001", "name": "X-Ray", "slug": "x-ray", "description": None}
+            ],
+            "procedure_pricing": [
+                {"provider_id": "p1", "provider_name": "Dr A", "org_id": "org_1", "price": 100.0}
+            ],
+            "procedure_org_pricing": [ORG_ROW],
+            "specialty": [{"id": "spec_1", "name": "Cardiologist", "slug": "cardiologist"}],
+            "zip_codes": [{"zip_code": "02138", "latitude": 42.377, "longitude": -71.1167}],
+            "specialty_map": [{"taxonomy_id": "207RC0000X"}],
+            "specialty_procedure_map": [{"procedure_id": "proc_001"}],
+            "provider": [
+                {"provider_id": "p1", "first_name": "Ann", "last_name": "Lee", "specialty_id": "207RC0000X"}
+            ],
+            "provider_location": [
+                {"provider_id": "p1", "org_id": "org_1", "latitude": 42.37, "longitude": -71.11}
+            ],
+        }
+    )
+    fake.rpc_results.update(
+        {
+            "get_categories_with_counts": [
+                {"id": "cat_001", "name": "Imaging", "slug": "imaging", "emoji": "", "family_count": 1}
+            ],
+            "get_families_with_counts": [
+                {"id": "fam_001", "name": "X-Ray", "slug": "x-ray", "procedure_count": 1}
+            ],
+            "get_procedures_with_pricing": [{"id": "proc_001", "name": "Chest X-Ray"}],
+            "get_specialty_details": [{"taxonomy_id": "207RC0000X", "taxonomy_name": "Cardiology"}],
+            "get_procedure_detail": [PROCEDURE_DETAIL],
+            "get_procedure_carrier_prices": [],
+            "get_procedure_search_corpus": [CORPUS_ROW],
+            "get_procedure_price_summaries": [PRICE_SUMMARY],
+            "get_zip_centroids": {"zip": ["02138"], "lat": [42.377], "lon": [-71.1167]},
+            "get_provider_detail": [PROVIDER_DETAIL],
+            "get_provider_procedures": [],
+            "find_specialty_providers": [SPECIALTY_PROVIDER],
+        }
+    )
+
+    # Start every request cold: no cached catalog responses, ids or searches
+    catalog_cache.invalidate()
+    procedure_service._procedure_ids.clear()
+    monkeypatch.setattr(search_service, "search_cache", ResultCache("search", MemoryBackend()))
+    # Budgets assume find_specialty_providers is deployed and enabled
+    monkeypatch.setattr(specialty_service, "USE_SPECIALTY_PROVIDERS_RPC", True)
+    app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(fake)
+    client = TestClient(app)
+    # The procedure search index and ZIP geocoder are built once per instance, not per request
+    assert client.get("/api/v1/search?q=index-warmup&zip=02138").status_code == 200
+    yield client
+    app.dependency_overrides.pop(get_supabase, None)
+    catalog_cache.invalidate()
+    procedure_service._procedure_ids.clear()
+
+
+@pytest.mark.parametrize("path,max_calls,per_name", BUDGETS, ids=[b[0] for b in BUDGETS])
+def test_endpoint_within_query_budget(client, path, max_calls, per_name):
+    with query_budget(max_calls, per_name=per_name) as traces:
+        response = client.get(path)
+
+    assert response.status_code == 200, response.text
+    assert traces[0].call_count > 0
+
+
+def test_budget_violation_is_reported(client):
+    with pytest.raises(AssertionError, match="made 3 upstream calls"):
+        with query_budget(2):
+            client.get("/api/v1/procedures/chest-x-ray")
+
+
+def test_server_timing_header(client, monkeypatch):
+    assert "server-timing" not in client.get("/api/v1/categories").headers
+
+    monkeypatch.setattr(structured_logging, "SERVER_TIMING", True)
+    response = client.get("/api/v1/procedures/chest-x-ray")
+
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith('db;dur=')
+    assert "rpc.get_procedure_detail;dur=" in server_timing
+    assert "table.procedure;dur=" in server_timing
+
+
+def test_payload_bytes_only_measured_when_enabled(client, monkeypatch):
+    with query_budget(3) as traces:
+        client.get("/api/v1/procedures/chest-x-ray")
+    assert {span.bytes for span in traces[0].spans} == {None}
+    assert "upstream_bytes" not in traces[0].summary()
+
+    monkeypatch.setattr(tracing, "TRACE_PAYLOAD_BYTES", True)
+    with query_budget(3) as measured:
+        client.get("/api/v1/procedures/chest-x-ray")
+
+    assert all(span.bytes > 0 for span in measured[0].spans)
+    assert measured[0].summary()["upstream_bytes"] > 0
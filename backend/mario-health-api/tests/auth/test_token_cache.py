@@ -0,0 +1,115 @@
+"""Unit tests for the verified-token cache."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import firebase_auth
+from app.auth.token_cache import VerifiedTokenCache, token_cache
+from app.core.auth import require_auth
+
+
+def _claims(uid="user_1", ttl=3600):
+    return {"sub": uid, "uid": uid, "email": f"{uid}@example.com", "exp": time.time() + ttl}
+
+
+class TestVerifiedTokenCache:
+    """Test VerifiedTokenCache class."""
+
+    def test_hit_and_miss_counters(self):
+        cache = VerifiedTokenCache()
+        cache.put("token-a", _claims())
+
+        assert cache.get("token-a")["uid"] == "user_1"
+        assert cache.get("token-b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire_at_token_exp(self):
+        cache = VerifiedTokenCache()
+        cache.put("expired", _claims(ttl=-1))
+        cache.put("short", _claims(ttl=0.05))
+
+        assert cache.get("expired") is None
+        assert cache.get("short") is not None
+        time.sleep(0.06)
+        assert cache.get("short") is None
+        assert cache.stats()["expired"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache(max_size=2)
+        cache.put("a", _claims("a"))
+        cache.put("b", _claims("b"))
+        cache.get("a")
+        cache.put("c", _claims("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_returned_claims_are_copies(self):
+        cache = VerifiedTokenCache()
+        cache.put("a", _claims())
+
+        cache.get("a")["email"] = "changed"
+
+        assert cache.get("a")["email"] == "user_1@example.com"
+
+
+class TestRequireAuth:
+    """Test require_auth with the token cache."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        token_cache.clear()
+        yield
+        token_cache.clear()
+
+    async def test_verifies_once_per_token(self, monkeypatch):
+        calls = []
+
+        def fake_verify(token):
+            calls.append(token)
+            return _claims()
+
+        monkeypatch.setattr(
+            firebase_auth, "get_firebase_auth", lambda: SimpleNamespace(verify_id_token=fake_verify)
+        )
+
+        first = await require_auth("Bearer abc")
+        second = await require_auth("Bearer abc")
+
+        assert first["uid"] == second["uid"] == "user_1"
+        assert calls == ["abc"]
+
+    async def test_failed_verification_not_cached(self, monkeypatch):
+        def fake_verify(token):
+            raise ValueError("bad token")
+
+        monkeypatch.setattr(
+            firebase_auth, "get_firebase_auth", lambda: SimpleNamespace(verify_id_token=fake_verify)
+        )
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                await require_auth("Bearer bad")
+            assert exc.value.status_code == 401
+
+        assert token_cache.stats()["size"] == 0
+
+    async def test_first_verification_starts_key_refresh(self, monkeypatch):
+        refreshed = threading.Event()
+        monkeypatch.setenv("FIREBASE_PROJECT_ID", "test-project")
+        monkeypatch.setattr(firebase_auth, "refresh_signing_keys", refreshed.set)
+        monkeypatch.setattr(
+            firebase_auth, "get_firebase_auth", lambda: SimpleNamespace(verify_id_token=lambda t: _claims())
+        )
+
+        try:
+            assert firebase_auth._key_refresh_thread is None
+            await require_auth("Bearer abc")
+            assert refreshed.wait(1)
+        finally:
+            firebase_auth.stop_signing_key_refresh()
@@ -2,6 +2,67 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core import cache, circuit_breaker
+from app.core.cache import DataVersionWatcher, catalog_cache
+from app.core.circuit_breaker import CircuitBreaker
+from app.middleware.stale import stale_responses
+from app.services import search_service, specialty_service
+from app.core.catalog_index import CatalogIndexLoader
+from app.services.procedure_index import ProcedureIndexLoader
+from app.services.provider_geo_index import ProviderGeoIndexLoader
+from app.services.suggest_index import SuggestIndex
+from app.services.zip_geocoder import ZipGeocoderLoader
+from tests.fakes import FakeSupabase
+
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breakers(monkeypatch):
+    """Closed circuit breakers for every test."""
+    for name in list(circuit_breaker.upstream_breakers):
+        monkeypatch.setitem(circuit_breaker.upstream_breakers, name, CircuitBreaker(name))
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog_indexes(monkeypatch):
+    """Unbuilt procedure and suggest indexes and ZIP geocoder for every test."""
+    monkeypatch.setattr(search_service, "procedure_index", ProcedureIndexLoader())
+    monkeypatch.setattr(
+        search_service,
+        "suggest_index",
+        CatalogIndexLoader("suggest", "get_suggestion_corpus", SuggestIndex),
+    )
+    geocoder = ZipGeocoderLoader(snapshot_path="")
+    monkeypatch.setattr(search_service, "zip_geocoder", geocoder)
+    monkeypatch.setattr(specialty_service, "zip_geocoder", geocoder)
+
+
+@pytest.fixture(autouse=True)
+def no_provider_index(monkeypatch):
+    """Specialty searches use the per-request queries.
+
+    Tests opt in to the provider index; it builds in the background.
+    """
+    monkeypatch.setattr(
+        specialty_service, "provider_geo_index", ProviderGeoIndexLoader(enabled=False)
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_stale_responses():
+    """An empty stale-response store before and after every test."""
+    stale_responses.invalidate()
+    yield
+    stale_responses.invalidate()
+
+
+@pytest.fixture
+def catalog_supabase(monkeypatch):
+    """A FakeSupabase at data_version 1, polled by a fresh DataVersionWatcher."""
+    fake = FakeSupabase()
+    fake.table_results["data_version"] = [{"version": 1}]
+    monkeypatch.setattr(cache, "data_version", DataVersionWatcher(catalog_cache))
+    return fake
+
 
 @pytest.fixture(scope="session")
 def test_client():
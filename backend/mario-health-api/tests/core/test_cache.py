@@ -0,0 +1,147 @@
+"""Unit tests for the catalog response cache."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.core.cache import DataVersionWatcher, TTLCache, catalog_cache
+from app.core.dependencies import get_supabase
+from app.main import app
+from tests.fakes import FakeSupabase
+
+CATEGORY_ROWS = [
+    {
+        "id": "cat_001",
+        "name": "Imaging",
+        "slug": "imaging",
+        "emoji": "🩻",
+        "description": None,
+        "family_count": 3,
+    }
+]
+
+
+class TestTTLCache:
+    """Test TTLCache class."""
+
+    def test_lru_eviction(self):
+        ttl_cache = TTLCache(max_size=2, ttl=60)
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+        ttl_cache.get("a")
+        ttl_cache.set("c", 3)
+
+        assert ttl_cache.get("b") is None
+        assert ttl_cache.get("a") == 1
+        assert ttl_cache.stats()["evictions"] == 1
+
+    def test_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        ttl_cache = TTLCache(max_size=10, ttl=5)
+        ttl_cache.set("a", 1)
+
+        now[0] += 4
+        assert ttl_cache.get("a") == 1
+        now[0] += 2
+        assert ttl_cache.get("a") is None
+
+    def test_invalidate_prefix(self):
+        ttl_cache = TTLCache(max_size=10, ttl=60)
+        for key in ("families:x-ray:procedures", "families:mri:procedures", "categories"):
+            ttl_cache.set(key, key)
+
+        assert ttl_cache.invalidate("families:") == 2
+        assert ttl_cache.get("categories") == "categories"
+        assert ttl_cache.invalidate() == 1
+
+
+class TestDataVersionWatcher:
+    """Test DataVersionWatcher class."""
+
+    async def test_clears_cache_when_version_changes(self):
+        ttl_cache = TTLCache(max_size=10, ttl=60)
+        watcher = DataVersionWatcher(ttl_cache, interval=0)
+        supabase = FakeSupabase()
+        supabase.table_results["data_version"] = [{"version": 1}]
+
+        await watcher.check(supabase)
+        ttl_cache.set("categories", b"{}")
+        await watcher.check(supabase)
+        assert ttl_cache.get("categories") == b"{}"
+
+        supabase.table_results["data_version"] = [{"version": 2}]
+        await watcher.check(supabase)
+        assert ttl_cache.get("categories") is None
+        assert watcher.version == 2
+
+    async def test_checks_at_most_once_per_interval(self):
+        watcher = DataVersionWatcher(TTLCache(max_size=10, ttl=60), interval=60)
+        supabase = FakeSupabase()
+        supabase.table_results["data_version"] = [{"version": 1}]
+
+        await watcher.check(supabase)
+        await watcher.check(supabase)
+        assert len(supabase.calls_to("data_version")) == 1
+
+
+class TestCachedCatalogEndpoints:
+    """Test ETag/304 handling on the catalog endpoints."""
+
+    @pytest.fixture
+    def supabase(self, catalog_supabase):
+        fake = catalog_supabase
+        fake.rpc_results["get_categories_with_counts"] = CATEGORY_ROWS
+        catalog_cache.invalidate()
+        app.dependency_overrides[get_supabase] = lambda: fake
+        yield fake
+        app.dependency_overrides.pop(get_supabase, None)
+        catalog_cache.invalidate()
+
+    def test_second_request_served_from_cache(self, supabase):
+        client = TestClient(app)
+        first = client.get("/api/v1/categories")
+        second = client.get("/api/v1/categories")
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first.json()["categories"][0]["slug"] == "imaging"
+        assert len(supabase.calls_to("get_categories_with_counts")) == 1
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.headers["cache-control"].startswith("public, max-age=")
+
+    def test_if_none_match_returns_304(self, supabase):
+        client = TestClient(app)
+        etag = client.get("/api/v1/categories").headers["etag"]
+
+        response = client.get("/api/v1/categories", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        stale = client.get("/api/v1/categories", headers={"If-None-Match": '"other"'})
+        assert stale.status_code == 200
+
+    def test_not_found_is_not_cached(self, supabase):
+        client = TestClient(app)
+        for _ in range(2):
+            response = client.get("/api/v1/categories/missing/families")
+            assert response.status_code == 404
+        assert len(supabase.calls_to("get_families_with_counts")) == 2
+
+    def test_admin_invalidate(self, supabase, monkeypatch):
+        client = TestClient(app)
+        client.get("/api/v1/categories")
+
+        monkeypatch.delenv("ADMIN_API_KEY", raising=False)
+        assert client.post("/api/v1/admin/cache/invalidate").status_code == 404
+
+        monkeypatch.setenv("ADMIN_API_KEY", "secret")
+        denied = client.post("/api/v1/admin/cache/invalidate", headers={"X-Admin-Key": "nope"})
+        assert denied.status_code == 403
+
+        response = client.post("/api/v1/admin/cache/invalidate", headers={"X-Admin-Key": "secret"})
+        assert response.status_code == 200
+        assert response.json()["cleared"] == 1
+
+        client.get("/api/v1/categories")
+        assert len(supabase.calls_to("get_categories_with_counts")) == 2
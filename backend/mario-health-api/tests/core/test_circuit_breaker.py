@@ -0,0 +1,189 @@
+"""Unit tests for upstream circuit breakers and retry budgets."""
+import asyncio
+
+import pytest
+from postgrest.exceptions import APIError
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    RetryBudget,
+)
+from app.core.concurrency import UpstreamOverloaded
+from app.core.instrumentation import InstrumentedClient
+from tests.fakes import FakeSupabase
+
+
+def no_retries() -> RetryBudget:
+    budget = RetryBudget()
+    budget.tokens = 0
+    budget.ratio = 0
+    return budget
+
+
+async def fail():
+    raise ConnectionError("connection reset")
+
+
+async def succeed():
+    return "ok"
+
+
+async def trip(breaker: CircuitBreaker, failures: int):
+    for _ in range(failures):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker class."""
+
+    async def test_opens_at_failure_rate_after_min_calls(self):
+        breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=4, retry_budget=no_retries())
+
+        await breaker.call(succeed)
+        await breaker.call(succeed)
+        await trip(breaker, 1)
+        assert breaker.state == CLOSED  # 1 of 3 failed, below min_calls
+
+        await trip(breaker, 1)
+        assert breaker.state == OPEN
+        assert breaker.opened == 1
+
+    async def test_open_circuit_fails_fast_with_retry_after(self):
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=30, retry_budget=no_retries())
+        await trip(breaker, 1)
+        calls = []
+
+        async def tracked():
+            calls.append(1)
+            return "ok"
+
+        with pytest.raises(CircuitOpen) as exc_info:
+            await breaker.call(tracked)
+
+        assert calls == []
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "30"}
+        assert breaker.short_circuited == 1
+
+    async def test_half_open_probes_close_the_circuit(self):
+        breaker = CircuitBreaker(
+            "test", min_calls=1, open_seconds=0.01, half_open_probes=2, retry_budget=no_retries()
+        )
+        await trip(breaker, 1)
+        await asyncio.sleep(0.02)
+
+        assert await breaker.call(succeed) == "ok"
+        assert breaker.state == HALF_OPEN
+        assert await breaker.call(succeed) == "ok"
+        assert breaker.state == CLOSED
+        assert breaker.stats()["window_calls"] == 0
+
+    async def test_failed_probe_reopens_the_circuit(self):
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.01, retry_budget=no_retries())
+        await trip(breaker, 1)
+        await asyncio.sleep(0.02)
+
+        await trip(breaker, 1)
+
+        assert breaker.state == OPEN
+        assert breaker.opened == 2
+
+    async def test_half_open_limits_concurrent_probes(self):
+        breaker = CircuitBreaker(
+            "test", min_calls=1, open_seconds=0.01, half_open_probes=1, retry_budget=no_retries()
+        )
+        await trip(breaker, 1)
+        await asyncio.sleep(0.02)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        probe = asyncio.create_task(breaker.call(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpen):
+            await breaker.call(succeed)
+
+        release.set()
+        assert await probe == "ok"
+        assert breaker.state == CLOSED
+
+    async def test_bad_queries_and_local_shedding_do_not_trip(self):
+        breaker = CircuitBreaker("test", min_calls=1, retry_budget=no_retries())
+
+        async def bad_query():
+            raise APIError({"code": "42883", "message": "function does not exist"})
+
+        async def shed():
+            raise UpstreamOverloaded("detail", "queue_full")
+
+        with pytest.raises(APIError):
+            await breaker.call(bad_query)
+        with pytest.raises(UpstreamOverloaded):
+            await breaker.call(shed)
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["window_failures"] == 0
+
+
+class TestRetryBudget:
+    """Test retries of transient failures within the budget."""
+
+    async def test_transient_failure_is_retried_once(self):
+        breaker = CircuitBreaker("test")
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        assert await breaker.call(flaky) == "ok"
+        assert len(attempts) == 2
+        assert breaker.stats()["retries"] == 1
+        assert breaker.stats()["window_failures"] == 0
+
+    async def test_retries_are_capped_by_the_budget(self):
+        budget = RetryBudget(ratio=0.1, max_tokens=2)
+        breaker = CircuitBreaker("test", min_calls=1000, retry_budget=budget)
+        attempts = []
+
+        async def down():
+            attempts.append(1)
+            raise ConnectionError("connection refused")
+
+        for _ in range(20):
+            with pytest.raises(ConnectionError):
+                await breaker.call(down)
+
+        # 2 saved tokens + 20 calls x 0.1 earned: 4 retries at most
+        assert len(attempts) - 20 == budget.retries
+        assert budget.retries <= 4
+        assert budget.exhausted > 0
+
+
+class TestInstrumentedReads:
+    """Breakers apply to instrumented reads but never to writes."""
+
+    async def test_open_read_circuit_short_circuits_reads_only(self, monkeypatch):
+        breaker = CircuitBreaker("detail", min_calls=1, open_seconds=30, retry_budget=no_retries())
+        monkeypatch.setitem(circuit_breaker.upstream_breakers, "detail", breaker)
+        fake = FakeSupabase()
+        fake.table_results["procedure"] = ConnectionError("connection reset")
+        client = InstrumentedClient(fake)
+
+        with pytest.raises(ConnectionError):
+            await client.table("procedure").select("id").execute()
+        with pytest.raises(CircuitOpen):
+            await client.table("procedure").select("id").execute()
+        await client.table("saved_searches").insert({"query": "mri"}).execute()
+
+        assert [q.name for q in fake.executed] == ["procedure", "saved_searches"]
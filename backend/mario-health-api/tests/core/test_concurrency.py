@@ -0,0 +1,261 @@
+"""Unit tests for the adaptive upstream concurrency limiter."""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+
+from app.core import concurrency
+from app.core.concurrency import (
+    AdaptiveLimiter,
+    UpstreamOverloaded,
+    is_overload_error,
+    upstream_class,
+)
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.main import app
+from tests.fakes import FakeSupabase
+
+
+class CapacityLimitedUpstream:
+    """Upstream that serves ``capacity`` calls at a time; the rest queue."""
+
+    def __init__(self, capacity: int, service_time: float):
+        self.capacity = asyncio.Semaphore(capacity)
+        self.service_time = service_time
+
+    async def call(self):
+        async with self.capacity:
+            await asyncio.sleep(self.service_time)
+        return "ok"
+
+
+async def timed_calls(limiter, upstream, count):
+    async def one():
+        start = time.perf_counter()
+        try:
+            if limiter is None:
+                await upstream.call()
+            else:
+                async with limiter.slot():
+                    await upstream.call()
+            return "ok", time.perf_counter() - start
+        except UpstreamOverloaded as e:
+            return e.reason, time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(count)))
+
+
+class TestAdaptiveLimiter:
+    """Test AdaptiveLimiter class."""
+
+    async def test_calls_within_limit_run_immediately(self):
+        limiter = AdaptiveLimiter("test", max_limit=4, initial_limit=4)
+        running = []
+
+        async def call():
+            async with limiter.slot():
+                running.append(limiter.inflight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(4)))
+
+        assert max(running) == 4
+        assert limiter.queued == 0
+        assert limiter.inflight == 0
+
+    async def test_excess_calls_queue_then_run_in_order(self):
+        limiter = AdaptiveLimiter("test", max_limit=1, min_limit=1, queue_timeout=1.0)
+        order = []
+
+        async def call(i):
+            async with limiter.slot():
+                order.append(i)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call(i) for i in range(3)))
+
+        assert order == [0, 1, 2]
+        assert limiter.queued == 2
+        assert limiter.stats()["queue_depth"] == 0
+
+    async def test_full_queue_is_shed_with_503_and_retry_after(self):
+        limiter = AdaptiveLimiter("search", max_limit=1, min_limit=1, queue_size=1, retry_after=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(UpstreamOverloaded) as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "2"}
+        assert exc_info.value.reason == "queue_full"
+        assert limiter.rejected["queue_full"] == 1
+        release.set()
+        await asyncio.gather(holder, queued)
+        assert limiter.inflight == 0
+
+    async def test_queue_timeout_is_shed(self):
+        limiter = AdaptiveLimiter("test", max_limit=1, min_limit=1, queue_timeout=0.02)
+
+        async with limiter.slot():
+            with pytest.raises(UpstreamOverloaded, match="503") as exc_info:
+                await limiter.acquire()
+
+        assert exc_info.value.reason == "queue_timeout"
+        assert limiter.stats()["queue_depth"] == 0
+        assert limiter.inflight == 0
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = AdaptiveLimiter("test", max_limit=1, min_limit=1, queue_timeout=1.0)
+
+        async with limiter.slot():
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert limiter.inflight == 0
+        assert limiter.stats()["queue_depth"] == 0
+
+    async def test_fast_calls_grow_the_limit_additively(self):
+        limiter = AdaptiveLimiter("test", max_limit=10, initial_limit=2, latency_target=1.0)
+
+        for _ in range(4):
+            await limiter.acquire()
+            await limiter.acquire()
+            limiter.release(0.01)
+            limiter.release(0.01)
+
+        assert 3.0 < limiter.limit < 6.0
+
+    def test_slow_calls_back_off_multiplicatively_once_per_window(self):
+        limiter = AdaptiveLimiter("test", max_limit=100, initial_limit=50, latency_target=10.0)
+
+        for _ in range(5):
+            limiter.inflight += 1
+            limiter.release(11.0, congested=True)
+
+        assert limiter.limit == pytest.approx(45.0)
+        assert limiter.decreases == 1
+
+    async def test_slow_calls_below_saturation_keep_the_limit(self):
+        limiter = AdaptiveLimiter("test", max_limit=80, initial_limit=40, latency_target=0.01)
+
+        for _ in range(5):
+            async with limiter.slot():
+                await asyncio.sleep(0.02)
+
+        assert limiter.limit == 40.0
+        assert limiter.decreases == 0
+
+    async def test_slow_calls_near_saturation_back_off(self):
+        limiter = AdaptiveLimiter("test", max_limit=8, initial_limit=4, latency_target=0.01)
+
+        async def slow():
+            async with limiter.slot():
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(*(slow() for _ in range(4)))
+
+        assert limiter.limit < 4.0
+        assert limiter.decreases >= 1
+
+    def test_limit_stays_within_bounds(self):
+        limiter = AdaptiveLimiter("test", max_limit=3, min_limit=2, initial_limit=3, latency_target=0.0)
+
+        for _ in range(20):
+            limiter.inflight += 1
+            limiter.release(1.0, congested=True)
+        assert limiter.limit == 2.0
+
+        limiter.latency_target = 1.0
+        for _ in range(50):
+            limiter.inflight += 2
+            limiter.release(0.0)
+            limiter.release(0.0)
+        assert limiter.limit == 3.0
+
+
+class TestClassification:
+    """Test which calls count as which class and which errors as congestion."""
+
+    def test_upstream_class(self):
+        assert upstream_class("rpc", "search_procedures_v2") == "search"
+        assert upstream_class("rpc", "get_procedure_price_summaries") == "search"
+        assert upstream_class("rpc", "get_procedure_detail") == "detail"
+        assert upstream_class("rpc", "get_provider_geo_corpus") == "bulk"
+        assert upstream_class("rpc", "get_zip_centroids") == "bulk"
+        assert upstream_class("table", "procedure") == "detail"
+        assert upstream_class("table", "saved_searches", write=True) == "write"
+
+    def test_overload_errors(self):
+        pool_timeout = APIError({"code": "PGRST003", "message": "Timed out acquiring connection"})
+        missing_function = APIError({"code": "PGRST202", "message": "Could not find function"})
+        connection_lost = APIError({"code": "08006", "message": "connection failure"})
+
+        assert is_overload_error(pool_timeout)
+        assert is_overload_error(connection_lost)
+        assert is_overload_error(ConnectionError())
+        assert is_overload_error(asyncio.TimeoutError())
+        assert not is_overload_error(missing_function)
+        assert not is_overload_error(RuntimeError("bug"))
+        assert not is_overload_error(asyncio.CancelledError())
+
+    def test_instrumented_writes_use_the_write_class(self):
+        query = InstrumentedClient(FakeSupabase()).table("saved_searches")
+
+        assert query.write is False
+        assert query.select("*").eq("user_id", "u1").write is False
+        assert query.insert({"query": "mri"}).write is True
+        assert query.delete().eq("id", "1").write is True
+
+
+class TestOverload:
+    """Tail latency under a burst far beyond upstream capacity."""
+
+    async def test_limiter_bounds_tail_latency_and_sheds_the_excess(self):
+        # 200 calls at once against capacity 5 x 20ms: draining them all takes
+        # ~800ms, so unlimited callers at the back wait that long.
+        unlimited = await timed_calls(None, CapacityLimitedUpstream(5, 0.02), 200)
+        limited = await timed_calls(
+            AdaptiveLimiter("test", max_limit=10, initial_limit=5, latency_target=0.05, queue_timeout=0.1),
+            CapacityLimitedUpstream(5, 0.02),
+            200,
+        )
+
+        unlimited_worst = max(latency for _, latency in unlimited)
+        served = [latency for outcome, latency in limited if outcome == "ok"]
+        shed = [latency for outcome, latency in limited if outcome != "ok"]
+
+        assert unlimited_worst > 0.6
+        assert served and shed
+        # Served calls waited at most the queue timeout plus a few round trips
+        assert max(served) < 0.3
+        # Shed calls failed fast, within the queue timeout
+        assert max(shed) < 0.2
+
+    async def test_endpoint_returns_503_with_retry_after_when_saturated(self, monkeypatch):
+        saturated = AdaptiveLimiter("search", max_limit=1, min_limit=1, queue_size=0)
+        monkeypatch.setitem(concurrency.upstream_limiters, "search", saturated)
+        saturated.inflight = 1  # every slot taken by other requests
+
+        app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(FakeSupabase())
+        try:
+            response = TestClient(app).get("/api/v1/search?q=overloaded-endpoint-test")
+        finally:
+            app.dependency_overrides.pop(get_supabase, None)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert saturated.rejected["queue_full"] == 1
@@ -0,0 +1,128 @@
+"""Unit tests for vectorized distance ranking."""
+from math import asin, cos, radians, sin, sqrt
+
+import numpy as np
+import pytest
+
+from app.core.geo import (
+    bounding_box,
+    coordinate_arrays,
+    expanding_radii,
+    first_ring_holding,
+    haversine_miles,
+    in_bounding_box,
+    nearest_within,
+)
+
+CAMBRIDGE = (42.377, -71.1167)
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 3958.8 * 2 * asin(sqrt(a))
+
+
+class TestHaversine:
+    """Test distances over arrays."""
+
+    def test_matches_scalar_formula(self):
+        rng = np.random.default_rng(7)
+        lats = rng.uniform(25, 49, 500)
+        lons = rng.uniform(-124, -67, 500)
+
+        distances = haversine_miles(*CAMBRIDGE, lats, lons)
+
+        expected = [scalar_haversine(*CAMBRIDGE, lat, lon) for lat, lon in zip(lats, lons)]
+        np.testing.assert_allclose(distances, expected, rtol=1e-9)
+
+    def test_known_distance(self):
+        (boston_to_nyc,) = haversine_miles(42.3601, -71.0589, np.array([40.7128]), np.array([-74.0060]))
+        assert boston_to_nyc == pytest.approx(190, abs=1)
+
+
+class TestCoordinateArrays:
+    """Test conversion of PostgREST rows."""
+
+    def test_strings_numbers_and_missing_values(self):
+        rows = [
+            {"latitude": "42.37", "longitude": "-71.11"},
+            {"latitude": 40.75, "longitude": -73.99},
+            {"latitude": None, "longitude": -73.99},
+            {},
+        ]
+
+        lats, lons = coordinate_arrays(rows)
+
+        assert lats.dtype == np.float64
+        np.testing.assert_array_equal(lats[:2], [42.37, 40.75])
+        assert np.isnan(lats[2]) and np.isnan(lats[3]) and np.isnan(lons[3])
+
+
+class TestNearestWithin:
+    """Test radius filtering and top-k selection."""
+
+    def test_nearest_first_within_radius(self):
+        lats = np.array([42.50, 42.38, 40.75, 42.40, np.nan])
+        lons = np.array([-71.10, -71.12, -73.99, -71.10, -71.11])
+
+        nearest, distances, total = nearest_within(*CAMBRIDGE, lats, lons, 25, 10)
+
+        assert nearest.tolist() == [1, 3, 0]
+        assert total == 3
+        assert np.all(np.diff(distances) >= 0)
+        assert distances[0] == pytest.approx(scalar_haversine(*CAMBRIDGE, 42.38, -71.12))
+
+    def test_top_k_matches_full_sort_and_keeps_ties_in_input_order(self):
+        rng = np.random.default_rng(3)
+        lats = np.round(rng.uniform(42.0, 42.8, 2000), 2)
+        lons = np.round(rng.uniform(-71.5, -70.8, 2000), 2)
+        distances = haversine_miles(*CAMBRIDGE, lats, lons)
+        expected = sorted(np.flatnonzero(distances <= 25).tolist(), key=lambda i: distances[i])
+
+        for k in (1, 7, 50, 5000):
+            nearest, _, total = nearest_within(*CAMBRIDGE, lats, lons, 25, k)
+
+            assert nearest.tolist() == expected[:k]
+            assert total == len(expected)
+
+    def test_empty_and_zero_k(self):
+        empty = np.array([], dtype=np.float64)
+        assert nearest_within(*CAMBRIDGE, empty, empty, 25, 5)[2] == 0
+
+        nearest, distances, total = nearest_within(*CAMBRIDGE, np.array([42.38]), np.array([-71.12]), 25, 0)
+        assert nearest.size == 0 and distances.size == 0 and total == 1
+
+
+class TestBoundingBox:
+    """Test the prefilter box."""
+
+    def test_box_contains_radius(self):
+        box = bounding_box(*CAMBRIDGE, 25)
+        lats = np.array([42.377 + 24 / 69, 42.377, 43.5])
+        lons = np.array([-71.1167, -71.1167 + 0.4, -71.1167])
+
+        assert box[0] < CAMBRIDGE[0] < box[1] and box[2] < CAMBRIDGE[1] < box[3]
+        assert in_bounding_box(lats, lons, box).tolist() == [True, True, False]
+
+
+class TestExpandingRadii:
+    """Test the rings of an expanding search."""
+
+    def test_doubles_up_to_maximum(self):
+        assert expanding_radii(25, 100) == [25, 50, 100]
+        assert expanding_radii(10, 30) == [10, 20, 30]
+        assert expanding_radii(1, 100) == [1, 2, 4, 8, 16, 32, 64, 100]
+
+    def test_single_ring_without_larger_maximum(self):
+        assert expanding_radii(25, 25) == [25]
+        assert expanding_radii(50, 10) == [50]
+
+    def test_first_ring_holding(self):
+        radii = [25, 50, 100]
+
+        assert first_ring_holding(radii, [3.0, 30.0, 60.0], 1) == 25
+        assert first_ring_holding(radii, [3.0, 30.0, 60.0], 2) == 50
+        assert first_ring_holding(radii, [3.0, 30.0, 50.0], 3) == 50
+        assert first_ring_holding(radii, [3.0], 2) == 100
+        assert first_ring_holding(radii, [], 1) == 100
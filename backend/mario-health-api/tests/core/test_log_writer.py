@@ -0,0 +1,57 @@
+"""Unit tests for the batched structured log writer."""
+import io
+import json
+from decimal import Decimal
+
+from app.core.log_writer import StructuredLogWriter
+from app.middleware import logging as structured_logging
+
+
+class TestStructuredLogWriter:
+    """Test StructuredLogWriter class."""
+
+    def test_writes_json_lines_in_batches(self):
+        stream = io.StringIO()
+        writer = StructuredLogWriter(stream=stream, batch_size=2, flush_interval=0.01)
+
+        for i in range(5):
+            writer.submit({"severity": "INFO", "message": f"event {i}", "price": Decimal("1.50")})
+        assert writer.flush(timeout=2)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["message"] for line in lines] == [f"event {i}" for i in range(5)]
+        assert lines[0]["price"] == "1.50"
+
+    def test_drops_when_queue_is_full_and_reports_count(self):
+        stream = io.StringIO()
+        writer = StructuredLogWriter(stream=stream, queue_size=2, flush_interval=60)
+        writer._ensure_started = lambda: None  # keep the writer idle while filling
+
+        results = [writer.submit({"message": str(i)}) for i in range(4)]
+        assert results == [True, True, False, False]
+
+        del writer._ensure_started
+        writer._ensure_started()
+        assert writer.flush(timeout=2)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert lines[-1]["dropped"] == 2
+
+
+class TestLogStructured:
+    """Test level gating and sampling in log_structured."""
+
+    def test_debug_gated_and_events_sampled(self, monkeypatch):
+        submitted = []
+        monkeypatch.setattr(structured_logging.log_writer, "submit", submitted.append)
+        monkeypatch.setattr(structured_logging, "LOG_LEVEL", 20)
+        monkeypatch.setattr(
+            structured_logging, "LOG_SAMPLE_RATES", {"get_procedure_detail": 0.0}
+        )
+
+        structured_logging.log_structured("DEBUG", "bbox debug")
+        structured_logging.log_structured("INFO", "viewed", event_type="get_procedure_detail")
+        structured_logging.log_structured("WARNING", "slow", event_type="get_procedure_detail")
+        structured_logging.log_structured("INFO", "Search completed")
+
+        assert [e["message"] for e in submitted] == ["slow", "Search completed"]
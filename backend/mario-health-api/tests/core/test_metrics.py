@@ -0,0 +1,122 @@
+"""Unit tests for metrics recording and exposition."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.core.metrics import (
+    Registry,
+    http_request_duration,
+    upstream_request_duration,
+)
+from app.main import app
+from tests.fakes import FakeSupabase
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestRegistry:
+    """Test metric types and text rendering."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+        child = latency.labels("/a")
+        for value in (0.05, 0.1, 0.5, 3.0):
+            child.observe(value)
+
+        text = registry.render()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{route="/a"} 4' in text
+        assert _sample(text, 'latency_seconds_sum{route="/a"}') == pytest.approx(3.65)
+
+    def test_counter_gauge_and_label_escaping(self):
+        registry = Registry()
+        counter = registry.counter("events_total", "test", ("name",))
+        gauge = registry.gauge("in_flight", "test")
+        counter.labels('say "hi"').inc(2)
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        text = registry.render()
+        assert 'events_total{name="say \\"hi\\""} 2' in text
+        assert "in_flight 1" in text
+
+    def test_wrong_label_count_rejected(self):
+        registry = Registry()
+        counter = registry.counter("events_total", "test", ("a", "b"))
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+
+class TestUpstreamInstrumentation:
+    """Test the instrumented client proxy."""
+
+    async def test_records_rpc_and_table_calls(self):
+        fake = FakeSupabase()
+        fake.rpc_results["get_procedure_detail"] = [{"id": "proc_001"}]
+        fake.table_results["procedure_org_pricing"] = [{"org_id": "org_1"}]
+        client = InstrumentedClient(fake)
+
+        rpc_before = upstream_request_duration.labels("rpc", "get_procedure_detail", "ok").counts[:]
+        table = upstream_request_duration.labels("table", "procedure_org_pricing", "ok")
+        table_before = sum(table.counts)
+
+        result = await client.rpc("get_procedure_detail", {"procedure_slug_input": "x"}).execute()
+        rows = await client.table("procedure_org_pricing").select("org_id").eq("procedure_id", "p").execute()
+
+        assert result.data == [{"id": "proc_001"}]
+        assert rows.data == [{"org_id": "org_1"}]
+        rpc_after = upstream_request_duration.labels("rpc", "get_procedure_detail", "ok").counts
+        assert sum(rpc_after) == sum(rpc_before) + 1
+        assert sum(table.counts) == table_before + 1
+        # Filters were passed through to the real builder
+        assert fake.calls_to("procedure_org_pricing")[0].calls[1][0] == "eq"
+
+    async def test_records_errors(self):
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v2"] = RuntimeError("boom")
+        errors = upstream_request_duration.labels("rpc", "search_procedures_v2", "error")
+        before = sum(errors.counts)
+
+        with pytest.raises(RuntimeError):
+            await InstrumentedClient(fake).rpc("search_procedures_v2", {}).execute()
+        assert sum(errors.counts) == before + 1
+
+
+class TestMetricsEndpoint:
+    """Test /metrics and request recording by route template."""
+
+    def test_requests_recorded_by_route_template(self):
+        fake = FakeSupabase()
+        fake.table_results["procedure"] = []
+        app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(fake)
+        try:
+            client = TestClient(app)
+            child = http_request_duration.labels("GET", "/api/v1/procedures/{slug}", "404")
+            before = sum(child.counts)
+            client.get("/api/v1/procedures/does-not-exist")
+            client.get("/api/v1/procedures/also-missing")
+        finally:
+            app.dependency_overrides.pop(get_supabase, None)
+
+        assert sum(child.counts) == before + 2
+
+        text = client.get("/metrics").text
+        assert 'route="/api/v1/procedures/{slug}"' in text
+        assert "does-not-exist" not in text
+        assert 'upstream_request_duration_seconds_count{kind="table",name="procedure",status="ok"}' in text
+        assert 'cache_hit_ratio{cache="search"}' in text
+        assert "http_requests_in_flight" in text
+        assert "singleflight_merged_total" in text
+        assert 'upstream_concurrency_limit{class="search"}' in text
+        assert 'upstream_rejected_total{class="write",reason="queue_full"}' in text
@@ -0,0 +1,45 @@
+"""Unit tests for the asyncpg read path."""
+from app.core.pg_backend import PREPARED_RPCS, AsyncpgClient, PreparedRpcCall
+from tests.fakes import FakeSupabase
+
+
+class TestPreparedRpc:
+    """Test SQL generation and parameter binding."""
+
+    def test_sql_uses_named_arguments(self):
+        rpc = PREPARED_RPCS["search_procedures_v2"]
+
+        assert rpc.sql == (
+            "SELECT * FROM search_procedures_v2("
+            "search_query => $1, zip_code_input => $2, radius_miles => $3)"
+        )
+
+    def test_bind_fills_function_defaults(self):
+        rpc = PREPARED_RPCS["search_procedures_v2"]
+
+        assert rpc.bind({"search_query": "mri"}) == ["mri", None, 25]
+        assert rpc.bind(
+            {"search_query": "mri", "zip_code_input": "02138", "radius_miles": 10}
+        ) == ["mri", "02138", 10]
+
+
+class TestAsyncpgClient:
+    """Test routing between asyncpg and PostgREST."""
+
+    def test_hot_rpc_goes_to_asyncpg(self):
+        client = AsyncpgClient(pool=object(), postgrest_client=FakeSupabase())
+
+        call = client.rpc("get_procedure_detail", {"procedure_slug_input": "brain-mri"})
+
+        assert isinstance(call, PreparedRpcCall)
+
+    async def test_other_calls_fall_through_to_postgrest(self):
+        fake = FakeSupabase()
+        fake.rpc_results["get_billing_code_detail"] = [{"code": "70551"}]
+        client = AsyncpgClient(pool=object(), postgrest_client=fake)
+
+        response = await client.rpc("get_billing_code_detail", {"code_input": "70551"}).execute()
+        await client.table("procedure").select("*").execute()
+
+        assert response.data == [{"code": "70551"}]
+        assert [q.name for q in fake.executed] == ["get_billing_code_detail", "procedure"]
@@ -0,0 +1,52 @@
+"""Unit tests for the concurrent query executor."""
+import asyncio
+import time
+
+import pytest
+
+from app.core.query_executor import QueryExecutor
+
+
+async def _sleep_then(value, delay=0.1):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail(delay=0.0):
+    await asyncio.sleep(delay)
+    raise ValueError("boom")
+
+
+class TestQueryExecutor:
+    """Test QueryExecutor class."""
+
+    async def test_runs_queries_concurrently_in_argument_order(self):
+        qx = QueryExecutor("test")
+
+        start = time.perf_counter()
+        results = await qx.gather(first=_sleep_then(1), second=_sleep_then(2), third=_sleep_then(3))
+        elapsed = time.perf_counter() - start
+
+        assert results == [1, 2, 3]
+        assert elapsed < 0.25
+        assert set(qx.timings) == {"first", "second", "third"}
+        assert all(ms >= 90 for ms in qx.timings.values())
+
+    async def test_failure_cancels_siblings_and_reraises(self):
+        qx = QueryExecutor("test")
+        slow = asyncio.ensure_future(_sleep_then("slow", delay=5))
+
+        with pytest.raises(ValueError):
+            await qx.gather(slow=slow, failing=_fail())
+
+        await asyncio.sleep(0)
+        assert slow.cancelled()
+        assert qx.errors == {"failing": "ValueError"}
+
+    async def test_return_exceptions_keeps_partial_results(self):
+        qx = QueryExecutor("test")
+
+        ok, failed = await qx.gather(ok=_sleep_then("ok", 0), failed=_fail(), return_exceptions=True)
+
+        assert ok == "ok"
+        assert isinstance(failed, ValueError)
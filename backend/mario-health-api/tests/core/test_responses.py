@@ -0,0 +1,69 @@
+"""Unit tests for the fast response serialization path."""
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.responses import ORJSONResponse, validate_many
+from app.models import ProcedureOrg, ProcedureOrgsResponse
+
+ORG_ROWS = [
+    {
+        "procedure_id": "proc_brain_mri",
+        "org_id": f"org_{i}",
+        "carrier_id": "cigna_national_oap",
+        "carrier_name": "Cigna",
+        "count_provider": i,
+        "min_price": 45 + i * 0.37,
+        "max_price": 145,
+        "avg_price": 112.25,
+        "org_name": "Clínica Médica",
+        "org_type": "Hospital",
+        "address": "1 Main St",
+        "city": "Boston",
+        "state": "MA",
+        "zip_code": "02138",
+        "latitude": 42,
+        "longitude": -71.1167,
+        "phone": "555-0100",
+    }
+    for i in range(25)
+]
+
+
+def _response() -> ProcedureOrgsResponse:
+    return ProcedureOrgsResponse(
+        procedure_name="MRI Scan (Brain)",
+        procedure_slug="mri-scan-brain",
+        orgs=validate_many(ProcedureOrg, ORG_ROWS),
+    )
+
+
+class TestFastResponsePath:
+    """The fast path must not change what clients receive."""
+
+    def test_validate_many_matches_per_row_construction(self):
+        bulk = validate_many(ProcedureOrg, ORG_ROWS)
+        per_row = [ProcedureOrg(**row) for row in ORG_ROWS]
+
+        assert bulk == per_row
+        assert bulk[1].min_price == Decimal(str(ORG_ROWS[1]["min_price"]))
+
+    def test_orjson_response_is_byte_identical_to_default(self):
+        app = FastAPI()
+
+        @app.get("/default", response_model=ProcedureOrgsResponse)
+        async def default():
+            return _response()
+
+        @app.get("/fast", response_model=ProcedureOrgsResponse)
+        async def fast():
+            return ORJSONResponse(_response())
+
+        client = TestClient(app)
+        default_response = client.get("/default")
+        fast_response = client.get("/fast")
+
+        assert fast_response.content == default_response.content
+        assert fast_response.headers["content-type"] == default_response.headers["content-type"]
+        assert fast_response.json()["orgs"][0]["avg_price"] == "112.25"
@@ -0,0 +1,89 @@
+"""Unit tests for single-flight call coalescing."""
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight class."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "proc_001"}
+
+        results = await asyncio.gather(*(flight.do("detail", fetch) for _ in range(10)))
+
+        assert calls == [1]
+        assert all(r is results[0] for r in results)
+        stats = flight.stats()
+        assert stats["executions"] == 1
+        assert stats["merged"] == 9
+        assert stats["max_waiters"] == 10
+        assert stats["inflight"] == 0
+
+    async def test_different_keys_and_sequential_calls_are_not_merged(self):
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+        await flight.do("a", fetch)
+
+        assert flight.stats()["executions"] == 3
+        assert flight.stats()["merged"] == 0
+
+    async def test_errors_are_shared_and_key_released(self):
+        flight = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.stats()["errors"] == 1
+
+        async def ok():
+            return "ok"
+
+        assert await flight.do("k", ok) == "ok"
+
+    async def test_timeout_applies_to_every_waiter(self):
+        flight = SingleFlight("test", timeout=0.05)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        results = await asyncio.gather(
+            flight.do("k", hang), flight.do("k", hang), return_exceptions=True
+        )
+        assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+        assert flight.stats()["timeouts"] == 1
+        assert flight.inflight == 0
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
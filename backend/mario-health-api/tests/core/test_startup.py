@@ -0,0 +1,34 @@
+"""Unit tests for the startup timeline."""
+
+from app.core.startup import StartupTimeline, profile_imports
+
+
+class TestStartupTimeline:
+    """Test StartupTimeline class."""
+
+    def test_marks_are_ordered_with_deltas(self):
+        timeline = StartupTimeline()
+        timeline.mark("first")
+        timeline.mark("second")
+
+        report = timeline.report()
+        first, second = report["marks"]
+        assert [first["name"], second["name"]] == ["first", "second"]
+        assert second["at_ms"] >= first["at_ms"]
+        assert second["delta_ms"] == round(second["at_ms"] - first["at_ms"], 2)
+        assert report["total_ms"] == second["at_ms"]
+
+    def test_empty_report(self):
+        assert StartupTimeline().report()["total_ms"] == 0.0
+
+    def test_app_records_startup_marks(self, test_client):
+        names = [m["name"] for m in test_client.get("/health/startup").json()["marks"]]
+        assert names[:3] == ["fastapi_imported", "routers_imported", "app_configured"]
+
+
+def test_firebase_admin_not_imported_by_app():
+    """Firebase Admin is loaded on first authenticated request, not at import."""
+    timings = profile_imports("app.main", top=10_000)
+    modules = {t["module"] for t in timings}
+    assert "app.main" in modules
+    assert "firebase_admin" not in modules
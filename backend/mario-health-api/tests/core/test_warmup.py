@@ -0,0 +1,105 @@
+"""Unit tests for startup warm-up and readiness."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import warmup
+from app.core.cache import catalog_cache
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.core.result_cache import MemoryBackend, ResultCache
+from app.core.warmup import WarmupState, run_warmup, warmup_paths
+from app.main import app
+from app.services import search_service
+
+
+@pytest.fixture
+def fake(catalog_supabase, monkeypatch):
+    fake = catalog_supabase
+    fake.rpc_results["get_categories_with_counts"] = [
+        {"id": "cat_001", "name": "Imaging", "slug": "imaging", "emoji": "", "family_count": 1},
+        {"id": "cat_002", "name": "Labs", "slug": "labs", "emoji": "", "family_count": 1},
+    ]
+    fake.rpc_results["get_families_with_counts"] = [
+        {"id": "fam_001", "name": "X-Ray", "slug": "x-ray", "procedure_count": 1}
+    ]
+    fake.table_results["specialty"] = [
+        {"id": "spec_1", "name": "Cardiologist", "slug": "cardiologist", "is_used": True, "description": ""}
+    ]
+    fake.rpc_results["search_procedures_v2"] = []
+    fake.rpc_results["get_suggestion_corpus"] = [
+        {"kind": "procedure", "label": "Abdominal MRI", "slug": "abdominal-mri", "name": "Abdominal MRI"}
+    ]
+
+    catalog_cache.invalidate()
+    monkeypatch.setattr(search_service, "search_cache", ResultCache("search", MemoryBackend()))
+    monkeypatch.setattr(warmup, "WARMUP_SEARCH_QUERIES", ["mri", "ct scan"])
+    monkeypatch.setattr(warmup, "WARMUP_ZIPS", ["02138"])
+    app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(fake)
+    yield fake
+    app.dependency_overrides.pop(get_supabase, None)
+    catalog_cache.invalidate()
+
+
+class TestWarmup:
+    """Test run_warmup and the /ready endpoint."""
+
+    def test_warmup_paths(self, monkeypatch):
+        monkeypatch.setattr(warmup, "WARMUP_SEARCH_QUERIES", ["ct scan"])
+        monkeypatch.setattr(warmup, "WARMUP_ZIPS", ["02138"])
+        monkeypatch.setattr(warmup, "WARMUP_PROCEDURES", ["chest-x-ray"])
+
+        assert warmup_paths(["imaging"]) == [
+            "/api/v1/categories/imaging/families",
+            "/api/v1/specialties",
+            "/api/v1/insurance/providers",
+            "/api/v1/search/suggest?q=a",
+            "/api/v1/procedures/chest-x-ray",
+            "/api/v1/search?q=ct+scan",
+            "/api/v1/search?q=ct+scan&zip=02138",
+        ]
+
+    async def test_warmup_fills_catalog_and_search_caches(self, fake):
+        state = await run_warmup(app, WarmupState())
+
+        assert state.ready
+        assert not state.timed_out
+        assert state.failed == []
+        assert state.requests == 1 + 2 + 3 + 4  # categories, families x2, catalog, searches
+        assert catalog_cache.get("categories") is not None
+        assert catalog_cache.get("categories:labs:families") is not None
+
+        search_calls = len(fake.calls_to("search_procedures_v2"))
+        assert search_calls == 4
+        await search_service.search_cache.get_or_load("mri|02138|25", pytest.fail)
+        assert search_service.search_cache.stats()["hits"] == 1
+
+    async def test_failures_are_recorded_and_instance_still_becomes_ready(self, fake):
+        fake.rpc_results["get_categories_with_counts"] = ConnectionError("connection refused")
+
+        state = await run_warmup(app, WarmupState())
+
+        assert state.ready
+        assert state.failed[0].startswith("/api/v1/categories: ")
+
+    async def test_timeout_makes_the_instance_ready(self, fake, monkeypatch):
+        fake.delay = 1.0
+        monkeypatch.setattr(warmup, "WARMUP_TIMEOUT", 0.05)
+
+        state = await run_warmup(app, WarmupState())
+
+        assert state.ready
+        assert state.timed_out
+
+    def test_ready_endpoint_reflects_warmup_state(self, monkeypatch):
+        state = WarmupState()
+        monkeypatch.setattr("app.main.warmup_state", state)
+        client = TestClient(app)
+
+        not_ready = client.get("/ready")
+        state.finish()
+        ready = client.get("/ready")
+
+        assert not_ready.status_code == 503
+        assert not_ready.json()["ready"] is False
+        assert ready.status_code == 200
+        assert client.get("/health").status_code == 200
@@ -0,0 +1,58 @@
+"""In-memory stand-in for the async Supabase client used by unit tests."""
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Union
+
+Result = Union[List[Dict[str, Any]], Dict[str, Any], Callable[..., Any], None]
+
+
+class FakeQuery:
+    """Chainable PostgREST-style builder that records every call."""
+
+    def __init__(self, client: "FakeSupabase", kind: str, name: str, params=None):
+        self.client = client
+        self.kind = kind
+        self.name = name
+        self.params = params or {}
+        self.calls: List[tuple] = []
+
+    def __getattr__(self, method: str):
+        def chain(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+            return self
+
+        return chain
+
+    async def execute(self):
+        self.client.executed.append(self)
+        if self.client.delay:
+            await asyncio.sleep(self.client.delay)
+
+        source = (
+            self.client.rpc_results if self.kind == "rpc" else self.client.table_results
+        )
+        data = source.get(self.name, [])
+        if isinstance(data, Exception):
+            raise data
+        if callable(data):
+            data = data(self)
+        return SimpleNamespace(data=data)
+
+
+class FakeSupabase:
+    """Minimal async Supabase client: ``await client.rpc(...).execute()``."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.rpc_results: Dict[str, Result] = {}
+        self.table_results: Dict[str, Result] = {}
+        self.executed: List[FakeQuery] = []
+
+    def rpc(self, fn: str, params=None, *args, **kwargs) -> FakeQuery:
+        return FakeQuery(self, "rpc", fn, params)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, "table", name)
+
+    def calls_to(self, name: str) -> List[FakeQuery]:
+        return [q for q in self.executed if q.name == name]
@@ -0,0 +1,113 @@
+"""Unit tests for the request logging middleware."""
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_supabase
+from app.main import app as api_app
+from app.middleware import logging as structured_logging
+from app.middleware.logging import RequestLoggingMiddleware
+from tests.fakes import FakeSupabase
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    entries = []
+    monkeypatch.setattr(
+        structured_logging, "log_structured", lambda **kw: entries.append(kw)
+    )
+    return entries
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="nope")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("kaboom")
+
+    app.add_middleware(RequestLoggingMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestRequestLoggingMiddleware:
+    """Test RequestLoggingMiddleware class."""
+
+    def test_request_id_propagated_to_state_and_header(self, client, logged):
+        response = client.get(
+            "/ok", headers={"X-Request-ID": "abc", "Origin": "https://mario.health"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"request_id": "abc"}
+        assert response.headers["X-Request-ID"] == "abc"
+
+        [entry] = logged
+        assert entry["severity"] == "INFO"
+        assert entry["message"] == "GET /ok"
+        assert entry["status_code"] == 200
+        assert entry["origin"] == "https://mario.health"
+        assert entry["has_auth"] is False
+
+    def test_generates_request_id(self, client, logged):
+        response = client.get("/ok")
+
+        assert response.headers["X-Request-ID"].startswith("req_")
+        assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+    def test_http_exception_logged_as_warning(self, client, logged):
+        response = client.get("/missing")
+
+        assert response.status_code == 404
+        assert "X-Request-ID" in response.headers
+        assert logged[0]["severity"] == "WARNING"
+        assert logged[0]["status_code"] == 404
+
+    def test_unexpected_error_mapped_to_500(self, client, logged):
+        response = client.get("/boom", headers={"X-Request-ID": "r1"})
+
+        assert response.status_code == 500
+        assert response.json() == {
+            "error": "Internal server error. Please try again later.",
+            "request_id": "r1",
+        }
+        assert response.headers["X-Request-ID"] == "r1"
+        assert logged[0]["severity"] == "ERROR"
+        assert logged[0]["error"]["type"] == "RuntimeError"
+
+    def test_slow_request_warning(self, client, logged, monkeypatch):
+        monkeypatch.setattr(structured_logging, "SLOW_REQUEST_THRESHOLD_MS", -1)
+
+        client.get("/ok")
+
+        assert logged[-1]["message"] == "Slow request: GET /ok"
+
+
+class TestMiddlewareOrder:
+    """The API's own middleware stack."""
+
+    def test_cross_origin_500_carries_cors_headers(self, logged):
+        fake = FakeSupabase()
+        fake.rpc_results["get_procedure_search_corpus"] = RuntimeError("no database")
+        fake.rpc_results["search_procedures_v2"] = RuntimeError("no database")
+        api_app.dependency_overrides[get_supabase] = lambda: fake
+        try:
+            response = TestClient(api_app, raise_server_exceptions=False).get(
+                "/api/v1/search?q=test", headers={"Origin": "http://localhost:3000"}
+            )
+        finally:
+            api_app.dependency_overrides.pop(get_supabase, None)
+
+        assert response.status_code == 500
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert "X-Request-ID" in response.headers
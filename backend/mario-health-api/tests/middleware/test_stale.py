@@ -0,0 +1,132 @@
+"""Unit tests for the stale-response fallback middleware."""
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core import circuit_breaker
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.main import app as mario_app
+from app.middleware.stale import StaleResponseMiddleware
+from app.services import procedure_service
+from tests.fakes import FakeSupabase
+
+
+@pytest.fixture
+def upstream():
+    return {"failure": None, "calls": 0}
+
+
+@pytest.fixture
+def store():
+    return TTLCache(max_size=10, ttl=60)
+
+
+@pytest.fixture
+def client(upstream, store):
+    app = FastAPI()
+
+    @app.get("/api/v1/categories")
+    async def categories(request: Request):
+        upstream["calls"] += 1
+        if upstream["failure"] is not None:
+            raise upstream["failure"]
+        return {"categories": [{"slug": "imaging"}], "call": upstream["calls"]}
+
+    app.add_middleware(StaleResponseMiddleware, store=store)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestStaleResponseMiddleware:
+    """Test StaleResponseMiddleware class."""
+
+    def test_fresh_responses_pass_through(self, client, store):
+        response = client.get("/api/v1/categories")
+
+        assert response.status_code == 200
+        assert "x-stale" not in response.headers
+        assert len(store._entries) == 1
+
+    @pytest.mark.parametrize(
+        "failure",
+        [
+            CircuitOpen("detail", 5),
+            HTTPException(status_code=503, detail="Search temporarily unavailable"),
+            ConnectionError("connection reset"),
+        ],
+        ids=["circuit_open", "service_503", "connection_error"],
+    )
+    def test_last_good_response_served_when_upstream_fails(self, client, upstream, failure):
+        good = client.get("/api/v1/categories")
+        upstream["failure"] = failure
+
+        response = client.get("/api/v1/categories")
+
+        assert response.status_code == 200
+        assert response.json() == good.json()
+        assert response.headers["x-stale"] == "true"
+        assert response.headers["cache-control"] == "no-store"
+        assert int(response.headers["age"]) >= 0
+
+    def test_failure_without_stored_response_passes_through(self, client, upstream):
+        upstream["failure"] = CircuitOpen("detail", 5)
+
+        response = client.get("/api/v1/categories")
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+
+    def test_client_errors_and_bugs_are_not_masked(self, client, upstream):
+        client.get("/api/v1/categories")
+
+        upstream["failure"] = HTTPException(status_code=404, detail="nope")
+        assert client.get("/api/v1/categories").status_code == 404
+        upstream["failure"] = RuntimeError("kaboom")
+        assert client.get("/api/v1/categories").status_code == 500
+
+    def test_query_string_is_part_of_the_key(self, client, upstream):
+        client.get("/api/v1/categories?page=1")
+        upstream["failure"] = CircuitOpen("detail", 5)
+
+        assert client.get("/api/v1/categories?page=2").status_code == 503
+        assert client.get("/api/v1/categories?page=1").status_code == 200
+
+    def test_authenticated_requests_are_never_stored(self, client, upstream, store):
+        client.get("/api/v1/categories", headers={"Authorization": "Bearer token"})
+
+        assert len(store._entries) == 0
+
+
+def test_procedure_orgs_served_stale_while_circuit_is_open(monkeypatch):
+    """End to end: an outage opens the circuit; the last good orgs list is served."""
+    fake = FakeSupabase()
+    fake.table_results["procedure"] = [{"id": "proc_001"}]
+    fake.rpc_results["get_procedure_detail"] = [{"id": "proc_001", "name": "Chest X-Ray", "slug": "chest-x-ray"}]
+    fake.table_results["procedure_org_pricing"] = []
+    breaker = CircuitBreaker("detail", failure_rate=0.1, min_calls=1, open_seconds=30)
+    monkeypatch.setitem(circuit_breaker.upstream_breakers, "detail", breaker)
+    procedure_service._procedure_ids.clear()
+    mario_app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(fake)
+    try:
+        client = TestClient(mario_app)
+        good = client.get("/api/v1/procedures/chest-x-ray/orgs")
+
+        fake.table_results["procedure_org_pricing"] = ConnectionError("connection reset")
+        during_outage = client.get("/api/v1/procedures/chest-x-ray/orgs")
+        calls_before = len(fake.executed)
+        while_open = client.get("/api/v1/procedures/chest-x-ray/orgs")
+    finally:
+        mario_app.dependency_overrides.pop(get_supabase, None)
+        procedure_service._procedure_ids.clear()
+
+    assert good.status_code == 200
+    assert good.json()["orgs"] == []
+    assert breaker.state == "open"
+    for response in (during_outage, while_open):
+        assert response.status_code == 200
+        assert response.headers["x-stale"] == "true"
+        assert response.json() == good.json()
+    # While open, reads fail fast without reaching upstream
+    assert len(fake.executed) == calls_before
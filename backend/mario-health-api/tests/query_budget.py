@@ -0,0 +1,52 @@
+"""Query budget assertions: fail when a request makes too many upstream calls."""
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from app.core.tracing import RequestTrace, add_trace_observer, remove_trace_observer
+
+
+def _breakdown(trace: RequestTrace) -> str:
+    return "\n".join(
+        f"  {span.kind}.{span.name} rows={span.rows} {span.duration_ms}ms {span.status}"
+        for span in trace.spans
+    )
+
+
+@contextmanager
+def query_budget(
+    max_calls: int, per_name: Optional[Dict[str, int]] = None
+) -> Iterator[List[RequestTrace]]:
+    """
+    Fail if any request served inside the block exceeds its upstream budget.
+
+    Requests must go through the app (e.g. TestClient) with an instrumented
+    client, so their rpc()/table() calls are traced.
+
+        with query_budget(3, per_name={"procedure": 1}):
+            client.get("/api/v1/procedures/chest-x-ray")
+
+    Args:
+        max_calls: Max rpc()/table() executions per request
+        per_name: Max executions of specific RPCs/tables per request
+
+    Yields:
+        The traces captured so far, for further assertions
+    """
+    traces: List[RequestTrace] = []
+    add_trace_observer(traces.append)
+    try:
+        yield traces
+    finally:
+        remove_trace_observer(traces.append)
+
+    assert traces, "no requests were traced inside query_budget()"
+    for trace in traces:
+        assert trace.call_count <= max_calls, (
+            f"{trace.route} made {trace.call_count} upstream calls "
+            f"(budget {max_calls}):\n{_breakdown(trace)}"
+        )
+        for name, limit in (per_name or {}).items():
+            assert trace.count(name) <= limit, (
+                f"{trace.route} called {name} {trace.count(name)} times "
+                f"(budget {limit}):\n{_breakdown(trace)}"
+            )
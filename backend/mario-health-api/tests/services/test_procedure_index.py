@@ -0,0 +1,226 @@
+"""Unit tests for the in-process procedure search index."""
+import pytest
+from postgrest.exceptions import APIError
+
+from app.core import cache
+from app.core.instrumentation import InstrumentedClient
+from app.core.result_cache import MemoryBackend, ResultCache
+from app.services import procedure_index as procedure_index_module
+from app.services import search_service
+from app.services.procedure_index import (
+    ProcedureIndex,
+    ProcedureIndexLoader,
+    merge_price_summaries,
+    similarity,
+    stem,
+    trigrams,
+)
+from app.services.search_service import SearchService
+
+
+def corpus_row(procedure_id, name, common_name=None, search_terms=None, description=None, codes=()):
+    return {
+        "procedure_id": procedure_id,
+        "procedure_name": name,
+        "procedure_slug": name.lower().replace(" ", "-"),
+        "common_name": common_name,
+        "description": description,
+        "search_terms": search_terms,
+        "family_name": "Family",
+        "family_slug": "family",
+        "category_name": "Category",
+        "category_slug": "category",
+        "billing_codes": list(codes),
+    }
+
+
+CORPUS = [
+    corpus_row("proc_brain_mri", "Brain MRI", "Head MRI", "head scan,brain scan", codes=["70551"]),
+    corpus_row("proc_abdomen_mri", "Abdominal MRI", "Belly MRI", "stomach mri,belly mri", codes=["74181"]),
+    corpus_row("proc_chest_xray", "Chest X-Ray", "Chest Radiograph", "lung x-ray", codes=["71046"]),
+    corpus_row("proc_colonoscopy", "Colonoscopy", None, "colon screening", "Exam of the colon"),
+    corpus_row("proc_colonoscopy_eus", "Colonoscopy with EUS", None, None, "Colonoscopy with ultrasound"),
+    corpus_row("proc_knee_replacement", "Knee Replacement", "Total Knee", "knee arthroplasty"),
+]
+
+
+def price_summary(procedure_id, best_price, distance=None):
+    return {
+        "procedure_id": procedure_id,
+        "best_price": best_price,
+        "avg_price": best_price + 10,
+        "max_price": best_price + 20,
+        "provider_count": 3,
+        "nearest_provider": "Dr A" if distance is not None else None,
+        "nearest_distance_miles": distance,
+    }
+
+
+@pytest.fixture
+def index():
+    return ProcedureIndex(CORPUS)
+
+
+def scores(index, query):
+    return {procedure.id: score for procedure, score in index.search(query)}
+
+
+class TestTextHelpers:
+    """Tokenizing and pg_trgm-compatible trigrams."""
+
+    def test_trigrams_match_pg_trgm(self):
+        # SELECT show_trgm('cat') => {"  c"," ca","at ",cat}
+        assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+        assert similarity(trigrams("cat"), trigrams("cat")) == 1.0
+        assert similarity(trigrams("cat"), trigrams("dog")) == 0.0
+
+    def test_stem(self):
+        assert stem("rays") == "ray"
+        assert stem("therapies") == "therapy"
+        assert stem("glasses") == "glass"
+        assert stem("diagnosis") == "diagnosis"
+
+
+class TestProcedureIndex:
+    """Test ProcedureIndex scoring against the match_score buckets."""
+
+    def test_exact_name_scores_one(self, index):
+        assert scores(index, "brain mri")["proc_brain_mri"] == 1.0
+        assert scores(index, "Chest X Ray")["proc_chest_xray"] == 1.0
+
+    def test_exact_common_name_scores_095(self, index):
+        assert scores(index, "belly mri")["proc_abdomen_mri"] == 0.95
+
+    def test_billing_code_scores_09(self, index):
+        assert scores(index, "74181") == {"proc_abdomen_mri": 0.9}
+
+    def test_all_words_match_in_full_text_bucket(self, index):
+        result = scores(index, "mri")
+
+        assert set(result) == {"proc_brain_mri", "proc_abdomen_mri"}
+        assert all(0.5 <= score <= 0.9 for score in result.values())
+
+    def test_search_terms_and_stems_match(self, index):
+        assert 0.5 <= scores(index, "lung x-rays")["proc_chest_xray"] <= 0.9
+        assert 0.5 <= scores(index, "arthroplasty")["proc_knee_replacement"] <= 0.9
+
+    def test_name_match_outranks_description_match(self, index):
+        ranked = [procedure.id for procedure, _ in index.search("colonoscopy")]
+
+        assert ranked[0] == "proc_colonoscopy"
+        assert "proc_colonoscopy_eus" in ranked
+
+    def test_prefix_match_scores_below_full_words(self, index):
+        result = scores(index, "colono")
+
+        assert 0.4 <= result["proc_colonoscopy"] < 0.5
+
+    def test_typo_falls_back_to_trigram_similarity(self, index):
+        result = scores(index, "colonscopy")
+
+        # similarity('Colonoscopy', 'colonscopy') x 0.4, as in search_procedures_v2
+        expected = similarity(trigrams("Colonoscopy"), trigrams("colonscopy")) * 0.4
+        assert result["proc_colonoscopy"] == pytest.approx(expected, abs=1e-6)
+        assert result["proc_colonoscopy"] < 0.4
+
+    def test_no_match(self, index):
+        assert index.search("zzzz") == []
+        assert index.search("  ") == []
+
+    def test_prefix_expansion_uses_sorted_vocabulary(self, index):
+        assert index.expand_prefix("colo") == ["colon", "colonoscopy"]
+
+
+class TestMergePriceSummaries:
+    """Test merge_price_summaries ordering and filtering."""
+
+    def test_only_priced_matches_ordered_like_the_rpc(self, index):
+        matches = index.search("mri") + index.search("colonoscopy")
+        summaries = [
+            price_summary("proc_brain_mri", 500.0, distance=4.0),
+            price_summary("proc_abdomen_mri", 300.0, distance=9.0),
+            price_summary("proc_colonoscopy", 900.0),
+        ]
+
+        rows = merge_price_summaries(matches, summaries)
+
+        assert [r["procedure_id"] for r in rows] == [
+            "proc_colonoscopy",
+            "proc_abdomen_mri",
+            "proc_brain_mri",
+        ]
+        assert rows[1]["procedure_name"] == "Abdominal MRI"
+        assert rows[1]["nearest_distance_miles"] == 9.0
+
+    def test_price_breaks_score_ties(self, index):
+        matches = [(index.procedures[0], 0.9), (index.procedures[1], 0.9)]
+        summaries = [price_summary("proc_brain_mri", 500.0), price_summary("proc_abdomen_mri", 300.0)]
+
+        rows = merge_price_summaries(matches, summaries)
+
+        assert [r["procedure_id"] for r in rows] == ["proc_abdomen_mri", "proc_brain_mri"]
+
+
+class TestIndexedSearch:
+    """SearchService on the index path, and its fallback."""
+
+    @pytest.fixture
+    def fake(self, catalog_supabase, monkeypatch):
+        fake = catalog_supabase
+        fake.rpc_results["get_procedure_search_corpus"] = CORPUS
+        fake.rpc_results["get_procedure_price_summaries"] = lambda q: [
+            price_summary(pid, 100.0) for pid in q.params["procedure_ids"]
+        ]
+        monkeypatch.setattr(search_service, "search_cache", ResultCache("search", MemoryBackend()))
+        return fake
+
+    async def test_text_matching_runs_in_process(self, fake):
+        service = SearchService(InstrumentedClient(fake))
+
+        response = await service.search("Brain MRI", zip_code="02138", radius_miles=10)
+
+        assert response.results[0].procedure_slug == "brain-mri"
+        assert response.results[0].match_score == 1.0
+        (call,) = fake.calls_to("get_procedure_price_summaries")
+        assert call.params["zip_code_input"] == "02138"
+        assert call.params["radius_miles"] == 10
+        assert "proc_brain_mri" in call.params["procedure_ids"]
+        assert fake.calls_to("search_procedures_v2") == []
+
+    async def test_index_is_built_once_and_rebuilt_on_data_version_change(self, fake):
+        service = SearchService(InstrumentedClient(fake))
+        await service.search("mri")
+        await service.search("knee")
+        assert len(fake.calls_to("get_procedure_search_corpus")) == 1
+
+        cache.data_version.version = 2
+        await service.search("colonoscopy")
+
+        assert len(fake.calls_to("get_procedure_search_corpus")) == 2
+        assert search_service.procedure_index.version == 2
+
+    async def test_unavailable_corpus_falls_back_to_rpc_and_backs_off(self, fake):
+        fake.rpc_results["get_procedure_search_corpus"] = APIError(
+            {"code": "PGRST202", "message": "Could not find the function get_procedure_search_corpus"}
+        )
+        fake.rpc_results["search_procedures_v2"] = []
+        service = SearchService(InstrumentedClient(fake))
+
+        await service.search("mri")
+        await service.search("knee")
+
+        assert len(fake.calls_to("search_procedures_v2")) == 2
+        assert len(fake.calls_to("get_procedure_search_corpus")) == 1
+        assert search_service.procedure_index.stats()["failures"] == 1
+
+    async def test_disabled_index_uses_rpc(self, fake, monkeypatch):
+        monkeypatch.setattr(procedure_index_module, "SEARCH_INDEX", False)
+        fake.rpc_results["search_procedures_v2"] = []
+
+        await SearchService(InstrumentedClient(fake)).search("mri")
+
+        assert fake.calls_to("get_procedure_search_corpus") == []
+        assert len(fake.calls_to("search_procedures_v2")) == 1
+
+    def test_loader_stats_before_first_build(self):
+        assert ProcedureIndexLoader().stats()["entries"] == 0
@@ -0,0 +1,98 @@
+"""Unit tests for procedure service."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import procedure_service
+from app.services.procedure_service import ProcedureService
+from tests.fakes import FakeSupabase
+
+
+DETAIL_ROW = {
+    "id": "proc_001",
+    "name": "Chest X-Ray",
+    "slug": "chest-x-ray",
+    "description": None,
+    "family_id": "fam_001",
+    "family_name": "X-Ray",
+    "family_slug": "x-ray",
+    "category_id": "cat_001",
+    "category_name": "Imaging",
+    "category_slug": "imaging",
+    "min_price": 100.0,
+    "max_price": 150.0,
+    "avg_price": 120.0,
+    "median_price": 110.0,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_procedure_id_cache():
+    procedure_service._procedure_ids.clear()
+    yield
+    procedure_service._procedure_ids.clear()
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSupabase()
+    fake.table_results["procedure"] = [{"id": "proc_001"}]
+    fake.rpc_results["get_procedure_detail"] = [DETAIL_ROW]
+    fake.rpc_results["get_procedure_carrier_prices"] = [
+        {"carrier_id": "cigna", "carrier_name": "Cigna", "price": 100.0}
+    ]
+    return fake
+
+
+class TestProcedureService:
+    """Test ProcedureService class."""
+
+    async def test_detail_and_carrier_prices_share_resolved_id(self, fake):
+        service = ProcedureService(fake)
+
+        await service.get_procedure_by_slug("chest-x-ray")
+        detail = await service.get_procedure_by_slug("chest-x-ray")
+
+        assert detail.id == "proc_001"
+        assert len(detail.carrier_prices) == 1
+        # Slug -> id lookup only happens once
+        assert len(fake.calls_to("procedure")) == 1
+        assert fake.calls_to("get_procedure_carrier_prices")[0].params == {
+            "procedure_id_input": "proc_001"
+        }
+
+    async def test_carrier_price_failure_is_not_fatal(self, fake):
+        fake.rpc_results["get_procedure_carrier_prices"] = RuntimeError("missing")
+
+        detail = await ProcedureService(fake).get_procedure_by_slug("chest-x-ray")
+
+        assert detail.carrier_prices == []
+
+    async def test_unknown_slug_is_404(self, fake):
+        fake.table_results["procedure"] = []
+
+        with pytest.raises(HTTPException) as exc:
+            await ProcedureService(fake).get_procedure_by_slug("nope")
+
+        assert exc.value.status_code == 404
+
+
+class TestProcedureRequestCoalescing:
+    """Concurrent identical requests share upstream calls."""
+
+    async def test_concurrent_detail_requests_share_rpc(self):
+        fake = FakeSupabase(delay=0.05)
+        fake.table_results["procedure"] = [{"id": "proc_001"}]
+        fake.rpc_results["get_procedure_detail"] = [DETAIL_ROW]
+        fake.rpc_results["get_procedure_carrier_prices"] = []
+        service = ProcedureService(fake)
+
+        details = await asyncio.gather(
+            *(service.get_procedure_by_slug("chest-x-ray") for _ in range(20))
+        )
+
+        assert all(d.id == "proc_001" for d in details)
+        assert len(fake.calls_to("procedure")) == 1
+        assert len(fake.calls_to("get_procedure_detail")) == 1
+        assert len(fake.calls_to("get_procedure_carrier_prices")) == 1
@@ -0,0 +1,202 @@
+"""Unit tests for the in-memory provider spatial index."""
+import threading
+
+import numpy as np
+import pytest
+
+from app.core.geo import haversine_miles
+from app.services import specialty_service
+from app.services.provider_geo_index import ProviderGeoIndex, ProviderGeoIndexLoader, merge_pages
+from app.services.specialty_service import SpecialtyService
+
+CAMBRIDGE = (42.377, -71.1167)
+CARDIOLOGY, DERMATOLOGY = "207RC0000X", "207N00000X"
+
+CORPUS = {
+    "id": ["loc_a", "loc_b", "loc_c", "loc_d", "loc_e", "loc_f"],
+    "org_id": ["org_1", "org_2", "org_1", None, "org_2", "org_3"],
+    "lat": [42.40, 42.38, 40.75, 42.50, 42.3601, None],
+    "lon": [-71.10, -71.12, -73.99, -71.10, -71.0589, -71.10],
+    "taxonomies": [[CARDIOLOGY], [CARDIOLOGY, DERMATOLOGY], [CARDIOLOGY], [DERMATOLOGY], [CARDIOLOGY], [CARDIOLOGY]],
+}
+
+
+def random_corpus(count, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "id": [f"loc_{i:06d}" for i in range(count)],
+        "org_id": [f"org_{i % 50}" for i in range(count)],
+        "lat": rng.uniform(41.5, 43.5, count).tolist(),
+        "lon": rng.uniform(-72.5, -70.0, count).tolist(),
+        "taxonomies": [[CARDIOLOGY, DERMATOLOGY, "363L00000X"][i % 3 : i % 3 + 1 + i % 2] for i in range(count)],
+    }
+
+
+def brute_force(corpus, lat, lon, radius, taxonomies, k, org_ids=None):
+    matches = [
+        i
+        for i, (org_id, taxonomy_list) in enumerate(zip(corpus["org_id"], corpus["taxonomies"]))
+        if set(taxonomy_list) & set(taxonomies) and (org_ids is None or org_id in org_ids)
+    ]
+    lats = np.array([corpus["lat"][i] for i in matches], dtype=np.float32).astype(np.float64)
+    lons = np.array([corpus["lon"][i] for i in matches], dtype=np.float32).astype(np.float64)
+    distances = haversine_miles(lat, lon, lats, lons)
+    within = sorted((d, corpus["id"][i]) for i, d in zip(matches, distances) if d <= radius)
+    return [location_id for _, location_id in within[:k]], len(within)
+
+
+class TestProviderGeoIndex:
+    """Test radius and k-nearest queries."""
+
+    def test_nearest_first_within_radius(self):
+        index = ProviderGeoIndex(CORPUS)
+
+        hits = index.nearest(*CAMBRIDGE, 25, [CARDIOLOGY], 10)
+
+        assert hits.location_ids == ["loc_b", "loc_a", "loc_e"]
+        assert hits.total_within_radius == 3
+        assert hits.distances == sorted(hits.distances)
+        assert len(index) == 5
+
+    def test_taxonomy_and_org_filters(self):
+        index = ProviderGeoIndex(CORPUS)
+
+        assert index.nearest(*CAMBRIDGE, 25, [DERMATOLOGY], 10).location_ids == ["loc_b", "loc_d"]
+        assert index.nearest(*CAMBRIDGE, 25, [CARDIOLOGY, DERMATOLOGY], 10).location_ids == [
+            "loc_b", "loc_a", "loc_e", "loc_d"
+        ]
+        assert index.nearest(*CAMBRIDGE, 25, [CARDIOLOGY], 10, org_ids=["org_2"]).location_ids == [
+            "loc_b", "loc_e"
+        ]
+        assert index.nearest(*CAMBRIDGE, 25, ["unknown"], 10).total_within_radius == 0
+
+    @pytest.mark.parametrize("radius,k", [(1, 5), (10, 20), (40, 100), (200, 10)])
+    def test_matches_brute_force(self, radius, k):
+        corpus = random_corpus(5000, seed=radius)
+        index = ProviderGeoIndex(corpus)
+
+        for taxonomies, org_ids in (
+            ([CARDIOLOGY], None),
+            ([DERMATOLOGY, "363L00000X"], None),
+            ([CARDIOLOGY], ["org_1", "org_7"]),
+        ):
+            hits = index.nearest(*CAMBRIDGE, radius, taxonomies, k, org_ids=org_ids)
+
+            expected, total = brute_force(corpus, *CAMBRIDGE, radius, taxonomies, k, org_ids)
+            assert hits.location_ids == expected
+            assert hits.total_within_radius == total
+
+    def test_merge_pages(self):
+        pages = [{column: values[:4] for column, values in CORPUS.items()},
+                 {column: values[4:] for column, values in CORPUS.items()}]
+
+        assert merge_pages(pages) == CORPUS
+
+
+@pytest.fixture
+def fake(catalog_supabase):
+    return catalog_supabase
+
+
+def paged_corpus(query):
+    after_id = query.params["after_id"]
+    start = 0 if after_id is None else CORPUS["id"].index(after_id) + 1
+    end = start + query.params["page_size"]
+    return {column: values[start:end] for column, values in CORPUS.items()}
+
+
+async def built(loader, fake):
+    await loader.get(fake)
+    await loader._build_task
+    return await loader.get(fake)
+
+
+class TestProviderGeoIndexLoader:
+    """Test paging and background builds."""
+
+    async def test_loads_corpus_in_pages(self, fake):
+        fake.rpc_results["get_provider_geo_corpus"] = paged_corpus
+        loader = ProviderGeoIndexLoader(page_size=4)
+
+        index = await built(loader, fake)
+
+        assert len(index) == 5
+        assert [call.params["after_id"] for call in fake.calls_to("get_provider_geo_corpus")] == [None, "loc_d"]
+
+    async def test_builds_in_background(self, fake):
+        fake.rpc_results["get_provider_geo_corpus"] = CORPUS
+        loader = ProviderGeoIndexLoader()
+
+        assert await loader.get(fake) is None
+        assert loader.building
+        assert await loader.get(fake) is None
+        await loader._build_task
+
+        assert (await loader.get(fake)).nearest(*CAMBRIDGE, 25, [CARDIOLOGY], 1).location_ids == ["loc_b"]
+        assert len(fake.calls_to("get_provider_geo_corpus")) == 1
+        assert loader.stats()["bytes"] > 0
+
+    async def test_build_runs_off_the_event_loop(self, fake):
+        fake.rpc_results["get_provider_geo_corpus"] = CORPUS
+        loader = ProviderGeoIndexLoader()
+        build, threads = loader.build, []
+        loader.build = lambda pages: threads.append(threading.get_ident()) or build(pages)
+
+        index = await built(loader, fake)
+
+        assert len(index) == 5
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_disabled(self, fake):
+        loader = ProviderGeoIndexLoader(enabled=False)
+
+        assert await loader.get(fake) is None
+        assert fake.executed == []
+
+
+@pytest.fixture
+async def indexed(fake, monkeypatch):
+    fake.rpc_results["get_provider_geo_corpus"] = CORPUS
+    loader = ProviderGeoIndexLoader()
+    await built(loader, fake)
+    monkeypatch.setattr(specialty_service, "provider_geo_index", loader)
+    fake.table_results.update(
+        {
+            "specialty_map": [{"taxonomy_id": CARDIOLOGY}],
+            "specialty_procedure_map": [{"procedure_id": "proc_001"}],
+            "provider_location": [
+                {"id": "loc_a", "provider_id": "zz_last", "provider_name": "Zed", "org_id": "org_1"},
+                {"id": "loc_b", "provider_id": "p2", "provider_name": "Bea", "org_id": "org_2"},
+            ],
+            "procedure_pricing": [{"org_id": "org_2", "price": "120.00"}],
+        }
+    )
+    fake.executed.clear()
+    return fake
+
+
+class TestSpecialtyProvidersWithIndex:
+    """Specialty search ranks from the index and fetches only the winners."""
+
+    async def test_finds_nearest_regardless_of_provider_id_order(self, indexed):
+        providers, total, _ = await SpecialtyService(indexed)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2
+        )
+
+        assert [p.provider_id for p in providers] == ["p2", "zz_last"]
+        assert total == 3
+        assert providers[0].pricing.min_price == 120
+        assert indexed.calls_to("provider") == []
+        (location_query,) = indexed.calls_to("provider_location")
+        assert ("in_", ("id", ["loc_b", "loc_a"]), {}) in location_query.calls
+
+    async def test_expanding_radius_fetches_details_once(self, indexed):
+        # loc_b, loc_a and loc_e lie 0.3, 1.8 and 3.2 miles away: rings of 1, 2 and 4 miles
+        providers, total, radius = await SpecialtyService(indexed)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 1, 2, max_radius_miles=4
+        )
+
+        assert [p.provider_id for p in providers] == ["p2", "zz_last"]
+        assert (total, radius) == (2, 2)
+        assert len(indexed.executed) == 4
+        assert len(indexed.calls_to("provider_location")) == 1
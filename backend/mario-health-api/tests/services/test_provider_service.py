@@ -0,0 +1,54 @@
+"""Unit tests for provider service."""
+import time
+
+from app.services.provider_service import ProviderService
+from tests.fakes import FakeSupabase
+
+
+PROVIDER_ROW = {
+    "provider_id": "1234567890",
+    "provider_name": "Jane Doe MD",
+    "address": "1 Main St",
+    "city": "Cambridge",
+    "state": "MA",
+    "zip_code": "02138",
+    "latitude": 42.37,
+    "longitude": -71.11,
+    "phone": None,
+    "total_procedures": 1,
+    "avg_price": 120.0,
+    "min_price": 100.0,
+    "max_price": 150.0,
+}
+
+PROCEDURE_ROW = {
+    "procedure_id": "proc_001",
+    "procedure_name": "Chest X-Ray",
+    "procedure_slug": "chest-x-ray",
+    "family_name": "X-Ray",
+    "family_slug": "x-ray",
+    "category_name": "Imaging",
+    "category_slug": "imaging",
+    "price": 100.0,
+    "carrier_id": "cigna",
+    "carrier_name": "Cigna",
+    "last_updated": None,
+}
+
+
+class TestProviderService:
+    """Test ProviderService class."""
+
+    async def test_provider_detail_fetches_info_and_procedures_concurrently(self):
+        fake = FakeSupabase(delay=0.2)
+        fake.rpc_results["get_provider_detail"] = [PROVIDER_ROW]
+        fake.rpc_results["get_provider_procedures"] = [PROCEDURE_ROW]
+
+        start = time.perf_counter()
+        detail = await ProviderService(fake).get_provider_detail("1234567890")
+        elapsed = time.perf_counter() - start
+
+        assert detail.provider_name == "Jane Doe MD"
+        assert [p.procedure_slug for p in detail.procedures] == ["chest-x-ray"]
+        # Two sequential 200ms calls would take 400ms
+        assert elapsed < 0.35
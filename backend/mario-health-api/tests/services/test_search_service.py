@@ -1,8 +1,41 @@
 """Unit tests for search service."""
+import asyncio
+import time
+from decimal import Decimal
+
 import pytest
 from unittest.mock import Mock, AsyncMock
-from app.services.search_service import SearchService
+from app.core.result_cache import MemoryBackend, RedisBackend, ResultCache
+from app.services import procedure_index, search_service
+from app.services.search_service import SearchService, search_cache_key
 from app.models import SearchResult
+from tests.fakes import FakeSupabase
+
+
+SEARCH_ROW = {
+    "procedure_id": "proc_001",
+    "procedure_name": "Chest X-Ray",
+    "procedure_slug": "chest-x-ray",
+    "family_name": "X-Ray",
+    "family_slug": "x-ray",
+    "category_name": "Imaging",
+    "category_slug": "imaging",
+    "best_price": 100.50,
+    "avg_price": 120.00,
+    "max_price": 150.00,
+    "provider_count": 5,
+    "nearest_provider": None,
+    "nearest_distance_miles": None,
+    "match_score": 1.0,
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_search_cache(monkeypatch):
+    """Each test gets its own empty search cache."""
+    cache = ResultCache("search", MemoryBackend(), ttl=60, stale_ttl=300)
+    monkeypatch.setattr(search_service, "search_cache", cache)
+    return cache
 
 
 class TestSearchService:
@@ -10,9 +43,10 @@ class TestSearchService:
 
     @pytest.fixture
     def mock_supabase(self):
-        """Mock Supabase client."""
+        """Mock async Supabase client."""
         mock = Mock()
         mock.rpc = Mock()
+        mock.rpc.return_value.execute = AsyncMock()
         return mock
 
     @pytest.fixture
@@ -20,26 +54,190 @@ class TestSearchService:
         """Create SearchService with mock."""
         return SearchService(mock_supabase)
 
-    def test_search_without_location(self, search_service, mock_supabase):
-        """Test search without location filtering."""
+    async def test_search_without_location(self, search_service, mock_supabase, monkeypatch):
+        """Test search without location filtering (search_procedures_v2 path)."""
         # Arrange
+        monkeypatch.setattr(procedure_index, "SEARCH_INDEX", False)
         mock_response = Mock()
-        mock_response.data = [
-            {
-                "procedure_id": "proc_001",
-                "procedure_name": "Chest X-Ray",
-                "procedure_slug": "chest-x-ray",
-                "best_price": 100.50,
-                "provider_count": 5
-            }
-        ]
+        mock_response.data = [SEARCH_ROW]
         mock_supabase.rpc.return_value.execute.return_value = mock_response
 
         # Act
-        result = search_service.search_procedures("chest")
+        result = await search_service.search("chest")
 
         # Assert
         assert len(result.results) == 1
+        assert isinstance(result.results[0], SearchResult)
         assert result.results[0].procedure_name == "Chest X-Ray"
         assert result.query == "chest"
-        mock_supabase.rpc.assert_called_once()
+        mock_supabase.rpc.assert_called_once_with(
+            "search_procedures_v2", {"search_query": "chest"}
+        )
+
+    async def test_concurrent_searches_do_not_block_each_other(self, monkeypatch):
+        """Upstream calls are awaited, so slow RPCs overlap instead of queueing."""
+        monkeypatch.setattr(procedure_index, "SEARCH_INDEX", False)
+        fake = FakeSupabase(delay=0.2)
+        fake.rpc_results["search_procedures_v2"] = [SEARCH_ROW]
+        service = SearchService(fake)
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(service.search("chest") for _ in range(5)))
+        elapsed = time.perf_counter() - start
+
+        assert all(r.results_count == 1 for r in responses)
+        # Five sequential 200ms calls would take a full second
+        assert elapsed < 0.6
+
+
+class TestSearchCache:
+    """Test the shared search result cache."""
+
+    def test_cache_key_normalizes_query(self):
+        assert search_cache_key("  Chest   X-Ray ", None, 25) == search_cache_key("chest x-ray", None, 50)
+        assert search_cache_key("chest", "02138", 25) != search_cache_key("chest", "02138", 50)
+        assert search_cache_key("chest", "02138", 25) != search_cache_key("chest", None, 25)
+
+    async def test_repeat_search_served_from_cache(self, fresh_search_cache):
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v2"] = [SEARCH_ROW]
+        service = SearchService(fake)
+
+        first = await service.search("Chest ")
+        second = await service.search("chest")
+
+        assert first.results == second.results
+        assert second.query == "chest"
+        assert len(fake.calls_to("search_procedures_v2")) == 1
+        assert fake.calls_to("search_procedures_v2")[0].params == {"search_query": "chest"}
+        assert fresh_search_cache.stats()["hits"] == 1
+
+    async def test_stale_entry_served_while_refreshing(self, fresh_search_cache, monkeypatch):
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v2"] = [SEARCH_ROW]
+        service = SearchService(fake)
+        await service.search("chest")
+
+        # Age the entry past its TTL but within the stale window
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        fake.rpc_results["search_procedures_v2"] = [{**SEARCH_ROW, "procedure_name": "New Name"}]
+
+        stale = await service.search("chest")
+        assert stale.results[0].procedure_name == "Chest X-Ray"
+        await asyncio.gather(*fresh_search_cache._refresh_tasks)
+
+        fresh = await service.search("chest")
+        assert fresh.results[0].procedure_name == "New Name"
+        stats = fresh_search_cache.stats()
+        assert stats["stale_hits"] == 1
+        assert stats["refreshes"] == 1
+        assert len(fake.calls_to("search_procedures_v2")) == 2
+
+    async def test_redis_backend_shares_hits_between_instances(self, monkeypatch):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        instance_a = ResultCache("search", RedisBackend(fakeredis.FakeAsyncRedis(server=server)))
+        instance_b = ResultCache("search", RedisBackend(fakeredis.FakeAsyncRedis(server=server)))
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v2"] = [SEARCH_ROW]
+
+        monkeypatch.setattr(search_service, "search_cache", instance_a)
+        await SearchService(fake).search("chest", zip_code="02138")
+        monkeypatch.setattr(search_service, "search_cache", instance_b)
+        result = await SearchService(fake).search("chest", zip_code="02138")
+
+        assert result.results_count == 1
+        assert len(fake.calls_to("search_procedures_v2")) == 1
+        assert instance_b.stats()["hits"] == 1
+
+        await instance_b.clear()
+        assert await instance_a.backend.get("search:chest|02138|25") is None
+
+    async def test_decimal_rows_are_cached_as_numbers(self, fresh_search_cache):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return [{**SEARCH_ROW, "best_price": Decimal("100.50")}]
+
+        for _ in range(3):
+            rows = await fresh_search_cache.get_or_load("chest|02138|25", load)
+
+        assert len(calls) == 1
+        assert rows[0]["best_price"] == 100.5
+        stats = fresh_search_cache.stats()
+        assert stats["hits"] == 2
+        assert stats["errors"] == 0
+
+    async def test_backend_errors_fall_back_to_rpc(self, monkeypatch):
+        class BrokenBackend(MemoryBackend):
+            name = "broken"
+
+            async def get(self, key):
+                raise ConnectionError("cache down")
+
+        cache = ResultCache("search", BrokenBackend())
+        monkeypatch.setattr(search_service, "search_cache", cache)
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v2"] = [SEARCH_ROW]
+
+        result = await SearchService(fake).search("chest")
+        assert result.results_count == 1
+        assert cache.stats()["errors"] == 1
+
+
+class TestSearchRpc:
+    """Test the database search function used without the index."""
+
+    async def test_search_procedures_rpc_is_configurable(self, monkeypatch):
+        monkeypatch.setattr(procedure_index, "SEARCH_INDEX", False)
+        monkeypatch.setattr(search_service, "SEARCH_PROCEDURES_RPC", "search_procedures_v3")
+        fake = FakeSupabase()
+        fake.rpc_results["search_procedures_v3"] = [SEARCH_ROW]
+
+        result = await SearchService(fake).search("chest", zip_code="02138")
+
+        assert result.results_count == 1
+        (call,) = fake.calls_to("search_procedures_v3")
+        assert call.params == {"search_query": "chest", "zip_code_input": "02138", "radius_miles": 25}
+        assert fake.calls_to("search_procedures_v2") == []
+
+
+class TestExpandingRadius:
+    """A ZIP search with max_radius widens until it finds results."""
+
+    @pytest.fixture
+    def fake(self, monkeypatch):
+        monkeypatch.setattr(procedure_index, "SEARCH_INDEX", False)
+        fake = FakeSupabase()
+        # Nearest priced provider is ~40 miles away
+        fake.rpc_results["search_procedures_v2"] = (
+            lambda query: [SEARCH_ROW] if query.params["radius_miles"] >= 40 else []
+        )
+        return fake
+
+    async def test_expands_until_results(self, fake):
+        result = await SearchService(fake).search("chest", zip_code="59001", max_radius_miles=100)
+
+        assert result.results_count == 1
+        assert result.radius_miles == 50
+        assert result.radius_expanded
+        assert [c.params["radius_miles"] for c in fake.calls_to("search_procedures_v2")] == [25, 50]
+
+    async def test_searched_rings_are_cached(self, fake):
+        await SearchService(fake).search("chest", zip_code="59001", max_radius_miles=100)
+        fake.executed.clear()
+
+        result = await SearchService(fake).search("chest", zip_code="59001", radius_miles=50)
+
+        assert result.results_count == 1
+        assert fake.executed == []
+
+    async def test_no_expansion_without_max_radius(self, fake):
+        result = await SearchService(fake).search("chest", zip_code="59001")
+
+        assert result.results_count == 0
+        assert result.radius_miles == 25
+        assert not result.radius_expanded
+        assert len(fake.calls_to("search_procedures_v2")) == 1
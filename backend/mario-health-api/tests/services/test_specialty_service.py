@@ -0,0 +1,150 @@
+"""Unit tests for the specialty provider search paths."""
+import pytest
+from postgrest.exceptions import APIError
+
+from app.services import specialty_service
+from app.services.specialty_service import SpecialtyService
+from tests.fakes import FakeSupabase
+
+CAMBRIDGE = (42.377, -71.1167)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(specialty_service, "USE_SPECIALTY_PROVIDERS_RPC", True)
+    fake = FakeSupabase()
+    fake.table_results.update(
+        {
+            "specialty_map": [{"taxonomy_id": "207RC0000X"}],
+            "specialty_procedure_map": [{"procedure_id": "proc_001"}],
+            "provider": [{"provider_id": "p9", "first_name": "Old", "last_name": "Path"}],
+            "provider_location": [
+                {"provider_id": "p9", "org_id": "org_9", "latitude": 42.38, "longitude": -71.12}
+            ],
+        }
+    )
+    fake.rpc_results["find_specialty_providers"] = [
+        {
+            "provider_id": "p1", "provider_name": "Ann Lee MD", "org_id": "org_1",
+            "address": "1 Main St", "city": "Cambridge", "state": "MA", "zip_code": "02138",
+            "distance_miles": 0.44, "min_price": 90, "max_price": 150, "avg_price": 120,
+            "total_within_radius": 7,
+        },
+        {
+            "provider_id": "p2", "provider_name": None, "org_id": "org_2", "address": None,
+            "city": None, "state": None, "zip_code": None, "distance_miles": 3.2,
+            "min_price": None, "max_price": None, "avg_price": None, "total_within_radius": 7,
+        },
+    ]
+    return fake
+
+
+class TestFindSpecialtyProvidersRpc:
+    """The RPC returns ranked, priced locations in one round trip."""
+
+    async def test_rpc_rows_become_providers(self, fake):
+        providers, total, _ = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2
+        )
+
+        assert [p.provider_id for p in providers] == ["p1", "p2"]
+        assert total == 7
+        assert providers[0].location.distance_miles == 0.4
+        assert providers[0].pricing.min_price == 90
+        assert providers[1].pricing is None
+        assert providers[1].provider_name == "Unknown Provider"
+        (call,) = fake.calls_to("find_specialty_providers")
+        assert call.params["procedure_id_input"] == "proc_001"
+        assert call.params["result_limit"] == 2
+        for name in ("provider", "provider_location", "procedure_pricing"):
+            assert fake.calls_to(name) == []
+
+    async def test_queries_tables_when_disabled(self, fake, monkeypatch):
+        monkeypatch.setattr(specialty_service, "USE_SPECIALTY_PROVIDERS_RPC", False)
+
+        providers, _, _ = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2
+        )
+
+        assert [p.provider_id for p in providers] == ["p9"]
+        assert fake.calls_to("find_specialty_providers") == []
+
+    async def test_missing_function_falls_back_to_tables(self, fake):
+        fake.rpc_results["find_specialty_providers"] = APIError(
+            {"code": "PGRST202", "message": "Could not find the function"}
+        )
+
+        providers, _, _ = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2
+        )
+
+        assert [p.provider_id for p in providers] == ["p9"]
+        assert len(fake.calls_to("provider_location")) == 1
+
+    async def test_overload_errors_propagate(self, fake):
+        fake.rpc_results["find_specialty_providers"] = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
+
+        with pytest.raises(APIError):
+            await SpecialtyService(fake)._get_specialty_providers_query("spec_1", *CAMBRIDGE, 25, 2)
+
+
+class TestExpandingRadius:
+    """max_radius_miles widens the search until ``limit`` providers are found."""
+
+    async def test_one_rpc_at_maximum_picks_the_ring(self, fake):
+        rows = fake.rpc_results["find_specialty_providers"]
+        fake.rpc_results["find_specialty_providers"] = [
+            {**rows[0], "distance_miles": 30.0, "total_within_radius": 2},
+            {**rows[1], "distance_miles": 80.0, "total_within_radius": 2},
+        ]
+
+        providers, total, radius = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2, max_radius_miles=100
+        )
+
+        assert [p.provider_id for p in providers] == ["p1", "p2"]
+        assert (total, radius) == (2, 100)
+        assert [c.params["radius_miles"] for c in fake.calls_to("find_specialty_providers")] == [100]
+        assert len(fake.calls_to("specialty_map")) == 1
+        assert len(fake.calls_to("specialty_procedure_map")) == 1
+
+    async def test_counts_the_ring_when_more_lie_beyond(self, fake):
+        rows = fake.rpc_results["find_specialty_providers"]
+        fake.rpc_results["find_specialty_providers"] = lambda query: [
+            {**row, "total_within_radius": 9 if query.params["radius_miles"] == 100 else 4}
+            for row in rows
+        ]
+
+        providers, total, radius = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2, max_radius_miles=100
+        )
+
+        assert len(providers) == 2
+        assert (total, radius) == (4, 25)
+        assert [c.params["radius_miles"] for c in fake.calls_to("find_specialty_providers")] == [100, 25]
+
+    async def test_ring_holding_all_locations_needs_one_rpc(self, fake):
+        rows = fake.rpc_results["find_specialty_providers"]
+        fake.rpc_results["find_specialty_providers"] = [
+            {**row, "distance_miles": 40.0, "total_within_radius": 2} for row in rows
+        ]
+
+        _, total, radius = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2, max_radius_miles=100
+        )
+
+        assert (total, radius) == (2, 50)
+        assert len(fake.calls_to("find_specialty_providers")) == 1
+
+    async def test_table_queries_repeat_per_ring(self, fake, monkeypatch):
+        monkeypatch.setattr(specialty_service, "USE_SPECIALTY_PROVIDERS_RPC", False)
+
+        providers, _, radius = await SpecialtyService(fake)._get_specialty_providers_query(
+            "spec_1", *CAMBRIDGE, 25, 2, max_radius_miles=100
+        )
+
+        assert [p.provider_id for p in providers] == ["p9"]
+        assert radius == 100
+        assert len(fake.calls_to("provider_location")) == 3
@@ -0,0 +1,132 @@
+"""Unit tests for typeahead suggestions."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.core.dependencies import get_supabase
+from app.core.instrumentation import InstrumentedClient
+from app.main import app
+from app.middleware.stale import stale_responses
+from app.services import search_service
+from app.services.suggest_index import SuggestIndex
+from tests.query_budget import query_budget
+
+
+def row(kind, label, slug, name=None):
+    return {"kind": kind, "label": label, "slug": slug, "name": name or label}
+
+
+CORPUS = [
+    row("procedure", "Brain MRI", "brain-mri"),
+    row("procedure", "Head MRI", "brain-mri", "Brain MRI"),
+    row("procedure", "Abdominal MRI", "abdominal-mri"),
+    row("procedure", "Belly MRI", "abdominal-mri", "Abdominal MRI"),
+    row("procedure", "Breast Biopsy", "breast-biopsy"),
+    row("billing_code", "74181", "abdominal-mri", "Abdominal MRI"),
+    row("billing_code", "74182", "abdominal-mri", "Abdominal MRI"),
+    row("billing_code", "G0121", "colonoscopy", "Colonoscopy"),
+    row("specialty", "Cardiologist", "cardiologist"),
+    row("hospital", "New York-Presbyterian Hospital", "nyc_001"),
+    row("hospital", "NYP", "nyc_001", "New York-Presbyterian Hospital"),
+    row("hospital", "Brigham and Women's Hospital", "bos_002"),
+]
+
+
+@pytest.fixture
+def index():
+    return SuggestIndex(CORPUS)
+
+
+def labels(index, query, limit=8):
+    return [entry.label for entry in index.suggest(query, limit)]
+
+
+class TestSuggestIndex:
+    """Test SuggestIndex prefix lookups and ranking."""
+
+    def test_prefix_of_label_start(self, index):
+        assert labels(index, "br") == ["Brain MRI", "Breast Biopsy", "Brigham and Women's Hospital"]
+
+    def test_prefix_of_later_word(self, index):
+        assert labels(index, "mri") == ["Brain MRI", "Abdominal MRI"]
+        assert labels(index, "presby") == ["New York-Presbyterian Hospital"]
+
+    def test_aliases_and_common_names_point_at_the_canonical_entry(self, index):
+        (nyp,) = index.suggest("nyp")
+        (belly,) = index.suggest("belly")
+
+        assert (nyp.kind, nyp.slug, nyp.name) == ("hospital", "nyc_001", "New York-Presbyterian Hospital")
+        assert (belly.slug, belly.name) == ("abdominal-mri", "Abdominal MRI")
+
+    def test_one_suggestion_per_target(self, index):
+        assert labels(index, "7418") == ["74181"]
+        assert labels(index, "head") == ["Head MRI"]
+
+    def test_billing_codes_are_case_insensitive(self, index):
+        assert labels(index, "g01") == ["G0121"]
+
+    def test_punctuation_and_case_are_ignored(self, index):
+        assert labels(index, "NEW YORK PRESB") == ["New York-Presbyterian Hospital"]
+
+    def test_limit_and_no_match(self, index):
+        assert len(index.suggest("b", limit=2)) == 2
+        assert index.suggest("zzz") == []
+        assert index.suggest("--") == []
+
+
+@pytest.fixture
+def fake(catalog_supabase):
+    fake = catalog_supabase
+    fake.rpc_results["get_suggestion_corpus"] = CORPUS
+    app.dependency_overrides[get_supabase] = lambda: InstrumentedClient(fake)
+    yield fake
+    app.dependency_overrides.pop(get_supabase, None)
+
+
+class TestSuggestEndpoint:
+    """Test GET /api/v1/search/suggest."""
+
+    def test_suggestions_served_from_memory(self, fake):
+        client = TestClient(app)
+        first = client.get("/api/v1/search/suggest?q=bel")
+
+        with query_budget(0):
+            response = client.get("/api/v1/search/suggest?q=belly%20m&limit=5")
+
+        assert first.status_code == 200
+        assert response.status_code == 200
+        assert response.json() == {
+            "query": "belly m",
+            "suggestions": [
+                {"type": "procedure", "label": "Belly MRI", "slug": "abdominal-mri", "name": "Abdominal MRI"}
+            ],
+        }
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert len(fake.calls_to("get_suggestion_corpus")) == 1
+        # Keystrokes don't churn the stale-response store
+        assert len(stale_responses._entries) == 0
+
+    def test_index_rebuilt_when_data_version_changes(self, fake):
+        client = TestClient(app)
+        client.get("/api/v1/search/suggest?q=br")
+        fake.rpc_results["get_suggestion_corpus"] = CORPUS + [row("procedure", "Bunionectomy", "bunionectomy")]
+        fake.table_results["data_version"] = [{"version": 2}]
+        cache.data_version._next_check = 0
+
+        response = client.get("/api/v1/search/suggest?q=bun")
+
+        assert [s["label"] for s in response.json()["suggestions"]] == ["Bunionectomy"]
+        assert search_service.suggest_index.version == 2
+
+    def test_unavailable_index_is_503(self, fake):
+        fake.rpc_results["get_suggestion_corpus"] = []
+
+        response = TestClient(app).get("/api/v1/search/suggest?q=br")
+
+        assert response.status_code == 503
+
+    def test_validation(self, fake):
+        client = TestClient(app)
+
+        assert client.get("/api/v1/search/suggest?q=").status_code == 422
+        assert client.get("/api/v1/search/suggest?q=br&limit=50").status_code == 422
@@ -0,0 +1,140 @@
+"""Unit tests for the in-memory ZIP geocoder."""
+import pytest
+from fastapi import HTTPException
+
+from app.services import search_service
+from app.services.search_service import SearchService
+from app.services.specialty_service import SpecialtyService
+from app.services.zip_geocoder import ZipGeocoder, ZipGeocoderLoader, build_geocoder
+
+CENTROIDS = {
+    "zip": ["94103", "02138", "10001", "02138", "ABCDE", None],
+    "lat": [37.7725, 42.377, 40.7506, 0.0, 1.0, 2.0],
+    "lon": [-122.4147, -71.1167, -73.9972, 0.0, 1.0, 2.0],
+}
+
+
+@pytest.fixture
+def geocoder():
+    return ZipGeocoder.from_columns(CENTROIDS)
+
+
+class TestZipGeocoder:
+    """Test lookups and the snapshot format."""
+
+    def test_lookup(self, geocoder):
+        assert len(geocoder) == 3
+        assert list(geocoder.zips) == [2138, 10001, 94103]
+        assert geocoder.lookup("02138") == (42.377, -71.1167)
+        assert geocoder.lookup("94103") == (37.7725, -122.4147)
+
+    def test_unknown_and_malformed_zips(self, geocoder):
+        assert geocoder.lookup("02139") is None
+        assert geocoder.lookup("99999") is None
+        assert geocoder.lookup("2138") is None
+        assert geocoder.lookup("021380") is None
+        assert geocoder.lookup("０２１３８") is None
+        assert "10001" in geocoder
+        assert "ABCDE" not in geocoder
+
+    def test_snapshot_round_trip(self, geocoder, tmp_path):
+        path = str(tmp_path / "zips.bin")
+        geocoder.write_snapshot(path)
+
+        loaded = ZipGeocoder.from_snapshot(path)
+
+        assert (tmp_path / "zips.bin").stat().st_size == 8 + 4 + 3 * 12
+        assert list(loaded.zips) == list(geocoder.zips)
+        assert loaded.lookup("10001") == geocoder.lookup("10001")
+
+    def test_bad_snapshots_are_rejected(self, geocoder, tmp_path):
+        path = tmp_path / "zips.bin"
+        geocoder.write_snapshot(str(path))
+        data = path.read_bytes()
+
+        path.write_bytes(data[:-4])
+        with pytest.raises(ValueError, match="truncated"):
+            ZipGeocoder.from_snapshot(str(path))
+        path.write_bytes(b"NOTZIPS!" + data[8:])
+        with pytest.raises(ValueError, match="not a ZIP snapshot"):
+            ZipGeocoder.from_snapshot(str(path))
+
+    def test_empty_corpus_does_not_build(self):
+        with pytest.raises(ValueError):
+            build_geocoder({"zip": [], "lat": [], "lon": []})
+
+
+@pytest.fixture
+def fake(catalog_supabase):
+    catalog_supabase.rpc_results["get_zip_centroids"] = CENTROIDS
+    return catalog_supabase
+
+
+class TestZipGeocoderLoader:
+    """Test where the geocoder is loaded from."""
+
+    async def test_loads_from_database_without_snapshot(self, fake):
+        loader = ZipGeocoderLoader(snapshot_path="")
+
+        geocoder = await loader.get(fake)
+
+        assert geocoder.lookup("02138") == (42.377, -71.1167)
+        assert loader.stats()["source"] == "database"
+        assert len(fake.calls_to("get_zip_centroids")) == 1
+
+    async def test_snapshot_skips_the_database(self, fake, geocoder, tmp_path):
+        path = str(tmp_path / "zips.bin")
+        geocoder.write_snapshot(path)
+        loader = ZipGeocoderLoader(snapshot_path=path)
+
+        assert (await loader.get(fake)).lookup("94103") == (37.7725, -122.4147)
+        assert loader.stats()["source"] == "snapshot"
+        assert fake.calls_to("get_zip_centroids") == []
+
+    async def test_unreadable_snapshot_falls_back_to_database(self, fake, tmp_path):
+        path = tmp_path / "zips.bin"
+        path.write_bytes(b"garbage")
+        loader = ZipGeocoderLoader(snapshot_path=str(path))
+
+        assert len(await loader.get(fake)) == 3
+        assert loader.stats()["source"] == "database"
+
+
+class TestZipLookupsInServices:
+    """Services resolve ZIPs in memory and reject unknown ones up front."""
+
+    async def test_specialty_providers_rejects_unknown_zip_without_queries(self, fake):
+        service = SpecialtyService(fake)
+        await search_service.zip_geocoder.get(fake)
+        fake.executed.clear()
+
+        with pytest.raises(HTTPException) as exc:
+            await service.get_specialty_providers("cardiologist", "99999")
+
+        assert exc.value.status_code == 400
+        assert fake.executed == []
+
+    async def test_specialty_providers_skips_zip_codes_table(self, fake):
+        fake.table_results["specialty"] = [{"id": "spec_1", "name": "Cardiologist", "slug": "cardiologist"}]
+
+        response = await SpecialtyService(fake).get_specialty_providers("cardiologist", "02138")
+
+        assert response.specialty.slug == "cardiologist"
+        assert fake.calls_to("zip_codes") == []
+
+    async def test_specialty_providers_queries_zip_codes_without_geocoder(self, fake):
+        fake.rpc_results["get_zip_centroids"] = []
+        fake.table_results["specialty"] = [{"id": "spec_1", "name": "Cardiologist", "slug": "cardiologist"}]
+
+        with pytest.raises(HTTPException) as exc:
+            await SpecialtyService(fake).get_specialty_providers("cardiologist", "02138")
+
+        assert exc.value.status_code == 400
+        assert len(fake.calls_to("zip_codes")) == 1
+
+    async def test_search_with_unknown_zip_is_empty_without_price_query(self, fake):
+        response = await SearchService(fake).search("chest", zip_code="99999")
+
+        assert response.results_count == 0
+        assert fake.calls_to("get_procedure_price_summaries") == []
+        assert fake.calls_to("search_procedures_v2") == []